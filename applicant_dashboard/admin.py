@@ -5,12 +5,12 @@ from .models import DashboardStats, UserActivity, DraftApplication
 
 @admin.register(DashboardStats)
 class DashboardStatsAdmin(admin.ModelAdmin):
-    list_display = ['user', 'total_proposals', 'approved_proposals', 'under_evaluation', 'last_updated']
+    list_display = ['user', 'total_proposals', 'approved_proposals', 'under_evaluation', 'drift_corrections', 'last_updated']
     list_filter = ['last_updated']
     search_fields = ['user__email', 'user__full_name']
-    readonly_fields = ['last_updated']
+    readonly_fields = ['last_updated', 'drift_corrections', 'last_reconciled']
     
-    actions = ['refresh_stats']
+    actions = ['refresh_stats', 'reconcile_stats']
     
     def refresh_stats(self, request, queryset):
         for stats in queryset:
@@ -18,6 +18,11 @@ class DashboardStatsAdmin(admin.ModelAdmin):
         self.message_user(request, f"Refreshed stats for {queryset.count()} users.")
     refresh_stats.short_description = "Refresh selected stats"
 
+    def reconcile_stats(self, request, queryset):
+        drifted = sum(1 for stats in queryset if stats.reconcile())
+        self.message_user(request, f"Reconciled {queryset.count()} users, corrected drift for {drifted}.")
+    reconcile_stats.short_description = "Reconcile selected stats (count drift)"
+
 
 @admin.register(UserActivity)
 class UserActivityAdmin(admin.ModelAdmin):
@@ -0,0 +1,75 @@
+# applicant_dashboard/management/commands/reconcile_dashboard_stats.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+
+from applicant_dashboard.models import DashboardStats
+from applicant_dashboard.workflow import refresh as refresh_workflow
+from dynamic_form.models import FormSubmission
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute DashboardStats from scratch and fix rows that drifted from the '
+        'incremental updates (run periodically, e.g. nightly from cron)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Users reconciled per batch (default: 200)',
+        )
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only reconcile this user id',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # Applicants with proposals but no stats row yet
+        missing = (
+            FormSubmission.objects.filter(applicant__isnull=False, applicant__dashboard_stats__isnull=True)
+            .values_list('applicant_id', flat=True).distinct()
+        )
+        if options['user']:
+            missing = missing.filter(applicant_id=options['user'])
+        created = DashboardStats.objects.bulk_create(
+            [DashboardStats(user_id=user_id) for user_id in set(missing)], ignore_conflicts=True
+        )
+
+        queryset = DashboardStats.objects.order_by('pk')
+        if options['user']:
+            queryset = queryset.filter(user_id=options['user'])
+
+        checked = drifted = recategorized = 0
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            # Repair the materialized categories first (4 queries per batch),
+            # then recount every user of the batch with one GROUP BY
+            user_ids = [stats.user_id for stats in batch]
+            changed, _ = refresh_workflow(FormSubmission.objects.filter(applicant_id__in=user_ids))
+            recategorized += changed
+            totals = DashboardStats.grouped_totals(user_ids)
+
+            with transaction.atomic():
+                for stats in batch:
+                    if stats.reconcile(totals[stats.user_id]):
+                        drifted += 1
+                        self.stdout.write(f'  corrected user {stats.user_id}')
+            checked += len(batch)
+
+        total_corrections = queryset.aggregate(total=Sum('drift_corrections'))['total'] or 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled {checked} users ({len(created)} new stats rows, '
+            f'{recategorized} proposals recategorized): '
+            f'{drifted} drifted this run, {total_corrections} corrections recorded in total'
+        ))
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicant_dashboard', '0002_alter_useractivity_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='drift_corrections',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='last_reconciled',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
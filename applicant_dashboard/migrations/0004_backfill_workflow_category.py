@@ -0,0 +1,48 @@
+from django.db import migrations
+from django.db.models import Prefetch
+
+
+def backfill_workflow_category(apps, schema_editor):
+    # Same pass as applicant_dashboard.workflow.refresh(), on historical models
+    from applicant_dashboard.models import workflow_state
+
+    FormSubmission = apps.get_model('dynamic_form', 'FormSubmission')
+    ScreeningRecord = apps.get_model('screening', 'ScreeningRecord')
+
+    proposals = FormSubmission.objects.only(
+        'id', 'status', 'proposal_id', 'workflow_category', 'workflow_status',
+    ).order_by().prefetch_related(
+        Prefetch('screening_records', queryset=ScreeningRecord.objects.order_by('-cycle').select_related('technical_record')),
+        'technical_evaluation_rounds',
+        'presentations',
+    )
+    changed = []
+    for proposal in proposals.iterator(chunk_size=500):
+        screenings = proposal.screening_records.all()
+        rounds = proposal.technical_evaluation_rounds.all()
+        presentations = proposal.presentations.all()
+        state = workflow_state(
+            proposal.status,
+            screenings[0] if screenings else None,
+            rounds[0] if rounds else None,
+            presentations[0] if presentations else None,
+        )
+        if (proposal.workflow_category, proposal.workflow_status) != state:
+            proposal.workflow_category, proposal.workflow_status = state
+            changed.append(proposal)
+    FormSubmission.objects.bulk_update(changed, ['workflow_category', 'workflow_status'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicant_dashboard', '0003_dashboardstats_drift_tracking'),
+        ('dynamic_form', '0027_formsubmission_workflow_category'),
+        ('screening', '0004_cas_document_storage'),
+        ('tech_eval', '0003_round_created_id_index'),
+        ('presentation', '0004_presentationcache'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_workflow_category, migrations.RunPython.noop),
+    ]
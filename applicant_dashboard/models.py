@@ -1,6 +1,8 @@
 # applicant_dashboard/models.py - 
 
 from django.db import models
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from dynamic_form.models import FormSubmission
@@ -9,9 +11,152 @@ import uuid
 User = get_user_model()
 
 
+# Dashboard counters and how a proposal (status + workflow category) feeds them
+STAT_FIELDS = (
+    'total_proposals', 'approved_proposals', 'under_evaluation',
+    'not_shortlisted', 'draft_applications',
+)
+
+
+def stat_contributions(status, category):
+    """Which DashboardStats counters one proposal adds 1 to."""
+    if status == FormSubmission.DRAFT:
+        return {'draft_applications': 1}
+    contributions = {'total_proposals': 1}
+    if category == 'Approved':
+        contributions['approved_proposals'] = 1
+    elif category in ['Evaluation', 'Interview']:
+        contributions['under_evaluation'] = 1
+    elif category == 'Not Shortlisted':
+        contributions['not_shortlisted'] = 1
+    # Note: 'Submitted', 'Screening', 'History' are not counted in dashboard stats
+    return contributions
+
+
+def categorize(status, latest_screening, tech_eval, presentation):
+    """Same categorization logic as ProposalStatsAPIView, from already loaded records"""
+    # PRIORITY 1: Check presentation final_decision first (if exists)
+    if presentation:
+        if presentation.final_decision == 'shortlisted':
+            return 'Approved'
+        elif presentation.final_decision in ['not_shortlisted', 'rejected']:
+            return 'Not Shortlisted'
+        elif presentation.final_decision in ['pending', 'assigned', 'evaluated']:
+            return 'Interview'
+
+    # PRIORITY 2: Check FormSubmission status for definitive states
+    if status == FormSubmission.APPROVED:
+        return 'Approved'
+    elif status == FormSubmission.REJECTED:
+        return 'Not Shortlisted'
+
+    # PRIORITY 3: For SUBMITTED status, follow the workflow logic
+    if status == FormSubmission.SUBMITTED:
+        # Check if we have any screening
+        if not latest_screening:
+            return 'Submitted'
+        
+        # Check admin screening decision
+        if latest_screening.admin_decision == 'pending':
+            return 'Submitted'
+        elif latest_screening.admin_decision == 'not shortlisted':
+            return 'Not Shortlisted'
+        elif latest_screening.admin_decision == 'shortlisted':
+            # Check technical screening
+            tech_record = getattr(latest_screening, 'technical_record', None)
+            if not tech_record:
+                return 'Screening'
+            
+            if tech_record.technical_decision == 'pending':
+                return 'Screening'
+            elif tech_record.technical_decision == 'not shortlisted':
+                return 'Not Shortlisted'
+            elif tech_record.technical_decision == 'shortlisted':
+                # Check technical evaluation
+                if not tech_eval:
+                    return 'Evaluation'
+                
+                if tech_eval.assignment_status == 'pending':
+                    return 'Evaluation'
+                elif tech_eval.assignment_status == 'assigned':
+                    return 'Evaluation'
+                elif tech_eval.assignment_status == 'completed':
+                    if tech_eval.overall_decision == 'recommended':
+                        # Should have presentation at this point
+                        if not presentation:
+                            return 'Interview'  # Waiting for presentation creation
+                        # Presentation cases handled in PRIORITY 1 above
+                        return 'Interview'
+                    elif tech_eval.overall_decision == 'not_recommended':
+                        return 'Not Shortlisted'
+                    else:  # pending
+                        return 'Evaluation'
+                else:
+                    return 'Evaluation'
+            else:
+                return 'Not Shortlisted'
+        else:
+            return 'Not Shortlisted'
+    
+    # Default case
+    return 'History'
+
+
+# ProposalStatsAPIView "status" for every category but 'Not Shortlisted'
+DISPLAY_STATUS = {
+    'Submitted': 'Referred',
+    'Screening': 'Under Screening',
+    'Evaluation': 'Under Evaluation',
+    'Interview': 'Interview Stage',
+    'Approved': 'Approved',
+    'History': 'Completed',
+}
+
+
+def display_status(category, latest_screening, tech_eval, presentation):
+    """Status label shown to the applicant, naming the stage that rejected it"""
+    if category != 'Not Shortlisted':
+        return DISPLAY_STATUS.get(category, '')
+
+    if presentation and presentation.final_decision in ['not_shortlisted', 'rejected']:
+        return 'Not Selected (Interview Stage)'
+    if tech_eval and tech_eval.overall_decision == 'not_recommended':
+        return 'Not Selected (Technical Evaluation)'
+    tech_record = getattr(latest_screening, 'technical_record', None) if latest_screening else None
+    if tech_record and tech_record.technical_decision == 'not shortlisted':
+        return 'Not Selected (Technical Screening)'
+    if latest_screening and latest_screening.admin_decision == 'not shortlisted':
+        return 'Not Selected (Admin Screening)'
+    return 'Not Selected'
+
+
+def workflow_state(status, latest_screening, tech_eval, presentation):
+    """(workflow_category, workflow_status) as stored on FormSubmission"""
+    category = categorize(status, latest_screening, tech_eval, presentation)
+    return category, display_status(category, latest_screening, tech_eval, presentation)
+
+
+def proposal_category(proposal, status=None):
+    """Categorize one proposal (3 queries); ``status`` overrides proposal.status."""
+    return categorize(
+        proposal.status if status is None else status,
+        proposal.screening_records.order_by('-cycle').first(),
+        proposal.technical_evaluation_rounds.first(),
+        proposal.presentations.first(),
+    )
+
+
 class DashboardStats(models.Model):
     """
     Model to cache dashboard statistics for better performance
+
+    Kept current incrementally by applicant_dashboard/signals.py (each
+    FormSubmission write moves its own contribution between counters) and
+    recounted from FormSubmission.workflow_category with one GROUP BY when
+    applicant_dashboard.workflow recategorizes proposals after a screening,
+    evaluation or presentation change. ``manage.py reconcile_dashboard_stats``
+    periodically recomputes and counts every correction in
+    ``drift_corrections``.
     """
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='dashboard_stats')
     total_proposals = models.PositiveIntegerField(default=0)
@@ -20,119 +165,123 @@ class DashboardStats(models.Model):
     not_shortlisted = models.PositiveIntegerField(default=0)
     draft_applications = models.PositiveIntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
+    drift_corrections = models.PositiveIntegerField(default=0)
+    last_reconciled = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return f"Dashboard stats for {self.user.email}"
 
+    @staticmethod
+    def proposals_with_workflow(queryset):
+        """Prefetch what ``workflow_state`` needs, so a whole queryset costs 4 queries"""
+        from screening.models import ScreeningRecord
+        from tech_eval.models import TechnicalEvaluationRound
+        from presentation.models import Presentation
+
+        # proposal_id: presentations point at it rather than at the pk
+        return queryset.only(
+            'id', 'status', 'applicant_id', 'proposal_id', 'workflow_category', 'workflow_status',
+        ).prefetch_related(
+            models.Prefetch(
+                'screening_records',
+                queryset=ScreeningRecord.objects.order_by('-cycle').select_related('technical_record'),
+            ),
+            models.Prefetch('technical_evaluation_rounds', queryset=TechnicalEvaluationRound.objects.all()),
+            models.Prefetch('presentations', queryset=Presentation.objects.all()),
+        )
+
+    @staticmethod
+    def workflow_records(proposal):
+        """(latest screening, evaluation round, presentation) of a prefetched proposal"""
+        screenings = proposal.screening_records.all()
+        rounds = proposal.technical_evaluation_rounds.all()
+        presentations = proposal.presentations.all()
+        return (
+            screenings[0] if screenings else None,
+            rounds[0] if rounds else None,
+            presentations[0] if presentations else None,
+        )
+
+    @classmethod
+    def categorize_prefetched(cls, proposal):
+        return categorize(proposal.status, *cls.workflow_records(proposal))
+
+    @staticmethod
+    def grouped_totals(user_ids):
+        """{user_id: counter values} from the stored workflow_category, in one GROUP BY"""
+        totals = {user_id: dict.fromkeys(STAT_FIELDS, 0) for user_id in user_ids}
+        rows = (
+            FormSubmission.objects.filter(applicant_id__in=list(totals)).order_by()
+            .values_list('applicant_id', 'status', 'workflow_category')
+            .annotate(n=Count('pk'))
+        )
+        for user_id, status, category, n in rows:
+            for field, amount in stat_contributions(status, category).items():
+                totals[user_id][field] += amount * n
+        return totals
+
+    @classmethod
+    def refresh_users(cls, user_ids):
+        """Recount the given users' rows; only rows whose counters changed are written"""
+        totals = cls.grouped_totals(user_ids)
+        for stats in cls.objects.filter(user_id__in=list(totals)):
+            values = totals[stats.user_id]
+            if any(getattr(stats, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(stats, field, value)
+                stats.save(update_fields=list(STAT_FIELDS) + ['last_updated'])
+
+    def compute_stats(self):
+        return self.grouped_totals([self.user_id])[self.user_id]
+
     def refresh_stats(self):
         """Refresh dashboard statistics using the same categorization logic"""
-        # Get all proposals for this user (excluding drafts)
-        proposals = FormSubmission.objects.filter(applicant=self.user).exclude(status=FormSubmission.DRAFT)
-        
-        # Initialize counters
-        total = proposals.count()
-        approved = 0
-        under_eval = 0
-        not_shortlisted = 0
-        
-        # Categorize each proposal using the same logic as ProposalStatsAPIView
-        for proposal in proposals:
-            category = self._categorize_proposal(proposal)
-            
-            if category == 'Approved':
-                approved += 1
-            elif category in ['Evaluation', 'Interview']:
-                under_eval += 1
-            elif category == 'Not Shortlisted':
-                not_shortlisted += 1
-            # Note: 'Submitted', 'Screening', 'History' are not counted in dashboard stats
-        
-        # Update stats
-        self.total_proposals = total
-        self.approved_proposals = approved
-        self.under_evaluation = under_eval
-        self.not_shortlisted = not_shortlisted
-        
-        # Count drafts
-        self.draft_applications = FormSubmission.objects.filter(
-            applicant=self.user, 
-            status=FormSubmission.DRAFT
-        ).count()
-        
+        for field, value in self.compute_stats().items():
+            setattr(self, field, value)
         self.save()
 
-    def _categorize_proposal(self, proposal):
-        """Use the same categorization logic as ProposalStatsAPIView"""
-        # Get workflow records
-        latest_screening = proposal.screening_records.order_by('-cycle').first()
-        tech_eval = proposal.technical_evaluation_rounds.first()
-        presentation = proposal.presentations.first()
-
-        # PRIORITY 1: Check presentation final_decision first (if exists)
-        if presentation:
-            if presentation.final_decision == 'shortlisted':
-                return 'Approved'
-            elif presentation.final_decision in ['not_shortlisted', 'rejected']:
-                return 'Not Shortlisted'
-            elif presentation.final_decision in ['pending', 'assigned', 'evaluated']:
-                return 'Interview'
+    def reconcile(self, values=None):
+        """Recompute; if the stored counters drifted, fix them and count it. Returns True on drift."""
+        values = self.compute_stats() if values is None else values
+        drifted = any(getattr(self, field) != value for field, value in values.items())
+        update_fields = ['last_reconciled']
+        if drifted:
+            for field, value in values.items():
+                setattr(self, field, value)
+            self.drift_corrections += 1
+            update_fields += list(STAT_FIELDS) + ['drift_corrections', 'last_updated']
+        self.last_reconciled = timezone.now()
+        self.save(update_fields=update_fields)
+        return drifted
 
-        # PRIORITY 2: Check FormSubmission status for definitive states
-        if proposal.status == FormSubmission.APPROVED:
-            return 'Approved'
-        elif proposal.status == FormSubmission.REJECTED:
-            return 'Not Shortlisted'
+    @classmethod
+    def apply_delta(cls, user_id, old=None, new=None):
+        """
+        Move one proposal's contribution from ``old`` to ``new`` (both as
+        returned by ``stat_contributions``) with a single UPDATE.
+        """
+        delta = {}
+        for field in STAT_FIELDS:
+            change = (new or {}).get(field, 0) - (old or {}).get(field, 0)
+            if change:
+                delta[field] = change
+        if not delta or user_id is None:
+            return
 
-        # PRIORITY 3: For SUBMITTED status, follow the workflow logic
-        if proposal.status == FormSubmission.SUBMITTED:
-            # Check if we have any screening
-            if not latest_screening:
-                return 'Submitted'
-            
-            # Check admin screening decision
-            if latest_screening.admin_decision == 'pending':
-                return 'Submitted'
-            elif latest_screening.admin_decision == 'not shortlisted':
-                return 'Not Shortlisted'
-            elif latest_screening.admin_decision == 'shortlisted':
-                # Check technical screening
-                tech_record = getattr(latest_screening, 'technical_record', None)
-                if not tech_record:
-                    return 'Screening'
-                
-                if tech_record.technical_decision == 'pending':
-                    return 'Screening'
-                elif tech_record.technical_decision == 'not shortlisted':
-                    return 'Not Shortlisted'
-                elif tech_record.technical_decision == 'shortlisted':
-                    # Check technical evaluation
-                    if not tech_eval:
-                        return 'Evaluation'
-                    
-                    if tech_eval.assignment_status == 'pending':
-                        return 'Evaluation'
-                    elif tech_eval.assignment_status == 'assigned':
-                        return 'Evaluation'
-                    elif tech_eval.assignment_status == 'completed':
-                        if tech_eval.overall_decision == 'recommended':
-                            # Should have presentation at this point
-                            if not presentation:
-                                return 'Interview'  # Waiting for presentation creation
-                            # Presentation cases handled in PRIORITY 1 above
-                            return 'Interview'
-                        elif tech_eval.overall_decision == 'not_recommended':
-                            return 'Not Shortlisted'
-                        else:  # pending
-                            return 'Evaluation'
-                    else:
-                        return 'Evaluation'
-                else:
-                    return 'Not Shortlisted'
-            else:
-                return 'Not Shortlisted'
-        
-        # Default case
-        return 'History'
+        updated = cls.objects.filter(user_id=user_id).update(
+            last_updated=timezone.now(),
+            **{
+                field: F(field) + change if change > 0 else Greatest(F(field) + change, 0)
+                for field, change in delta.items()
+            }
+        )
+        if not updated:
+            # No row yet: build it from scratch (already includes this change).
+            stats, _ = cls.objects.get_or_create(user_id=user_id)
+            stats.refresh_stats()
+
+    def _categorize_proposal(self, proposal):
+        return proposal.workflow_category
 
 
 class UserActivity(models.Model):
@@ -1,8 +1,71 @@
 # applicant_dashboard/signals.py
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, pre_delete, post_delete
 from django.dispatch import receiver
 from dynamic_form.models import FormSubmission
-from .models import DashboardStats, UserActivity, DraftApplication
+from presentation.models import Presentation
+from screening.models import ScreeningRecord, TechnicalScreeningRecord
+from tech_eval.models import TechnicalEvaluationRound
+from . import workflow
+from .models import (
+    DashboardStats, UserActivity, DraftApplication,
+    categorize, proposal_category, stat_contributions, workflow_state,
+)
+
+
+def _contributions(instance, status):
+    if status == FormSubmission.DRAFT:
+        return stat_contributions(status, None)
+    return stat_contributions(status, proposal_category(instance, status))
+
+
+def update_dashboard_stats(instance, created):
+    """
+    Move this one proposal's contribution between DashboardStats counters
+    instead of recategorizing all of the applicant's proposals.
+    """
+    if created:
+        # Nothing can reference a brand-new proposal yet, so no workflow queries.
+        new = stat_contributions(instance.status, categorize(instance.status, None, None, None))
+        DashboardStats.apply_delta(instance.applicant_id, new=new)
+        return
+
+    # Still the pre-save state: FormSubmission.save() moves it forward only
+    # after the post_save receivers have run.
+    previous = instance.persisted_state()
+    if previous is None:
+        # Old state unknown: fall back to a full refresh for this applicant.
+        if instance.applicant_id:
+            stats, _ = DashboardStats.objects.get_or_create(user_id=instance.applicant_id)
+            stats.refresh_stats()
+        return
+
+    old_status, old_applicant_id = previous['status'], previous['applicant_id']
+    if old_status == instance.status and old_applicant_id == instance.applicant_id:
+        return  # e.g. a section autosave: the category can't have changed
+
+    # Workflow records are untouched by a FormSubmission save, so both
+    # categories come from the same 3 lookups with different statuses.
+    old = _contributions(instance, old_status)
+    new = old if old_status == instance.status else _contributions(instance, instance.status)
+    if old_applicant_id == instance.applicant_id:
+        DashboardStats.apply_delta(instance.applicant_id, old=old, new=new)
+    else:
+        DashboardStats.apply_delta(old_applicant_id, old=old)
+        DashboardStats.apply_delta(instance.applicant_id, new=new)
+
+
+@receiver(pre_delete, sender=FormSubmission)
+def remember_stats_contribution(sender, instance, **kwargs):
+    # Workflow rows are cascade-deleted before post_delete, so categorize now.
+    if instance.applicant_id:
+        instance._dashboard_contribution = _contributions(instance, instance.status)
+
+
+@receiver(post_delete, sender=FormSubmission)
+def remove_stats_contribution(sender, instance, **kwargs):
+    contribution = getattr(instance, '_dashboard_contribution', None)
+    if contribution:
+        DashboardStats.apply_delta(instance.applicant_id, old=contribution)
 
 
 @receiver(post_save, sender=FormSubmission)
@@ -10,20 +73,19 @@ def update_dashboard_on_submission_change(sender, instance, created, **kwargs):
     """
     Update dashboard stats and create activities when FormSubmission changes
     """
-    if not instance.applicant:
+    update_dashboard_stats(instance, created)
+
+    if not instance.applicant_id:
         return
     
-    # Update dashboard stats
-    stats, _ = DashboardStats.objects.get_or_create(user=instance.applicant)
-    stats.refresh_stats()
-    
     # Create/update draft application if status is DRAFT
     if instance.status == FormSubmission.DRAFT:
         draft, created = DraftApplication.objects.get_or_create(
-            user=instance.applicant,
+            user_id=instance.applicant_id,
             submission=instance
         )
         if not created:
+            draft.submission = instance  # already in memory; don't re-read the row
             draft.calculate_progress()
     else:
         # Remove from drafts if no longer draft
@@ -45,50 +107,99 @@ def track_status_changes(sender, instance, **kwargs):
     """
     Track status changes and create appropriate activities
     """
-    if not instance.pk or not instance.applicant:
+    old_status = instance.persisted_status()
+    if old_status is None:
+        return
+
+    new_status = instance.status
+
+    if not instance.applicant_id:
         return
     
-    try:
-        old_instance = FormSubmission.objects.get(pk=instance.pk)
-        old_status = old_instance.status
-        new_status = instance.status
+    if old_status != new_status:
+        activity_map = {
+            (FormSubmission.SUBMITTED, FormSubmission.EVALUATED): {
+                'type': 'evaluation_started',
+                'title': 'Admin Screening Started',
+                'description': 'Your proposal has started admin screening process.'
+            },
+            (FormSubmission.EVALUATED, FormSubmission.TECHNICAL): {
+                'type': 'technical_review',
+                'title': 'Technical Evaluation Started',
+                'description': 'Your proposal has moved to technical evaluation phase.'
+            },
+            (FormSubmission.TECHNICAL, FormSubmission.APPROVED): {
+                'type': 'proposal_approved',
+                'title': 'Proposal Approved',
+                'description': 'Congratulations! Your proposal has been approved.'
+            },
+            (FormSubmission.TECHNICAL, FormSubmission.REJECTED): {
+                'type': 'proposal_rejected',
+                'title': 'Proposal Not Selected',
+                'description': 'Your proposal was not selected for this round.'
+            },
+        }
         
-        if old_status != new_status:
-            activity_map = {
-                (FormSubmission.SUBMITTED, FormSubmission.EVALUATED): {
-                    'type': 'evaluation_started',
-                    'title': 'Admin Screening Started',
-                    'description': 'Your proposal has started admin screening process.'
-                },
-                (FormSubmission.EVALUATED, FormSubmission.TECHNICAL): {
-                    'type': 'technical_review',
-                    'title': 'Technical Evaluation Started',
-                    'description': 'Your proposal has moved to technical evaluation phase.'
-                },
-                (FormSubmission.TECHNICAL, FormSubmission.APPROVED): {
-                    'type': 'proposal_approved',
-                    'title': 'Proposal Approved',
-                    'description': 'Congratulations! Your proposal has been approved.'
-                },
-                (FormSubmission.TECHNICAL, FormSubmission.REJECTED): {
-                    'type': 'proposal_rejected',
-                    'title': 'Proposal Not Selected',
-                    'description': 'Your proposal was not selected for this round.'
-                },
-            }
-            
-            activity_data = activity_map.get((old_status, new_status))
-            if activity_data:
-                UserActivity.objects.create(
-                    user=instance.applicant,
-                    activity_type=activity_data['type'],
-                    title=activity_data['title'],
-                    description=activity_data['description'],
-                    related_submission=instance
-                )
-    
-    except FormSubmission.DoesNotExist:
-        pass
+        activity_data = activity_map.get((old_status, new_status))
+        if activity_data:
+            UserActivity.objects.create(
+                user=instance.applicant,
+                activity_type=activity_data['type'],
+                title=activity_data['title'],
+                description=activity_data['description'],
+                related_submission=instance
+            )
+
+
+# Materialized workflow category (applicant_dashboard/workflow.py)
+@receiver(pre_save, sender=FormSubmission)
+def set_initial_workflow_category(sender, instance, **kwargs):
+    # A new proposal has no workflow records yet, so no queries needed
+    if instance._state.adding and not instance.workflow_category:
+        instance.workflow_category, instance.workflow_status = workflow_state(instance.status, None, None, None)
+
+
+@receiver(post_save, sender=FormSubmission)
+def recategorize_on_status_change(sender, instance, created, **kwargs):
+    if created:
+        return
+    previous = instance.persisted_state()
+    if previous is None or previous['status'] != instance.status:
+        workflow.mark_proposal(instance.pk)
+
+
+def _touches(update_fields, fields):
+    # save(update_fields=[cache columns]) can't change the category
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=ScreeningRecord)
+@receiver(post_delete, sender=ScreeningRecord)
+def recategorize_on_screening(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, {'proposal', 'cycle', 'admin_decision'}):
+        workflow.mark_proposal(instance.proposal_id)
+
+
+@receiver(post_save, sender=TechnicalScreeningRecord)
+@receiver(post_delete, sender=TechnicalScreeningRecord)
+def recategorize_on_technical_screening(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, {'screening_record', 'technical_decision'}):
+        workflow.mark_screening(instance.screening_record_id)
+
+
+@receiver(post_save, sender=TechnicalEvaluationRound)
+@receiver(post_delete, sender=TechnicalEvaluationRound)
+def recategorize_on_evaluation(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, {'proposal', 'assignment_status', 'overall_decision'}):
+        workflow.mark_proposal(instance.proposal_id)
+
+
+@receiver(post_save, sender=Presentation)
+@receiver(post_delete, sender=Presentation)
+def recategorize_on_presentation(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, {'proposal', 'final_decision'}):
+        # Presentation.proposal points at FormSubmission.proposal_id
+        workflow.mark_proposal_number(instance.proposal_id)
 
 
 # Auto-create dashboard stats for new users
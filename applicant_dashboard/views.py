@@ -9,6 +9,9 @@ from datetime import timedelta, datetime
 from django.shortcuts import get_object_or_404
 
 from .models import DashboardStats, UserActivity, DraftApplication
+from configuration.models import Service
+from dashboard.conditional import Source, conditional_get
+from dashboard.response_cache import cache_response
 from .serializers import (
     DashboardStatsSerializer, UserActivitySerializer, DraftApplicationSerializer,
     ProposalSummarySerializer
@@ -24,9 +27,24 @@ from milestones.models import (
 )
 
 
+def _own(lookup):
+    # Source scope: rows belonging to the requesting applicant
+    return lambda request: {lookup: request.user}
+
+
 class DashboardOverviewAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
+    # Stats are recomputed once they are 5 minutes old and call status follows
+    # the clock, so the ETag also rolls over every 5 minutes.
+    @conditional_get(
+        Source(DashboardStats, 'last_updated', scope=_own('user')),
+        Source(UserActivity, 'created_at', scope=_own('user')),
+        Source(DraftApplication, 'last_updated', scope=_own('user')),
+        Source(FormSubmission, scope=_own('applicant')),
+        Source(Service),
+        refresh_every=300,
+    )
     def get(self, request):
         user = request.user
         
@@ -97,12 +115,23 @@ class DashboardOverviewAPIView(APIView):
 class ProposalStatsAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
+    # daysPending counts from now, hence the hourly rollover
+    @conditional_get(
+        Source(FormSubmission, scope=_own('applicant')),
+        Source(ScreeningRecord, scope=_own('proposal__applicant')),
+        Source(TechnicalScreeningRecord, scope=_own('screening_record__proposal__applicant')),
+        Source(TechnicalEvaluationRound, scope=_own('proposal__applicant')),
+        Source(EvaluatorAssignment, ('assigned_at', 'completed_at'),
+               scope=_own('evaluation_round__proposal__applicant')),
+        Source(Presentation, scope=_own('proposal__applicant')),
+        Source(Service),
+        refresh_every=3600,
+    )
+    @cache_response('formsubmission', 'screeningrecord', 'technicalevaluationround', 'presentation')
     def get(self, request):
         user = request.user
         
         try:
-            proposals = FormSubmission.objects.filter(applicant=user)
-            
             stats = {
                 'Submitted': [],
                 'Screening': [], 
@@ -113,12 +142,14 @@ class ProposalStatsAPIView(APIView):
                 'History': [],
             }
 
-            for proposal in proposals.exclude(status=FormSubmission.DRAFT):
-                proposal_data = self._build_proposal_data(proposal)
-                category = self._categorize_proposal(proposal)
-                
-                if category in stats:
-                    stats[category].append(proposal_data)
+            # Category and status are materialized columns (applicant_dashboard/workflow.py)
+            proposals = (
+                FormSubmission.objects.filter(applicant=user, workflow_category__in=list(stats))
+                .exclude(status=FormSubmission.DRAFT)
+                .select_related('service')
+            )
+            for proposal in proposals:
+                stats[proposal.workflow_category].append(self._build_proposal_data(proposal))
 
             return Response({
                 'status': 'success',
@@ -142,112 +173,14 @@ class ProposalStatsAPIView(APIView):
         return {
             "title": proposal.service.name if proposal.service else "",
             "proposalId": proposal.proposal_id or proposal.form_id or "",
-            "status": self._get_display_status(proposal),
+            "status": proposal.workflow_status,
             "date": proposal_date.strftime("%d %b %Y") if proposal_date else "",
             "remarks": self._get_remarks(proposal),
             "daysPending": days_pending,
         }
 
-    def _categorize_proposal(self, proposal):
-        latest_screening = proposal.screening_records.order_by('-cycle').first()
-        tech_eval = proposal.technical_evaluation_rounds.first()
-        presentation = proposal.presentations.first()
-
-        if presentation:
-            if presentation.final_decision == 'shortlisted':
-                return 'Approved'
-            elif presentation.final_decision in ['not_shortlisted', 'rejected']:
-                return 'Not Shortlisted'
-            elif presentation.final_decision in ['pending', 'assigned', 'evaluated']:
-                return 'Interview'
-
-        if proposal.status == FormSubmission.APPROVED:
-            return 'Approved'
-        elif proposal.status == FormSubmission.REJECTED:
-            return 'Not Shortlisted'
-
-        if proposal.status == FormSubmission.SUBMITTED:
-            if not latest_screening:
-                return 'Submitted'
-            
-            if latest_screening.admin_decision == 'pending':
-                return 'Submitted'
-            elif latest_screening.admin_decision == 'not shortlisted':
-                return 'Not Shortlisted'
-            elif latest_screening.admin_decision == 'shortlisted':
-                tech_record = getattr(latest_screening, 'technical_record', None)
-                if not tech_record:
-                    return 'Screening'
-                
-                if tech_record.technical_decision == 'pending':
-                    return 'Screening'
-                elif tech_record.technical_decision == 'not shortlisted':
-                    return 'Not Shortlisted'
-                elif tech_record.technical_decision == 'shortlisted':
-                    if not tech_eval:
-                        return 'Evaluation'
-                    
-                    if tech_eval.assignment_status == 'pending':
-                        return 'Evaluation'
-                    elif tech_eval.assignment_status == 'assigned':
-                        return 'Evaluation'
-                    elif tech_eval.assignment_status == 'completed':
-                        if tech_eval.overall_decision == 'recommended':
-                            if not presentation:
-                                return 'Interview'
-                            return 'Interview'
-                        elif tech_eval.overall_decision == 'not_recommended':
-                            return 'Not Shortlisted'
-                        else:
-                            return 'Evaluation'
-                    else:
-                        return 'Evaluation'
-                else:
-                    return 'Not Shortlisted'
-            else:
-                return 'Not Shortlisted'
-        
-        return 'History'
-
-    def _get_display_status(self, proposal):
-        category = self._categorize_proposal(proposal)
-        
-        if category == 'Not Shortlisted':
-            latest_screening = proposal.screening_records.order_by('-cycle').first()
-            tech_eval = proposal.technical_evaluation_rounds.first()
-            presentation = proposal.presentations.first()
-            
-            if presentation and presentation.final_decision in ['not_shortlisted', 'rejected']:
-                return 'Not Selected (Interview Stage)'
-            
-            if tech_eval and tech_eval.overall_decision == 'not_recommended':
-                return 'Not Selected (Technical Evaluation)'
-            
-            if latest_screening and hasattr(latest_screening, 'technical_record'):
-                tech_record = latest_screening.technical_record
-                if tech_record and tech_record.technical_decision == 'not shortlisted':
-                    return 'Not Selected (Technical Screening)'
-            
-            if latest_screening and latest_screening.admin_decision == 'not shortlisted':
-                return 'Not Selected (Admin Screening)'
-            
-            return 'Not Selected'
-        
-        status_map = {
-            'Submitted': 'Referred',
-            'Screening': 'Under Screening', 
-            'Evaluation': 'Under Evaluation',
-            'Interview': 'Interview Stage',
-            'Approved': 'Approved',
-            'History': 'Completed'
-        }
-        
-        return status_map.get(category, '')
-
     def _get_remarks(self, proposal):
-        category = self._categorize_proposal(proposal)
-        
-        if category != 'Not Shortlisted':
+        if proposal.workflow_category != 'Not Shortlisted':
             return "No remarks available"
         
         latest_screening = proposal.screening_records.order_by('-cycle').first()
@@ -914,10 +847,8 @@ class ProposalDetailsAPIView(APIView):
         if not latest_screening:
             return None
 
-        current_category = self._categorize_proposal(proposal)
-        tech_eval = proposal.technical_evaluation_rounds.first()
-        presentation = proposal.presentations.first()
-        
+        current_category = proposal.workflow_category
+
         if current_category in ['Interview', 'Evaluation', 'Approved']:
             admin_decision = 'shortlisted'
             technical_decision = 'shortlisted'
@@ -944,67 +875,6 @@ class ProposalDetailsAPIView(APIView):
 
         return screening_details
 
-    def _categorize_proposal(self, proposal):
-        latest_screening = proposal.screening_records.order_by('-cycle').first()
-        tech_eval = proposal.technical_evaluation_rounds.first()
-        presentation = proposal.presentations.first()
-
-        if presentation:
-            if presentation.final_decision == 'shortlisted':
-                return 'Approved'
-            elif presentation.final_decision in ['not_shortlisted', 'rejected']:
-                return 'Not Shortlisted'
-            elif presentation.final_decision in ['pending', 'assigned', 'evaluated']:
-                return 'Interview'
-
-        if proposal.status == FormSubmission.APPROVED:
-            return 'Approved'
-        elif proposal.status == FormSubmission.REJECTED:
-            return 'Not Shortlisted'
-
-        if proposal.status == FormSubmission.SUBMITTED:
-            if not latest_screening:
-                return 'Submitted'
-            
-            if latest_screening.admin_decision == 'pending':
-                return 'Submitted'
-            elif latest_screening.admin_decision == 'not shortlisted':
-                return 'Not Shortlisted'
-            elif latest_screening.admin_decision == 'shortlisted':
-                tech_record = getattr(latest_screening, 'technical_record', None)
-                if not tech_record:
-                    return 'Screening'
-                
-                if tech_record.technical_decision == 'pending':
-                    return 'Screening'
-                elif tech_record.technical_decision == 'not shortlisted':
-                    return 'Not Shortlisted'
-                elif tech_record.technical_decision == 'shortlisted':
-                    if not tech_eval:
-                        return 'Evaluation'
-                    
-                    if tech_eval.assignment_status == 'pending':
-                        return 'Evaluation'
-                    elif tech_eval.assignment_status == 'assigned':
-                        return 'Evaluation'
-                    elif tech_eval.assignment_status == 'completed':
-                        if tech_eval.overall_decision == 'recommended':
-                            if not presentation:
-                                return 'Interview'
-                            return 'Interview'
-                        elif tech_eval.overall_decision == 'not_recommended':
-                            return 'Not Shortlisted'
-                        else:
-                            return 'Evaluation'
-                    else:
-                        return 'Evaluation'
-                else:
-                    return 'Not Shortlisted'
-            else:
-                return 'Not Shortlisted'
-        
-        return 'History'
-
     def _get_technical_evaluation_details(self, proposal):
         tech_eval = proposal.technical_evaluation_rounds.first()
         if not tech_eval:
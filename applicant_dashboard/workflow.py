@@ -0,0 +1,126 @@
+# applicant_dashboard/workflow.py
+"""
+Materialized workflow category of proposals.
+
+``FormSubmission.workflow_category`` (Submitted, Screening, Evaluation,
+Interview, Approved, Not Shortlisted or History) and ``workflow_status``
+(the label ProposalStatsAPIView shows) are computed by
+``models.workflow_state`` from the proposal's status, latest
+ScreeningRecord and its TechnicalScreeningRecord, TechnicalEvaluationRound
+and Presentation. Dashboards then read the columns instead of running
+3-4 queries per proposal.
+
+The signal handlers in signals.py only mark proposals dirty when one of
+those rows is saved or deleted, or when a proposal's status changes. Like
+tech_eval.cache_sync, the marks are collected per thread and flushed once
+after the transaction commits. The flush recategorizes the dirty proposals
+in one prefetched pass, writes only the changed rows, and recounts the
+DashboardStats of their applicants.
+
+``QuerySet.update()`` on those tables is not seen. Run
+``manage.py reconcile_dashboard_stats``, which recategorizes first, to
+repair such rows.
+"""
+import logging
+import threading
+
+from django.db import transaction
+from django.db.models import Q
+
+from dashboard.response_cache import invalidate
+from dynamic_form.models import FormSubmission
+
+from .models import DashboardStats, workflow_state
+
+logger = logging.getLogger(__name__)
+
+WORKFLOW_FIELDS = ('workflow_category', 'workflow_status')
+
+_state = threading.local()
+
+
+def _dirty():
+    if not hasattr(_state, 'proposals'):
+        _state.proposals = set()         # FormSubmission pks
+        _state.proposal_numbers = set()  # FormSubmission.proposal_id (Presentation's FK target)
+        _state.screenings = set()        # ScreeningRecord pks (TechnicalScreeningRecord's FK target)
+        _state.flushing = False
+    return _state
+
+
+def _schedule():
+    # Registering per mark is cheap and survives savepoint/transaction
+    # rollbacks (which discard earlier callbacks); extra calls find an empty set.
+    if not _dirty().flushing:
+        transaction.on_commit(flush)
+
+
+def mark_proposal(pk):
+    if pk is not None:
+        _dirty().proposals.add(pk)
+        _schedule()
+
+
+def mark_proposal_number(proposal_id):
+    if proposal_id:
+        _dirty().proposal_numbers.add(proposal_id)
+        _schedule()
+
+
+def mark_screening(screening_record_id):
+    if screening_record_id is not None:
+        _dirty().screenings.add(screening_record_id)
+        _schedule()
+
+
+def refresh(queryset, batch_size=500):
+    """
+    Recategorize the proposals of ``queryset`` (4 queries per ``batch_size``
+    proposals) and save the ones whose columns changed. Returns
+    ``(changed, applicant_ids)``. ``applicant_ids`` covers every proposal
+    looked at, not just the changed ones.
+    """
+    changed = []
+    applicant_ids = set()
+    proposals = DashboardStats.proposals_with_workflow(queryset.order_by())
+    for proposal in proposals.iterator(chunk_size=batch_size):
+        applicant_ids.add(proposal.applicant_id)
+        state = workflow_state(proposal.status, *DashboardStats.workflow_records(proposal))
+        if (proposal.workflow_category, proposal.workflow_status) != state:
+            proposal.workflow_category, proposal.workflow_status = state
+            changed.append(proposal)
+    # bulk_update: no signals and no updated_at bump, the proposal itself didn't change
+    FormSubmission.objects.bulk_update(changed, WORKFLOW_FIELDS, batch_size=batch_size)
+    applicant_ids.discard(None)
+    return len(changed), applicant_ids
+
+
+def flush():
+    """Recategorize everything marked dirty and recount the applicants' stats."""
+    from screening.models import ScreeningRecord
+
+    state = _dirty()
+    if state.flushing:
+        return
+    state.flushing = True
+    try:
+        while state.proposals or state.proposal_numbers or state.screenings:
+            pks, state.proposals = state.proposals, set()
+            numbers, state.proposal_numbers = state.proposal_numbers, set()
+            screenings, state.screenings = state.screenings, set()
+            if screenings:
+                pks |= set(
+                    ScreeningRecord.objects.filter(pk__in=screenings).values_list('proposal_id', flat=True)
+                )
+            changed, applicant_ids = refresh(
+                FormSubmission.objects.filter(Q(pk__in=pks) | Q(proposal_id__in=numbers))
+            )
+            if changed:
+                # bulk_update sends no signals; responses built from the old columns go
+                invalidate('formsubmission')
+            if applicant_ids:
+                DashboardStats.refresh_users(applicant_ids)
+    except Exception as e:
+        logger.error(f"Error flushing proposal workflow categories: {e}")
+    finally:
+        state.flushing = False
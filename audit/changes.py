@@ -0,0 +1,174 @@
+# audit/changes.py
+"""
+Field-level change sets for ActivityLog.
+
+Instead of a full snapshot of every column, updates store only the fields
+that differ from the instance's before-image as ``{"field": {"old": .., "new": ..}}``.
+The before-image is the state the instance was loaded with (``remember``
+on ``post_init``: a plain copy of the loaded values, plus copies of the
+non-empty JSON containers so in-place edits still show up; dropped again in
+``pre_save`` for instances that were never loaded) and is moved forward
+after every save (``capture``), so repeated saves of the same object diff
+against the previous save. Saving never reads the row back for it.
+
+Which fields are compared is configurable per model::
+
+    AUDIT_LOG_MODELS = {
+        'dynamic_form.formsubmission': {'exclude': ['applicationDocument']},
+        'tech_eval.evaluatorassignment': {'include': ['is_completed', 'overall_comments']},
+    }
+
+Fields with ``auto_now=True`` change on every save and are ignored unless
+listed in ``include``.
+"""
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import models
+from django.db.models.fields.files import FileField
+from django.dispatch import receiver
+
+_BEFORE_ATTR = '_audit_before'
+_tracked_cache = {}
+_json_cache = {}
+
+
+def model_config(model):
+    return getattr(settings, 'AUDIT_LOG_MODELS', {}).get(model._meta.label_lower, {})
+
+
+@receiver(setting_changed)
+def _reset_tracked_fields(setting, **kwargs):
+    if setting == 'AUDIT_LOG_MODELS':
+        _tracked_cache.clear()
+        _json_cache.clear()
+
+
+def tracked_fields(model):
+    """Concrete fields compared for ``model``, after include/exclude."""
+    fields = _tracked_cache.get(model)
+    if fields is None:
+        config = model_config(model)
+        include = set(config.get('include') or ())
+        exclude = set(config.get('exclude') or ())
+        fields = []
+        for field in model._meta.concrete_fields:
+            if include and field.name not in include:
+                continue
+            if field.name in exclude:
+                continue
+            if getattr(field, 'auto_now', False) and field.name not in include:
+                continue
+            fields.append(field)
+        fields = tuple(fields)
+        _tracked_cache[model] = fields
+    return fields
+
+
+def _json_attnames(model):
+    names = _json_cache.get(model)
+    if names is None:
+        names = _json_cache[model] = tuple(
+            field.attname for field in tracked_fields(model) if isinstance(field, models.JSONField)
+        )
+    return names
+
+
+def _copy_json(value):
+    """Deep copy of decoded JSON (dicts, lists and scalars only)."""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+def _raw(field, instance):
+    """Comparable value of ``field`` as stored in ``instance.__dict__`` (no queries)."""
+    value = instance.__dict__.get(field.attname)
+    if isinstance(field, FileField):
+        return getattr(value, 'name', value) or None
+    return value
+
+
+def capture(instance):
+    """Remember the current field values of ``instance`` as its before-image."""
+    before = {}
+    loaded = instance.__dict__
+    for field in tracked_fields(type(instance)):
+        if field.attname not in loaded:
+            continue  # deferred; never fetch just for auditing
+        value = _raw(field, instance)
+        if isinstance(value, (dict, list)):
+            value = _copy_json(value)
+        before[field.attname] = value
+    instance.__dict__[_BEFORE_ATTR] = before
+
+
+def remember(instance):
+    """
+    ``capture`` for post_init, which runs for every instance Django builds:
+    the loaded values are kept as they are (diff() only looks at the tracked
+    ones), and only non-empty JSON containers are copied.
+    """
+    before = dict(instance.__dict__)
+    del before['_state']
+    for attname in _json_attnames(type(instance)):
+        value = before.get(attname)
+        if value and isinstance(value, (dict, list)):
+            before[attname] = _copy_json(value)
+    instance.__dict__[_BEFORE_ATTR] = before
+
+
+def forget(instance):
+    instance.__dict__.pop(_BEFORE_ATTR, None)
+
+
+def has_before_image(instance):
+    return _BEFORE_ATTR in instance.__dict__
+
+
+def _display(field, value):
+    if value is None:
+        return None
+    if isinstance(field, FileField):
+        try:
+            return field.storage.url(value)
+        except Exception:
+            return value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(field, models.ForeignKey):
+        return str(value)
+    return value
+
+
+def diff(instance, update_fields=None):
+    """
+    ``{"field": {"old": .., "new": ..}}`` for tracked fields that changed
+    since the before-image. Without a before-image every loaded field is
+    reported with ``old: None`` (the create case).
+    """
+    before = instance.__dict__.get(_BEFORE_ATTR)
+    changes = {}
+    for field in tracked_fields(type(instance)):
+        if update_fields is not None and field.name not in update_fields and field.attname not in update_fields:
+            continue
+        if field.attname not in instance.__dict__:
+            continue
+        new = _raw(field, instance)
+        if before is None:
+            if new is None or new == '':
+                continue
+            old = None
+        else:
+            if field.attname not in before:
+                continue
+            old = before[field.attname]
+            if isinstance(field, FileField):
+                old = getattr(old, 'name', old) or None
+            if old == new:
+                continue
+        changes[field.name] = {'old': _display(field, old), 'new': _display(field, new)}
+    return changes
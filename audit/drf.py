@@ -3,6 +3,7 @@
 from rest_framework.response import Response
 from django.contrib.contenttypes.models import ContentType
 from .models import ActivityLog
+from .writer import record
 
 class AuditMixin:
     """
@@ -50,7 +51,7 @@ class AuditMixin:
                 obj_repr = None
 
         # Record the log
-        ActivityLog.objects.create(
+        record(ActivityLog(
             user        = user if user_id else None,
             action      = request.method.lower(),
             app_label   = ct.app_label,
@@ -62,6 +63,6 @@ class AuditMixin:
                 "status_code": resp.status_code,
                 "user_repr":   user_repr,
             }
-        )
+        ))
 
         return resp
@@ -0,0 +1,178 @@
+# audit/management/commands/archive_activity_log.py
+"""
+Move cold months of ActivityLog out of the table into gzipped JSONL files.
+
+    python manage.py archive_activity_log --keep-months 6
+    python manage.py archive_activity_log --keep-months 6 --dry-run
+    python manage.py archive_activity_log --restore 2025-01
+
+Each month goes to <output-dir>/activitylog-YYYY-MM.jsonl.gz (a numbered
+suffix is added if the month was archived before). There is no default
+directory: set AUDIT_LOG_ARCHIVE_DIR or pass --output-dir. Rows are only deleted
+after the file has been fully written, in small transactions, and every file
+is registered in ActivityLogArchive so it can be restored later.
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from audit.models import ActivityLog, ActivityLogArchive
+
+FIELDS = ('id', 'user_id', 'action', 'app_label', 'model_name',
+          'object_pk', 'object_repr', 'timestamp', 'changes')
+
+
+def month_start(dt):
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(dt):
+    return dt.replace(year=dt.year + 1, month=1) if dt.month == 12 else dt.replace(month=dt.month + 1)
+
+
+def shift_months(dt, months):
+    for _ in range(months):
+        dt = (dt.replace(year=dt.year - 1, month=12) if dt.month == 1 else dt.replace(month=dt.month - 1))
+    return dt
+
+
+class Command(BaseCommand):
+    help = 'Export ActivityLog months older than --keep-months to gzipped JSONL and delete them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-months', type=int, default=6,
+                            help='Complete months to keep in the table besides the current one (default: 6)')
+        parser.add_argument('--output-dir',
+                            default=getattr(settings, 'AUDIT_LOG_ARCHIVE_DIR', None),
+                            help='Where archive files are written (default: AUDIT_LOG_ARCHIVE_DIR)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows read/deleted per query (default: 5000)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many rows each month would archive')
+        parser.add_argument('--restore', metavar='YYYY-MM',
+                            help='Load the archive files of this month back into the table')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        if options['restore']:
+            return self.restore(options['restore'])
+
+        if options['keep_months'] < 0:
+            raise CommandError('--keep-months must be >= 0')
+        if not options['output_dir'] and not options['dry_run']:
+            raise CommandError(
+                'No archive directory: set AUDIT_LOG_ARCHIVE_DIR or pass --output-dir '
+                '(durable storage outside the source tree)'
+            )
+
+        cutoff = shift_months(month_start(timezone.localtime()), options['keep_months'])
+        oldest = ActivityLog.objects.order_by('timestamp').values_list('timestamp', flat=True).first()
+        if oldest is None or oldest >= cutoff:
+            self.stdout.write('Nothing older than %s to archive.' % cutoff.strftime('%Y-%m'))
+            return
+
+        if not options['dry_run']:
+            os.makedirs(options['output_dir'], exist_ok=True)
+
+        month = month_start(timezone.localtime(oldest))
+        while month < cutoff:
+            end = next_month(month)
+            rows = ActivityLog.objects.filter(timestamp__gte=month, timestamp__lt=end)
+            if options['dry_run']:
+                self.stdout.write(f'{month:%Y-%m}: {rows.count()} rows would be archived')
+            else:
+                self.archive_month(month, end, options['output_dir'])
+            month = end
+
+    # ------------------------------------------------------------------
+    def _archive_path(self, output_dir, month):
+        base = os.path.join(output_dir, f'activitylog-{month:%Y-%m}')
+        path, n = f'{base}.jsonl.gz', 1
+        while os.path.exists(path):
+            n += 1
+            path = f'{base}.{n}.jsonl.gz'
+        return path
+
+    def archive_month(self, month, end, output_dir):
+        path = self._archive_path(output_dir, month)
+        tmp_path = f'{path}.tmp'
+        written = 0
+        last = None
+
+        rows = ActivityLog.objects.filter(timestamp__gte=month, timestamp__lt=end).order_by('timestamp', 'id')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as fh:
+            while True:
+                chunk = rows if last is None else self._after(rows, last)
+                batch = list(chunk.values(*FIELDS)[:self.batch_size])
+                if not batch:
+                    break
+                for row in batch:
+                    fh.write(json.dumps(row, cls=DjangoJSONEncoder))
+                    fh.write('\n')
+                written += len(batch)
+                last = (batch[-1]['timestamp'], batch[-1]['id'])
+
+        if not written:
+            os.remove(tmp_path)
+            return
+        os.replace(tmp_path, path)
+
+        # Delete exactly the key range that was written, a chunk per transaction.
+        archived = rows.filter(Q(timestamp__lt=last[0]) | Q(timestamp=last[0], id__lte=last[1]))
+        while True:
+            ids = list(archived.values_list('id', flat=True)[:self.batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                ActivityLog.objects.filter(id__in=ids).delete()
+
+        ActivityLogArchive.objects.create(month=month.date(), path=path, row_count=written)
+        self.stdout.write(self.style.SUCCESS(f'{month:%Y-%m}: archived {written} rows to {path}'))
+
+    @staticmethod
+    def _after(rows, key):
+        # keyset pagination on (timestamp, id)
+        timestamp, pk = key
+        return rows.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk))
+
+    def restore(self, month_label):
+        try:
+            month = datetime.strptime(month_label, '%Y-%m').date()
+        except ValueError:
+            raise CommandError('--restore expects YYYY-MM')
+
+        archives = ActivityLogArchive.objects.filter(month=month, restored_at__isnull=True)
+        if not archives.exists():
+            raise CommandError(f'No unrestored archive recorded for {month_label}')
+
+        for archive in archives:
+            restored = 0
+            batch = []
+            with gzip.open(archive.path, 'rt', encoding='utf-8') as fh:
+                for line in fh:
+                    row = json.loads(line)
+                    row['timestamp'] = parse_datetime(row['timestamp'])
+                    batch.append(ActivityLog(**row))
+                    if len(batch) >= self.batch_size:
+                        restored += self._restore_batch(batch)
+                        batch = []
+            restored += self._restore_batch(batch)
+            archive.restored_at = timezone.now()
+            archive.save(update_fields=['restored_at'])
+            self.stdout.write(self.style.SUCCESS(f'Restored {restored} rows from {archive.path}'))
+
+    def _restore_batch(self, batch):
+        if not batch:
+            return 0
+        with transaction.atomic():
+            ActivityLog.objects.bulk_create(batch, ignore_conflicts=True)
+        return len(batch)
@@ -1,5 +1,12 @@
 # middleware.py
 import threading
+import time
+
+from django.conf import settings
+
+from auth_service.streaming import scoped
+
+from . import profiling
 
 _thread_locals = threading.local()
 
@@ -16,3 +23,38 @@ class CurrentUserMiddleware:
 
 def get_current_user():
     return getattr(_thread_locals, 'user', None)
+
+
+class QueryProfilerMiddleware:
+    """
+    Records query count, SQL time, duplicate statements and response size
+    per URL name (see audit/profiling.py). Off unless QUERY_PROFILER_ENABLED.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_PROFILER_ENABLED', False):
+            return self.get_response(request)
+
+        recorder = profiling.QueryRecorder()
+        start = time.perf_counter()
+        with recorder.wrap_connections():
+            response = self.get_response(request)
+        if getattr(response, 'streaming', False) and not getattr(response, 'is_async', False):
+            # Streamed bodies run their queries after we return; record at the end
+            content = response.streaming_content
+            response.streaming_content = self._profile_stream(request, response, content, recorder, start)
+            return response
+        profiling.record(request, response, recorder, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _profile_stream(request, response, content, recorder, start):
+        size = 0
+        try:
+            for chunk in scoped(content, recorder.wrap_connections):
+                size += len(chunk)
+                yield chunk
+        finally:
+            profiling.record(request, response, recorder, time.perf_counter() - start, size=size)
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_activitylog_timestamp_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityLogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(db_index=True, help_text='First day of the archived month')),
+                ('path', models.CharField(max_length=500)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('restored_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-month', '-archived_at'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='audit_activ_app_lab_78fbef_idx',
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['app_label', 'model_name', 'object_pk', 'timestamp'], name='audit_activ_app_lab_4a27db_idx'),
+        ),
+    ]
@@ -2,6 +2,7 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.core.serializers.json import DjangoJSONEncoder
 
 class ActivityLog(models.Model):
@@ -19,7 +20,8 @@ class ActivityLog(models.Model):
     model_name  = models.CharField(max_length=100)
     object_pk   = models.CharField(max_length=255, null=True, blank=True)
     object_repr = models.CharField(max_length=255, blank=True)
-    timestamp   = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is captured, not when audit.writer gets to insert it
+    timestamp   = models.DateTimeField(default=timezone.now, editable=False)
     # Use DjangoJSONEncoder to handle datetimes if they ever sneak through:
     changes     = models.JSONField(
         null=True,
@@ -34,8 +36,10 @@ class ActivityLog(models.Model):
             models.Index(fields=['user']),
             models.Index(fields=['timestamp']),
             models.Index(fields=['action']),
-            models.Index(fields=['app_label']),
             models.Index(fields=['model_name']),
+            # One object's history (and model + time range) is an index range
+            # scan; its app_label prefix also serves app_label-only filters.
+            models.Index(fields=['app_label', 'model_name', 'object_pk', 'timestamp']),
         ]
 
     def __str__(self):
@@ -44,3 +48,21 @@ class ActivityLog(models.Model):
             f"{self.user or 'SYSTEM'} | {self.action.upper()} | "
             f"{self.app_label}.{self.model_name} → {self.object_repr}"
         )
+
+
+class ActivityLogArchive(models.Model):
+    """
+    One gzipped JSONL file of ActivityLog rows moved out of the table by
+    ``manage.py archive_activity_log``.
+    """
+    month       = models.DateField(db_index=True, help_text="First day of the archived month")
+    path        = models.CharField(max_length=500)
+    row_count   = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    restored_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-month', '-archived_at']
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} → {self.path} ({self.row_count} rows)"
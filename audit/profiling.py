@@ -0,0 +1,219 @@
+# audit/profiling.py
+"""
+Per-endpoint SQL profiling.
+
+``audit.middleware.QueryProfilerMiddleware`` wraps every database connection
+for the duration of a request and records, per resolved URL name:
+
+* number of queries and total SQL time,
+* total request time and response size,
+* duplicate queries: statements whose fingerprint (the SQL with literals
+  removed) ran more than once in the same request, the usual sign of an N+1.
+
+The last ``QUERY_PROFILER_WINDOW`` requests of each endpoint are kept in
+memory (per process) and summarised with p50/p95/p99 by ``snapshot()``; the
+admin-only ``/api/audit/query-profile/`` endpoint serves that summary.
+A request that runs one fingerprint ``QUERY_PROFILER_N_PLUS_ONE`` times or
+more is also logged as a warning.
+
+For CI, ``assert_constant_queries()`` fails when the query count of a call
+grows with the size of its result set.
+"""
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+logger = logging.getLogger(__name__)
+
+TOP_DUPLICATES = 10
+
+_lock = threading.Lock()
+_endpoints = {}
+
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, ?(?:%s|\?))*\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACE = re.compile(r'\s+')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def fingerprint(sql):
+    """``sql`` with literals and IN-list lengths normalised away."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))  # nearest-rank
+    return ordered[min(len(ordered), max(rank, 1)) - 1]
+
+
+# ----------------------------------------------------------------------
+# Recording
+# ----------------------------------------------------------------------
+class QueryRecorder:
+    """``execute_wrapper`` that times and fingerprints each statement."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self):
+        return {sql: n for sql, n in self.fingerprints.items() if n > 1}
+
+    def wrap_connections(self):
+        stack = ExitStack()
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(self))
+        return stack
+
+
+class EndpointStats:
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.requests = 0
+        self.duplicates = Counter()
+
+    def add(self, sample, duplicates):
+        self.samples.append(sample)
+        self.requests += 1
+        for sql, n in duplicates.items():
+            self.duplicates[sql] += n - 1
+        if len(self.duplicates) > TOP_DUPLICATES * 10:
+            self.duplicates = Counter(dict(self.duplicates.most_common(TOP_DUPLICATES * 5)))
+
+    def summary(self):
+        def spread(key, digits=2):
+            values = [s[key] for s in self.samples if s[key] is not None]
+            result = {}
+            for pct in (50, 95, 99):
+                value = percentile(values, pct)
+                result[f'p{pct}'] = round(value, digits) if value is not None else None
+            result['max'] = round(max(values), digits) if values else None
+            return result
+
+        return {
+            'requests': self.requests,
+            'window': len(self.samples),
+            'queries': spread('queries', 0),
+            'sql_ms': spread('sql_ms'),
+            'total_ms': spread('total_ms'),
+            'response_bytes': spread('response_bytes', 0),
+            'duplicate_queries': spread('duplicates', 0),
+            'top_duplicates': [
+                {'sql': sql, 'repeats': n} for sql, n in self.duplicates.most_common(TOP_DUPLICATES)
+            ],
+        }
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.view_name or match.route or match._func_path
+
+
+def record(request, response, recorder, total_seconds, size=None):
+    """``size`` is given for streamed responses, counted as they were sent."""
+    name = f'{request.method} {endpoint_name(request)}'
+    duplicates = recorder.duplicates()
+    if size is None and not getattr(response, 'streaming', False):
+        size = len(response.content)
+    sample = {
+        'queries': recorder.count,
+        'sql_ms': recorder.seconds * 1000,
+        'total_ms': total_seconds * 1000,
+        'response_bytes': size,
+        'duplicates': sum(n - 1 for n in duplicates.values()),
+    }
+
+    threshold = _setting('QUERY_PROFILER_N_PLUS_ONE', 10)
+    worst = max(duplicates.items(), key=lambda item: item[1], default=None)
+    if worst and worst[1] >= threshold:
+        logger.warning("Possible N+1 on %s: %s queries, one statement ran %s times: %s",
+                       name, recorder.count, worst[1], worst[0][:300])
+
+    with _lock:
+        stats = _endpoints.get(name)
+        if stats is None:
+            stats = _endpoints[name] = EndpointStats(_setting('QUERY_PROFILER_WINDOW', 500))
+        stats.add(sample, duplicates)
+    return sample
+
+
+def snapshot():
+    """``{endpoint: summary}`` for this process, slowest p95 SQL time first."""
+    with _lock:
+        summaries = {name: stats.summary() for name, stats in _endpoints.items()}
+    return dict(sorted(
+        summaries.items(),
+        key=lambda item: item[1]['sql_ms']['p95'] or 0,
+        reverse=True,
+    ))
+
+
+def reset():
+    with _lock:
+        _endpoints.clear()
+
+
+# ----------------------------------------------------------------------
+# CI helper
+# ----------------------------------------------------------------------
+def query_growth(grow, call, sizes=(1, 10, 50), using='default'):
+    """
+    For each size: ``grow(size)`` (bring the data set up to ``size`` rows),
+    then count the queries of ``call()``. Returns ``[(size, queries), ...]``.
+    """
+    results = []
+    for size in sizes:
+        grow(size)
+        with CaptureQueriesContext(connections[using]) as ctx:
+            call()
+        results.append((size, len(ctx.captured_queries)))
+    return results
+
+
+def assert_constant_queries(grow, call, sizes=(1, 10, 50), slack=0, using='default'):
+    """
+    Raise AssertionError when the query count of ``call()`` changes by more
+    than ``slack`` as the data set grows, e.g. in a TestCase::
+
+        assert_constant_queries(
+            lambda n: make_submissions(n - FormSubmission.objects.count()),
+            lambda: self.client.get('/api/screening/admin/'),
+        )
+    """
+    results = query_growth(grow, call, sizes, using)
+    counts = [queries for _, queries in results]
+    if max(counts) - min(counts) > slack:
+        detail = ', '.join(f'{size} rows: {queries} queries' for size, queries in results)
+        raise AssertionError(f"Query count grows with result size ({detail})")
+    return results
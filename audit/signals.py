@@ -1,15 +1,17 @@
 # signals.py
-from datetime import date, datetime
-from django.db import transaction, models as django_models
-from django.db.models.signals import post_save, post_delete
+import logging
+
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.fields.files import FileField
-from django.apps import apps
-from django.db import connection
+from django.core.signals import request_finished
 
+from . import changes
 from .models import ActivityLog
 from .middleware import get_current_user
+from .writer import record, flush_leftovers
+
+logger = logging.getLogger(__name__)
 
 SKIP_APPS = (
     'audit',
@@ -25,16 +27,7 @@ def is_skipped(sender):
     label = sender._meta.app_label
     return label in SKIP_APPS or label.startswith('django')
 
-def _really_log(user, action, sender, instance, snapshot):
-    # Prevent logging if table does not exist
-    try:
-        # Table name may be quoted differently in some DBs
-        table_names = connection.introspection.table_names()
-        if 'audit_activitylog' not in table_names:
-            return  # Don't log until the table exists
-    except Exception:
-        return
-
+def _build_entry(user, action, sender, instance, snapshot):
     ct = ContentType.objects.get_for_model(sender)
     try:
         object_repr = str(instance)
@@ -42,18 +35,38 @@ def _really_log(user, action, sender, instance, snapshot):
         pk_name = instance._meta.pk.name
         object_repr = f"{ct.model} pk={getattr(instance, pk_name, 'unknown')}"
 
-    ActivityLog.objects.create(
-        user        = user,
+    return ActivityLog(
+        user_id     = user.pk if user is not None and user.is_authenticated else None,
         action      = action,
         app_label   = ct.app_label,
         model_name  = ct.model,
         object_pk   = str(getattr(instance, instance._meta.pk.name)),
-        object_repr = object_repr,
+        object_repr = object_repr[:255],
         changes     = snapshot,
     )
 
+def _really_log(user, action, sender, instance, snapshot):
+    # Captured now (repr, pk, timestamp), written in bulk after commit by audit.writer
+    record(_build_entry(user, action, sender, instance, snapshot))
+
+@receiver(post_init)
+def remember_loaded_state(sender, instance, **kwargs):
+    if is_skipped(sender):
+        return
+    try:
+        changes.remember(instance)
+    except Exception:
+        logger.exception("Could not capture the audit before-image of %s", sender._meta.label)
+
+@receiver(pre_save)
+def forget_constructor_state(sender, instance, **kwargs):
+    # post_init can't tell a DB row from Model(...); only loaded or already
+    # saved instances (adding=False) have a meaningful before-image.
+    if instance._state.adding and not is_skipped(sender):
+        changes.forget(instance)
+
 @receiver(post_save)
-def log_model_save(sender, instance, created, **kwargs):
+def log_model_save(sender, instance, created, update_fields=None, **kwargs):
     if is_skipped(sender):
         return
 
@@ -61,25 +74,21 @@ def log_model_save(sender, instance, created, **kwargs):
         user   = get_current_user()
         action = 'create' if created else 'update'
 
-        snapshot = {}
-        for field in instance._meta.fields:
-            name = field.name
-            val  = getattr(instance, name)
-
-            if isinstance(field, django_models.DateField) or isinstance(field, django_models.DateTimeField):
-                snapshot[name] = val.isoformat() if val else None
-            elif isinstance(field, django_models.ForeignKey):
-                snapshot[name] = str(val) if val else None
-            elif isinstance(field, FileField):
-                snapshot[name] = val.url if (val and hasattr(val, 'url')) else None
-            else:
-                snapshot[name] = val
-
-        transaction.on_commit(
-            lambda: _really_log(user, action, sender, instance, snapshot)
-        )
+        # Only changed fields as old/new pairs; creates (and saves of instances
+        # that were never loaded) report their values with old=None.
+        diff = changes.diff(instance, None if created else update_fields)
+        if not created and not diff:
+            return  # nothing tracked changed
+
+        _really_log(user, action, sender, instance, diff)
     except Exception:
         pass
+    finally:
+        try:
+            changes.capture(instance)
+        except Exception:
+            logger.exception("Could not capture the audit before-image of %s pk=%s",
+                             sender._meta.label, instance.pk)
 
 @receiver(post_delete)
 def log_model_delete(sender, instance, **kwargs):
@@ -88,8 +97,9 @@ def log_model_delete(sender, instance, **kwargs):
 
     try:
         user = get_current_user()
-        transaction.on_commit(
-            lambda: _really_log(user, 'delete', sender, instance, None)
-        )
+        _really_log(user, 'delete', sender, instance, None)
     except Exception:
         pass
+
+# Anything a savepoint rollback kept from flushing at commit goes out with the response.
+request_finished.connect(flush_leftovers, dispatch_uid='audit_flush_leftovers')
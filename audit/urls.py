@@ -1,5 +1,5 @@
 from rest_framework import routers
-from audit.views import ActivityLogViewSet,AdminUserListView, AdminUserDetailView, AdminActivityLogViewSet,LatestActivityLogsAPIView
+from audit.views import ActivityLogViewSet,AdminUserListView, AdminUserDetailView, AdminActivityLogViewSet,LatestActivityLogsAPIView,QueryProfileAPIView
 from django.urls import path, include
 
 router = routers.DefaultRouter()
@@ -10,5 +10,6 @@ urlpatterns = [
     path('admin/users/', AdminUserListView.as_view(), name='admin-user-list'),
     path('admin/users/<int:pk>/', AdminUserDetailView.as_view(), name='admin-user-detail'),
     path('latest-logs/', LatestActivityLogsAPIView.as_view(), name='latest-logs'),
+    path('query-profile/', QueryProfileAPIView.as_view(), name='query-profile'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
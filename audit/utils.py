@@ -1,10 +1,11 @@
 # audit/utils.py
 from django.contrib.contenttypes.models import ContentType
 from .models import ActivityLog
+from .writer import record
 
 def log_admin_action(user, action, instance):
     ct = ContentType.objects.get_for_model(instance.__class__)
-    ActivityLog.objects.create(
+    record(ActivityLog(
         user        = user,
         action      = action,
         app_label   = ct.app_label,
@@ -12,4 +13,21 @@ def log_admin_action(user, action, instance):
         object_pk   = str(getattr(instance, instance._meta.pk.name)),
         object_repr = str(instance),
         changes     = None,   # or capture a snapshot if you like
-    )
+    ))
+
+
+def log_bulk_change(user, instance, changes):
+    """
+    One 'update' entry on ``instance`` describing a bulk write of its related
+    rows (bulk_create/bulk_update send no signals, so nothing else logs them).
+    """
+    ct = ContentType.objects.get_for_model(instance.__class__)
+    record(ActivityLog(
+        user_id     = user.pk if user is not None and user.is_authenticated else None,
+        action      = 'update',
+        app_label   = ct.app_label,
+        model_name  = ct.model,
+        object_pk   = str(getattr(instance, instance._meta.pk.name)),
+        object_repr = str(instance)[:255],
+        changes     = changes,
+    ))
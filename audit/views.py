@@ -66,8 +66,10 @@ from datetime import timedelta
 
 class AdminActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
     """
-    Admin can view audit logs. Filter by user (user=<id>), date range (start, end).
-    Only shows last 30 days by default.
+    Admin can view audit logs. Filter by user (user=<id>), date range (start, end)
+    and object (app_label, model_name, object_pk - served by the composite
+    history index). Only shows last 30 days by default.
+    Months moved out by ``archive_activity_log`` are not included.
     """
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAdminUser]
@@ -80,11 +82,20 @@ class AdminActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
         user_id = self.request.query_params.get('user')
         start = self.request.query_params.get('start')
         end = self.request.query_params.get('end')
+        app_label = self.request.query_params.get('app_label')
+        model_name = self.request.query_params.get('model_name')
+        object_pk = self.request.query_params.get('object_pk')
 
         # Show last 30 days by default if no filters
-        if not (user_id or start or end):
+        if not (user_id or start or end or object_pk):
             qs = qs.filter(timestamp__gte=timezone.now() - timedelta(days=30))
 
+        if app_label:
+            qs = qs.filter(app_label=app_label)
+        if model_name:
+            qs = qs.filter(model_name=model_name.lower())
+        if object_pk:
+            qs = qs.filter(object_pk=object_pk)
         if user_id:
             qs = qs.filter(user_id=user_id)
         if start:
@@ -112,4 +123,24 @@ class LatestActivityLogsAPIView(APIView):
 
         logs = ActivityLog.objects.select_related('user').order_by('-timestamp')[:limit]
         serializer = ActivityLogSerializer(logs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class QueryProfileAPIView(APIView):
+    """
+    Admin-only per-endpoint SQL profile collected by QueryProfilerMiddleware
+    (this worker process only). ?endpoint=<substring> filters, DELETE resets.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, format=None):
+        from .profiling import snapshot
+        data = snapshot()
+        needle = request.query_params.get('endpoint')
+        if needle:
+            data = {name: summary for name, summary in data.items() if needle in name}
+        return Response(data, status=status.HTTP_200_OK)
+
+    def delete(self, request, format=None):
+        from .profiling import reset
+        reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
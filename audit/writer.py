@@ -0,0 +1,255 @@
+# audit/writer.py
+"""
+Buffered ActivityLog writer.
+
+Signal handlers build an unsaved ``ActivityLog`` and call ``record()``. The
+entry is only handed over once its transaction commits (entries made inside a
+rolled back transaction or savepoint are discarded, as before), and rows are
+then written with ``bulk_create`` instead of one INSERT each:
+
+* ``AUDIT_LOG_WRITER = 'commit'`` (default): entries committed together are
+  written in one ``bulk_create`` right after the last one is confirmed.
+* ``AUDIT_LOG_WRITER = 'background'``: entries go to a bounded in-process
+  queue drained by a daemon thread in batches of ``AUDIT_LOG_BATCH_SIZE``.
+  When the queue is full ``AUDIT_LOG_BACKPRESSURE`` decides what happens:
+  ``'block'`` waits up to ``AUDIT_LOG_BLOCK_TIMEOUT`` seconds and then drops,
+  ``'drop'`` drops at once, ``'inline'`` writes the entry in the caller's thread.
+
+``stats()`` returns per-process counters (recorded, written, dropped, delayed,
+failed). Dropped entries are also logged as warnings.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from itertools import count
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+WRITER_COMMIT = 'commit'
+WRITER_BACKGROUND = 'background'
+
+BACKPRESSURE_BLOCK = 'block'
+BACKPRESSURE_DROP = 'drop'
+BACKPRESSURE_INLINE = 'inline'
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# ----------------------------------------------------------------------
+# Metrics
+# ----------------------------------------------------------------------
+_stats_lock = threading.Lock()
+_stats = {'recorded': 0, 'written': 0, 'dropped': 0, 'delayed': 0, 'failed': 0}
+
+
+def _bump(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def stats():
+    """Snapshot of this process's audit writer counters."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    snapshot['queued'] = _background.qsize() if _background else 0
+    return snapshot
+
+
+# ----------------------------------------------------------------------
+# Table check (once per process; re-checked after migrations)
+# ----------------------------------------------------------------------
+_table_ready = None
+
+
+def table_ready():
+    global _table_ready
+    if _table_ready is None:
+        try:
+            _table_ready = ActivityLog._meta.db_table in connection.introspection.table_names()
+        except Exception:
+            return False
+    return _table_ready
+
+
+@receiver(post_migrate)
+def _reset_table_check(sender, **kwargs):
+    global _table_ready
+    _table_ready = None
+
+
+# ----------------------------------------------------------------------
+# Writing
+# ----------------------------------------------------------------------
+def write_entries(entries):
+    """bulk_create ``entries``; returns the number written."""
+    if not entries:
+        return 0
+    if not table_ready():
+        _bump('dropped', len(entries))
+        return 0
+    try:
+        ActivityLog.objects.bulk_create(entries, batch_size=_setting('AUDIT_LOG_BATCH_SIZE', 500))
+    except Exception:
+        _bump('failed', len(entries))
+        logger.exception("Failed to write %s audit log entries", len(entries))
+        return 0
+    _bump('written', len(entries))
+    return len(entries)
+
+
+# Commit mode: entries confirmed by on_commit wait here until the last entry
+# registered in the transaction is confirmed, then go out in one bulk_create.
+_local = threading.local()
+_sequence = count(1)
+
+
+def _committed():
+    if not hasattr(_local, 'entries'):
+        _local.entries = []
+        _local.last_seq = 0
+    return _local
+
+
+def _confirm(entry, seq):
+    state = _committed()
+    state.entries.append(entry)
+    if seq == state.last_seq:
+        flush()
+
+
+def flush():
+    """Write whatever this thread has confirmed but not written yet."""
+    state = _committed()
+    entries, state.entries = state.entries, []
+    write_entries(entries)
+
+
+def flush_leftovers(**kwargs):
+    # Entries whose transaction's last registered entry was rolled back (a
+    # savepoint) never triggered a flush; they go out here, late.
+    state = _committed()
+    if state.entries:
+        _bump('delayed', len(state.entries))
+        flush()
+
+
+class BackgroundWriter:
+    def __init__(self, maxsize, batch_size, interval=1.0):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self.thread.start()
+
+    def qsize(self):
+        return self.queue.qsize()
+
+    def put(self, entry):
+        policy = _setting('AUDIT_LOG_BACKPRESSURE', BACKPRESSURE_BLOCK)
+        try:
+            self.queue.put_nowait(entry)
+            return
+        except queue.Full:
+            pass
+
+        if policy == BACKPRESSURE_INLINE:
+            _bump('delayed')
+            write_entries([entry])
+            return
+        if policy == BACKPRESSURE_BLOCK:
+            try:
+                self.queue.put(entry, timeout=_setting('AUDIT_LOG_BLOCK_TIMEOUT', 1.0))
+                _bump('delayed')
+                return
+            except queue.Full:
+                pass
+        _bump('dropped')
+        logger.warning("Audit log queue full (%s entries); dropped %s.%s %s",
+                       self.queue.maxsize, entry.app_label, entry.model_name, entry.object_pk)
+
+    def drain(self, block=True):
+        try:
+            batch = [self.queue.get(timeout=self.interval) if block else self.queue.get_nowait()]
+        except queue.Empty:
+            return 0
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        close_old_connections()
+        return write_entries(batch)
+
+    def _run(self):
+        while True:
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Audit log writer crashed; restarting loop")
+                time.sleep(self.interval)
+
+    def stop(self):
+        while self.drain(block=False):
+            pass
+
+
+_background = None
+_background_lock = threading.Lock()
+
+
+def _background_writer():
+    global _background
+    # A forked worker inherits the object but not the thread, so start a new one.
+    if _background is None or _background.pid != os.getpid():
+        with _background_lock:
+            if _background is None or _background.pid != os.getpid():
+                _background = BackgroundWriter(
+                    maxsize=_setting('AUDIT_LOG_QUEUE_SIZE', 10000),
+                    batch_size=_setting('AUDIT_LOG_BATCH_SIZE', 500),
+                )
+    return _background
+
+
+def _hand_off(entry):
+    _background_writer().put(entry)
+
+
+# ----------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------
+def record(entry, using=None):
+    """
+    Queue an unsaved ``ActivityLog`` for writing once the current
+    transaction commits (immediately in autocommit mode).
+    """
+    _bump('recorded')
+    if _setting('AUDIT_LOG_WRITER', WRITER_COMMIT) == WRITER_BACKGROUND:
+        transaction.on_commit(lambda: _hand_off(entry), using=using)
+        return
+
+    seq = next(_sequence)
+    _committed().last_seq = seq
+    transaction.on_commit(lambda: _confirm(entry, seq), using=using)
+
+
+@atexit.register
+def _shutdown():
+    try:
+        flush_leftovers()
+        if _background is not None and _background.pid == os.getpid():
+            _background.stop()
+    except Exception:
+        pass
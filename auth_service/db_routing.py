@@ -0,0 +1,83 @@
+# auth_service/db_routing.py
+"""
+Send read-only dashboard/report traffic to a replica database.
+
+``PrimaryReplicaRouter`` (in DATABASE_ROUTERS) leaves every query on
+``default`` except reads made inside ``use_replica()``, which go to the
+``DATABASE_REPLICA_ALIAS`` connection when that alias exists in DATABASES.
+``ReplicaRoutingMiddleware`` opens that scope for GET/HEAD requests under
+``DATABASE_REPLICA_PATHS``, so those endpoints read from the replica while
+form autosaves and every other write keep the primary to themselves::
+
+    with use_replica():
+        summary = admin_dashboard_summary()
+
+Writes always go to ``default``, including saves of instances that were
+read from the replica. Replica reads may lag the primary, so only
+endpoints that never write and can tolerate a few seconds of staleness
+belong in DATABASE_REPLICA_PATHS. Without a replica alias everything
+reads from ``default`` as before.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_alias():
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def replica_requested():
+    """True inside use_replica()."""
+    return _use_replica.get()
+
+
+@contextmanager
+def use_replica():
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Reads of GET/HEAD requests under DATABASE_REPLICA_PATHS use the replica."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        prefixes = tuple(getattr(settings, 'DATABASE_REPLICA_PATHS', ()))
+        if request.method in ('GET', 'HEAD') and prefixes and request.path.startswith(prefixes):
+            with use_replica():
+                return self.get_response(request)
+        return self.get_response(request)
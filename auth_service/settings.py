@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 from corsheaders.defaults import default_headers, default_methods
@@ -65,6 +67,8 @@ INSTALLED_APPS = [
     'notifications.apps.NotificationsConfig',     
     'audit.apps.AuditConfig',  
     'applicant_dashboard', 
+    'jobs',
+    'documents',
     
 
 ]
@@ -80,6 +84,8 @@ AUTHENTICATION_BACKENDS = [
 MIDDLEWARE = [
     
     'audit.middleware.CurrentUserMiddleware',
+    'audit.middleware.QueryProfilerMiddleware',
+    'auth_service.db_routing.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -132,9 +138,28 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests; ping them before reuse
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        # Run on every new SQLite connection: WAL lets dashboard reads proceed
+        # while an autosave writes, busy timeout (seconds) waits for the lock
+        # instead of failing, IMMEDIATE takes the write lock at BEGIN so a
+        # transaction never has to upgrade (and deadlock) mid-way.
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Read replica for dashboards/reports (auth_service/db_routing.py). Add a
+# DATABASES[DATABASE_REPLICA_ALIAS] entry (with 'TEST': {'MIRROR': 'default'})
+# to enable it; GET requests under DATABASE_REPLICA_PATHS then read from it.
+DATABASE_ROUTERS = ['auth_service.db_routing.PrimaryReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica'
+DATABASE_REPLICA_PATHS = ['/api/dashboard/', '/api/proposal/']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -176,6 +201,9 @@ STATIC_URL = 'static/'
 #MEDIA_ROOT = BASE_DIR / 'submissions'
 MEDIA_URL = '/submissions/' 
 MEDIA_ROOT = BASE_DIR  / 'submissions'
+# Screening and milestone documents are stored once per content under
+# MEDIA_ROOT/cas/ (documents.storage); run `manage.py gc_blobs` periodically
+# to delete the ones no record references any more.
 
 
 # Default primary key field type
@@ -194,6 +222,110 @@ REST_FRAMEWORK = {
 }
 
 
+# tech_eval: when True, dirty TechnicalEvaluationRound caches are recomputed by
+# the jobs worker (manage.py run_jobs) instead of at transaction commit.
+TECH_EVAL_DEFERRED_ROUND_CACHE = False
+
+# tech_eval: default page size of technical-evaluations/admin-list/ (keyset
+# pagination, clients can ask for up to 1000 with ?page_size=).
+TECH_EVAL_ADMIN_LIST_PAGE_SIZE = 100
+
+# ?stream=true responses (auth_service/streaming.py): rows fetched per
+# database round trip while streaming.
+STREAMING_JSON_CHUNK_SIZE = 500
+
+# ETag / If-None-Match on the dashboard endpoints (dashboard/conditional.py):
+# unchanged data answers 304 without re-running the aggregation.
+DASHBOARD_CONDITIONAL_GET = True
+
+# Cache backend. With REDIS_CACHE_URL (e.g. redis://127.0.0.1:6379/1) all
+# workers share one Redis cache; without it each process keeps its own.
+REDIS_CACHE_URL = os.environ.get('REDIS_CACHE_URL', '')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'ttdf',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ttdf',
+        }
+    }
+
+# Aggregate response cache (dashboard/response_cache.py), invalidated on saves
+# of the tagged models; TIMEOUT bounds staleness for everything else.
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Email. Notification emails go through the outbox (notifications/outbox.py)
+# and are sent by manage.py deliver_emails. For local testing set
+# EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend to write
+# them under EMAIL_FILE_PATH (a temp directory, outside the source tree) instead.
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', os.path.join(tempfile.gettempdir(), 'ttdf_sent_emails'))
+NOTIFICATION_FROM_EMAIL = 'noreply@example.com'
+# Rows per INSERT when one event notifies many users
+NOTIFICATION_FANOUT_BATCH_SIZE = 1000
+
+# Notification consumer (notifications/kafka_consumer.py): records per batch
+# transaction, how long to wait for a batch to fill before writing it and how
+# often a batch is retried after a database error before the consumer stops.
+KAFKA_CONSUMER_BATCH_SIZE = 500
+KAFKA_CONSUMER_LINGER_MS = 1000
+KAFKA_CONSUMER_MAX_RETRIES = 5
+
+# Audit log writer (audit/writer.py). 'commit' bulk-inserts a transaction's
+# entries when it commits; 'background' hands them to a writer thread with a
+# bounded queue. When that queue is full: 'block' (up to the timeout, then
+# drop), 'drop', or 'inline' (write from the caller's thread).
+AUDIT_LOG_WRITER = 'commit'
+AUDIT_LOG_BATCH_SIZE = 500
+AUDIT_LOG_QUEUE_SIZE = 10000
+AUDIT_LOG_BACKPRESSURE = 'block'
+AUDIT_LOG_BLOCK_TIMEOUT = 1.0
+
+# Per-model field selection for audit change sets (audit/changes.py), keyed by
+# '<app_label>.<model_name>' with 'include' and/or 'exclude' field lists.
+# Derived cache columns are left out so recomputing them doesn't log updates.
+AUDIT_LOG_MODELS = {
+    'dynamic_form.formsubmission': {'exclude': ['applicationDocument', 'pdf_status']},
+    'tech_eval.technicalevaluationround': {'exclude': [
+        'cached_assigned_count', 'cached_completed_count', 'cached_average_percentage',
+        'cached_marks_summary', 'cached_evaluator_data', 'cached_proposal_data',
+    ]},
+    'tech_eval.evaluatorassignment': {'exclude': [
+        'cached_raw_marks', 'cached_max_marks', 'cached_percentage_score',
+        'cached_criteria_count', 'cached_criteria_data',
+    ]},
+    'tech_eval.criteriaevaluation': {'exclude': ['cached_percentage', 'cached_weighted_score']},
+}
+
+# Where manage.py archive_activity_log writes its monthly files. They hold the
+# only copy of the archived rows, so point this at durable storage outside the
+# source tree; the command refuses to archive until it (or --output-dir) is set.
+AUDIT_LOG_ARCHIVE_DIR = os.environ.get('AUDIT_LOG_ARCHIVE_DIR')
+
+# Per-endpoint SQL profile (audit/profiling.py), served at /api/audit/query-profile/.
+# WINDOW is how many recent requests per endpoint the percentiles cover;
+# a request repeating one statement N_PLUS_ONE times is logged as a warning.
+# Fingerprints every query of every request, so it's off unless DEBUG or
+# QUERY_PROFILER_ENABLED=1 in the environment.
+QUERY_PROFILER_ENABLED = os.environ.get('QUERY_PROFILER_ENABLED', '1' if DEBUG else '0').lower() in ('1', 'true', 'yes')
+QUERY_PROFILER_WINDOW = 500
+QUERY_PROFILER_N_PLUS_ONE = 10
+
+# Reference rows shared by list serializers (configuration/reference_data.py):
+# always loaded once per request; > 0 also keeps them in-process for that many
+# seconds (dropped early on local writes to committees/services/requirements).
+REFERENCE_DATA_CACHE_SECONDS = 0
+
+
 CORS_ALLOW_ALL_ORIGINS = True 
 CORS_ALLOW_CREDENTIALS = True
 
@@ -0,0 +1,157 @@
+# auth_service/streaming.py
+"""
+Opt-in streaming JSON for large list and dashboard endpoints.
+
+A view builds its response document as usual but wraps the big arrays in
+``JSONStream`` (typically a generator over ``queryset.iterator(chunk_size=...)``).
+``streaming_json_response()`` encodes the document incrementally, so only one
+chunk of rows is in memory at a time and the first bytes go out before the
+last row is read::
+
+    rows = (serialize(p) for p in queryset.iterator(chunk_size=stream_chunk_size()))
+    if wants_stream(request):
+        return streaming_json_response({'summary': summary, 'data': JSONStream(rows)})
+    return Response({'summary': summary, 'data': list(rows)})
+
+Clients opt in with ``?stream=true``. The output is the same JSON that DRF
+would render, just sent in pieces.
+
+The rows are read while the body is sent, after the view and the middleware
+have returned. ``streaming_json_response()`` therefore re-enters the view's
+replica scope (``use_replica``) around every chunk, and
+QueryProfilerMiddleware keeps recording until the stream ends. The view's own
+try/except does not cover that part: status and headers are already out, so
+an error is logged and leaves a truncated document, which clients should
+treat as a failed request.
+"""
+import logging
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .db_routing import replica_requested, use_replica
+
+logger = logging.getLogger(__name__)
+
+STREAM_QUERY_PARAM = 'stream'
+_TRUTHY = ('1', 'true', 'yes')
+
+
+class JSONStream:
+    """An iterable rendered as a JSON array, one item at a time."""
+
+    def __init__(self, iterable):
+        self.iterable = iterable
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+
+def wants_stream(request):
+    params = getattr(request, 'query_params', request.GET)
+    return params.get(STREAM_QUERY_PARAM, '').lower() in _TRUTHY
+
+
+def stream_chunk_size():
+    """Rows fetched per round trip by ``.iterator()`` in streaming mode."""
+    return getattr(settings, 'STREAMING_JSON_CHUNK_SIZE', 500)
+
+
+def _encoder():
+    # Same options as DRF's JSONRenderer
+    return JSONEncoder(
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=(',', ':') if api_settings.COMPACT_JSON else (', ', ': '),
+    )
+
+
+def _contains_stream(value):
+    if isinstance(value, JSONStream):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_stream(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_contains_stream(v) for v in value)
+    return False
+
+
+def iter_json(value, encoder=None):
+    """Yield ``value`` as JSON text fragments, expanding every JSONStream lazily."""
+    encoder = encoder or _encoder()
+    if isinstance(value, JSONStream):
+        yield '['
+        for index, item in enumerate(value):
+            if index:
+                yield ','
+            yield from iter_json(item, encoder)
+        yield ']'
+    elif isinstance(value, dict) and _contains_stream(value):
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            if index:
+                yield ','
+            yield encoder.encode(str(key))
+            yield ':'
+            yield from iter_json(item, encoder)
+        yield '}'
+    elif isinstance(value, (list, tuple)) and _contains_stream(value):
+        yield from iter_json(JSONStream(value), encoder)
+    else:
+        yield encoder.encode(value)
+
+
+def _encode(text):
+    # JSONRenderer escapes these two for JavaScript compatibility as well
+    return text.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode('utf-8')
+
+
+def _buffered(fragments, size):
+    buffer, length = [], 0
+    for fragment in fragments:
+        buffer.append(fragment)
+        length += len(fragment)
+        if length >= size:
+            yield _encode(''.join(buffer))
+            buffer, length = [], 0
+    if buffer:
+        yield _encode(''.join(buffer))
+
+
+def scoped(iterable, scope):
+    """
+    Iterate ``iterable`` with the context manager ``scope()`` entered around
+    each step only, so nothing stays entered while a chunk is being sent.
+    """
+    iterator = iter(iterable)
+    while True:
+        with scope():
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def _logged(chunks):
+    try:
+        yield from chunks
+    except Exception:
+        logger.exception('Streamed JSON response failed part-way; the client gets a truncated document')
+        raise
+
+
+def streaming_json_response(document, status=200, buffer_size=64 * 1024):
+    chunks = _buffered(iter_json(document), buffer_size)
+    if replica_requested():
+        # ReplicaRoutingMiddleware's scope ends before the body is read
+        chunks = scoped(chunks, use_replica)
+    response = StreamingHttpResponse(
+        _logged(chunks),
+        status=status,
+        content_type='application/json',
+    )
+    response['X-Content-Streamed'] = 'true'
+    return response
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ConfigurationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'configuration'
+
+    def ready(self):
+        from .reference_data import connect_signals
+        connect_signals()
@@ -0,0 +1,159 @@
+# configuration/reference_data.py
+"""
+Per-service reference rows (screening committees with their members,
+evaluation cutoff, passing requirement) for serializers.
+
+List endpoints used to look these up once per serialized proposal. Here they
+are loaded for *all* services in a handful of queries the first time anything
+asks, and shared through the serializer context, so a page of 500 proposals
+costs the same few reference queries as a page of 1::
+
+    def get_committeeDetails(self, obj):
+        committee = reference_data(self.context).committee(obj.service_id, 'administrative')
+
+The snapshot lives for the request. With ``REFERENCE_DATA_CACHE_SECONDS`` > 0
+it is also kept in-process and reused by later requests until that many
+seconds pass or a ``Service``, ``ScreeningCommittee``, ``CommitteeMember``,
+``PassingRequirement`` or ``EvaluationCutoff`` is written in this process
+(which bumps the version). Other processes only notice on expiry, so keep the
+timeout short.
+"""
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+
+_CONTEXT_KEY = '_reference_data'
+
+_version = 0
+_shared = None  # (version, loaded_at, snapshot)
+_lock = threading.Lock()
+
+
+def invalidate(**kwargs):
+    global _version, _shared
+    with _lock:
+        _version += 1
+        _shared = None
+
+
+def connect_signals():
+    from app_eval.models import EvaluationCutoff, PassingRequirement
+    from .models import CommitteeMember, ScreeningCommittee, Service
+
+    for model in (Service, ScreeningCommittee, CommitteeMember, PassingRequirement, EvaluationCutoff):
+        uid = f'reference-data-{model._meta.label_lower}'
+        post_save.connect(invalidate, sender=model, dispatch_uid=f'{uid}-save')
+        post_delete.connect(invalidate, sender=model, dispatch_uid=f'{uid}-delete')
+
+
+class ReferenceSnapshot:
+    """Everything loaded at once; read-only after construction."""
+
+    def __init__(self):
+        from app_eval.models import EvaluationCutoff, PassingRequirement
+        from .models import CommitteeMember, ScreeningCommittee, Service
+
+        members = defaultdict(list)
+        for member in CommitteeMember.objects.select_related('user').order_by('assigned_at'):
+            members[member.committee_id].append(member)
+
+        self.committees = {}
+        for committee in ScreeningCommittee.objects.select_related('head'):
+            committee.reference_members = members.get(committee.pk, [])
+            self.committees[(committee.service_id, committee.committee_type)] = committee
+
+        self.cutoffs = dict(EvaluationCutoff.objects.values_list('service_id', 'cutoff_marks'))
+
+        requirements = {r.pk: r for r in PassingRequirement.objects.all()}
+        self.passing_requirements = {
+            service_id: requirements.get(requirement_id)
+            for service_id, requirement_id in Service.objects.values_list('pk', 'passing_requirement_id')
+        }
+        active = [r for r in requirements.values() if r.status == 'Active']
+        self.active_passing_requirement = min(active, key=lambda r: r.pk) if active else None
+
+
+class ReferenceData:
+    """Lazy, version-checked view of the snapshot for one request."""
+
+    def __init__(self):
+        self._snapshot = None
+        self._version = None
+
+    @property
+    def snapshot(self):
+        if self._snapshot is None or self._version != _version:
+            self._version = _version
+            self._snapshot = _shared_snapshot()
+        return self._snapshot
+
+    def committee(self, service_id, committee_type):
+        """The service's ScreeningCommittee of that type, or None."""
+        return self.snapshot.committees.get((service_id, committee_type))
+
+    def committee_details(self, service_id, committee_type, document_uploaded):
+        """
+        The ``committeeDetails`` dict of the screening/presentation
+        serializers. ``document_uploaded`` is a callable for the
+        per-proposal flag; it's only called when the committee exists.
+        """
+        committee = self.committee(service_id, committee_type)
+        if committee is None:
+            return None
+        return {
+            'name': committee.name,
+            'head': committee.head.full_name if committee.head else None,
+            'members': [m.user.full_name for m in committee.reference_members],
+            'documentUploaded': document_uploaded(),
+            'evaluationStopped': not committee.is_active,
+        }
+
+    def cutoff_marks(self, service_id):
+        return self.snapshot.cutoffs.get(service_id)
+
+    def passing_requirement(self, service_id):
+        return self.snapshot.passing_requirements.get(service_id)
+
+    def active_passing_requirement(self):
+        """Fallback used where a service has no requirement of its own."""
+        return self.snapshot.active_passing_requirement
+
+
+def _shared_snapshot():
+    global _shared
+    timeout = getattr(settings, 'REFERENCE_DATA_CACHE_SECONDS', 0)
+    if not timeout:
+        return ReferenceSnapshot()
+
+    version = _version
+    shared = _shared
+    if shared and shared[0] == version and time.monotonic() - shared[1] < timeout:
+        return shared[2]
+    snapshot = ReferenceSnapshot()
+    with _lock:
+        if version == _version:
+            _shared = (version, time.monotonic(), snapshot)
+    return snapshot
+
+
+def reference_data(context=None):
+    """
+    The ReferenceData for this serializer context (shared by a ListSerializer
+    and all of its children). Without a context every call gets a fresh one.
+    """
+    if context is None:
+        return ReferenceData()
+    request = context.get('request')
+    if request is not None:
+        data = getattr(request, _CONTEXT_KEY, None)
+        if data is None:
+            data = ReferenceData()
+            setattr(request, _CONTEXT_KEY, data)
+        return data
+    data = context.get(_CONTEXT_KEY)
+    if data is None:
+        data = context[_CONTEXT_KEY] = ReferenceData()
+    return data
@@ -6,6 +6,7 @@ from .models import (
     Application, ApplicationStageProgress
 )
 from .models import ScreeningCommittee, CommitteeMember, ScreeningResult,CriteriaEvaluatorAssignment
+from .reference_data import reference_data
 from dynamic_form.models import FormTemplate, FormField
 from app_eval.models import CriteriaType
 from dynamic_form.serializers import FormTemplateSerializer
@@ -687,18 +688,16 @@ class ServiceConfigSerializer(serializers.ModelSerializer):
         return obj.created_by.get_full_name() if obj.created_by else None
 
     def get_cutoff_marks(self, obj):
-        cutoff = EvaluationCutoff.objects.filter(service=obj).first()
-        return cutoff.cutoff_marks if cutoff else None
+        return reference_data(self.context).cutoff_marks(obj.pk)
 
     def get_presentation_max_marks(self, obj):
-        if hasattr(obj, 'passing_requirement') and obj.passing_requirement:
-            return obj.passing_requirement.presentation_max_marks
-        return None
+        requirement = reference_data(self.context).passing_requirement(obj.pk)
+        return requirement.presentation_max_marks if requirement else None
 
     def get_admin_committee(self, obj):
-        committee = ScreeningCommittee.objects.filter(service=obj, committee_type='administrative').order_by('-id').first()
+        committee = reference_data(self.context).committee(obj.pk, 'administrative')
         return SimpleCommitteeSerializer(committee).data if committee else None
 
     def get_tech_committee(self, obj):
-        committee = ScreeningCommittee.objects.filter(service=obj, committee_type='technical').order_by('-id').first()
+        committee = reference_data(self.context).committee(obj.pk, 'technical')
         return SimpleCommitteeSerializer(committee).data if committee else None
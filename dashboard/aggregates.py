@@ -0,0 +1,119 @@
+# dashboard/aggregates.py
+"""
+Grouped aggregation helpers for the dashboards.
+
+Every per-service breakdown is computed with one grouped query per table
+(conditional ``Count(filter=Q(...))``) and the rows are joined in memory by
+service id, so the number of queries does not depend on the number of
+services.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, Q
+
+from configuration.models import Service
+from dynamic_form.models import FormSubmission
+from presentation.models import Presentation
+from tech_eval.models import TechnicalEvaluationRound
+from users.models import User
+
+
+def _by_service(rows, key='service_id'):
+    """Index grouped ``.values()`` rows by their service id."""
+    return {row.pop(key): row for row in rows}
+
+
+def proposal_counts_by_service():
+    rows = (
+        FormSubmission.objects
+        .order_by()
+        .values('service_id')
+        .annotate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status=FormSubmission.SUBMITTED)),
+            draft=Count('id', filter=Q(status=FormSubmission.DRAFT)),
+        )
+    )
+    return _by_service(rows)
+
+
+def evaluation_counts_by_service():
+    rows = (
+        TechnicalEvaluationRound.objects
+        .order_by()
+        .values('proposal__service_id')
+        .annotate(under_evaluation=Count('id', filter=Q(overall_decision='pending')))
+    )
+    return _by_service(rows, key='proposal__service_id')
+
+
+def presentation_counts_by_service():
+    rows = (
+        Presentation.objects
+        .order_by()
+        .values('proposal__service_id')
+        .annotate(
+            shortlisted=Count('id', filter=Q(final_decision='shortlisted')),
+            rejected=Count('id', filter=Q(final_decision='rejected')),
+        )
+    )
+    return _by_service(rows, key='proposal__service_id')
+
+
+def admin_dashboard_summary():
+    """
+    Build the AdminDashboardSummaryView payload with a fixed number of queries:
+    users, services, proposals, evaluation rounds and presentations.
+    """
+    users = User.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+
+    services = list(Service.objects.values('id', 'name', 'status'))
+    service_status = defaultdict(int)
+    for service in services:
+        service_status[service['status']] += 1
+
+    proposals = proposal_counts_by_service()
+    evaluations = evaluation_counts_by_service()
+    presentations = presentation_counts_by_service()
+
+    empty_proposals = {'total': 0, 'active': 0, 'draft': 0}
+    empty_presentations = {'shortlisted': 0, 'rejected': 0}
+
+    services_data = []
+    for service in services:
+        proposal_row = proposals.get(service['id'], empty_proposals)
+        presentation_row = presentations.get(service['id'], empty_presentations)
+        services_data.append({
+            "service_id": str(service['id']),
+            "service_name": service['name'],
+            "total_proposals": proposal_row['total'],
+            "active_proposals": proposal_row['active'],
+            "draft_proposals": proposal_row['draft'],
+            "proposals_under_evaluation": evaluations.get(service['id'], {}).get('under_evaluation', 0),
+            "shortlisted_presentations": presentation_row['shortlisted'],
+            "not_shortlisted_presentations": presentation_row['rejected'],
+        })
+
+    # Grand totals include rows whose proposal has no service (the ``None`` group).
+    return {
+        "users": {
+            "total": users['total'],
+            "active": users['active'],
+        },
+        "services": {
+            "total": len(services),
+            "active": service_status['active'],
+            "draft": service_status['draft'],
+        },
+        "proposals": {
+            "under_evaluation": sum(row['under_evaluation'] for row in evaluations.values()),
+        },
+        "presentations": {
+            "shortlisted": sum(row['shortlisted'] for row in presentations.values()),
+            "not_shortlisted": sum(row['rejected'] for row in presentations.values()),
+        },
+        "services_breakdown": services_data,
+    }
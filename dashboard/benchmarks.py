@@ -0,0 +1,183 @@
+# dashboard/benchmarks.py
+"""
+End-to-end benchmarks of the heavy read endpoints.
+
+Each endpoint is requested through the full URL/middleware/DRF stack with
+Django's test client (JWT auth, no network), after ``warmup`` untimed calls,
+``repeat`` times. Per endpoint we keep median/p95/max latency, the SQL query
+count and time (via ``audit.profiling.QueryRecorder``) and the response size.
+
+Results are plain JSON so they can be committed as a baseline and compared
+later::
+
+    python manage.py generate_synthetic_data --proposals 5000
+    python manage.py run_benchmarks --output baseline.json
+    ... change code ...
+    python manage.py run_benchmarks --baseline baseline.json
+
+``compare()`` reports an endpoint as regressed when its query count grows or
+its median latency grows by more than ``tolerance`` (relative).
+
+``include_matrix()`` measures the proposal detail endpoint once per
+``?include=`` section (plus all and none) to show what each section costs.
+"""
+import platform
+import statistics
+import time
+
+import django
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from audit.profiling import QueryRecorder, percentile
+from dynamic_form.models import FormSubmission
+
+from .synthetic import EMAIL_DOMAIN
+
+User = get_user_model()
+
+
+# name -> (who calls it, path; '{proposal_id}' is filled in)
+ENDPOINTS = {
+    'admin_dashboard': ('admin', '/api/dashboard/admin-summary/'),
+    'ia_dashboard': ('admin', '/api/dashboard/ia-dashboard/'),
+    'tech_eval_admin_list': ('admin', '/api/tech-eval/technical-evaluations/admin-list/'),
+    'proposal_detail': ('admin', '/api/proposal/proposals/{proposal_id}/'),
+    'applicant_dashboard': ('applicant', '/api/applicant-dashboard/overview/'),
+}
+
+
+def _client_for(user):
+    token = RefreshToken.for_user(user).access_token
+    # A failing endpoint is recorded with its status code instead of aborting the run
+    return Client(raise_request_exception=False, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+
+def _body_size(response):
+    if getattr(response, 'streaming', False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def benchmark_subjects(tag):
+    """The synthetic admin, the busiest synthetic applicant and a fully populated proposal."""
+    admin = User.objects.filter(email=f'{tag}.admin0@{EMAIL_DOMAIN}').first()
+    submissions = FormSubmission.objects.filter(form_id__startswith=f'SYN/{tag}/')
+    busiest = (
+        submissions.values('applicant_id').annotate(n=Count('id')).order_by('-n', 'applicant_id').first()
+    )
+    proposal = (
+        submissions.filter(status=FormSubmission.APPROVED).order_by('form_id').first()
+        or submissions.exclude(proposal_id=None).order_by('form_id').first()
+    )
+    return {
+        'admin': admin,
+        'applicant': User.objects.filter(pk=busiest['applicant_id']).first() if busiest else None,
+        'proposal_id': proposal.proposal_id if proposal else None,
+    }
+
+
+def measure(client, path, repeat=10, warmup=2):
+    for _ in range(warmup):
+        client.get(path)
+
+    latencies, queries, sql_ms = [], [], []
+    status_code = size = None
+    for _ in range(repeat):
+        recorder = QueryRecorder()
+        with recorder.wrap_connections():
+            start = time.perf_counter()
+            response = client.get(path)
+            size = _body_size(response)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(recorder.count)
+        sql_ms.append(recorder.seconds * 1000)
+        status_code = response.status_code
+
+    return {
+        'path': path,
+        'status': status_code,
+        'repeat': repeat,
+        'latency_ms': {
+            'median': round(statistics.median(latencies), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'max': round(max(latencies), 2),
+        },
+        'queries': max(queries),
+        'sql_ms_median': round(statistics.median(sql_ms), 2),
+        'response_bytes': size,
+    }
+
+
+def run(tag='synthetic', repeat=10, warmup=2, only=None):
+    subjects = benchmark_subjects(tag)
+    if subjects['admin'] is None:
+        raise ValueError(f"No synthetic data for tag '{tag}'; run generate_synthetic_data first")
+
+    results = {}
+    for name, (role, path) in ENDPOINTS.items():
+        if only and name not in only:
+            continue
+        user = subjects[role]
+        if user is None or ('{proposal_id}' in path and not subjects['proposal_id']):
+            results[name] = {'skipped': f'no synthetic {role} or proposal'}
+            continue
+        path = path.format(proposal_id=subjects['proposal_id'])
+        results[name] = measure(_client_for(user), path, repeat=repeat, warmup=warmup)
+
+    return {
+        'meta': {
+            'tag': tag,
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'proposals': FormSubmission.objects.filter(form_id__startswith=f'SYN/{tag}/').count(),
+            'repeat': repeat,
+            'warmup': warmup,
+        },
+        'endpoints': results,
+    }
+
+
+def include_matrix(tag='synthetic', repeat=5, warmup=1):
+    """``{include value: measurement}`` for the proposal detail endpoint."""
+    from proposal_aggregate.api.serializers import SECTIONS
+
+    subjects = benchmark_subjects(tag)
+    if subjects['admin'] is None or not subjects['proposal_id']:
+        raise ValueError(f"No synthetic data for tag '{tag}'; run generate_synthetic_data first")
+
+    client = _client_for(subjects['admin'])
+    path = ENDPOINTS['proposal_detail'][1].format(proposal_id=subjects['proposal_id'])
+    combinations = {'<all>': path, '<none>': f'{path}?include='}
+    combinations.update((name, f'{path}?include={name}') for name in SECTIONS)
+    return {
+        name: measure(client, url, repeat=repeat, warmup=warmup)
+        for name, url in combinations.items()
+    }
+
+
+def compare(baseline, current, tolerance=0.2):
+    """
+    ``[(endpoint, message), ...]`` for every endpoint that got worse than
+    ``baseline``: more queries, a median latency above ``1 + tolerance``
+    times the baseline, or a status code change.
+    """
+    regressions = []
+    for name, now in current['endpoints'].items():
+        before = baseline.get('endpoints', {}).get(name)
+        if not before or 'skipped' in before or 'skipped' in now:
+            continue
+        if now['status'] != before['status']:
+            regressions.append((name, f"status {before['status']} -> {now['status']}"))
+        if now['queries'] > before['queries']:
+            regressions.append((name, f"queries {before['queries']} -> {now['queries']}"))
+        old_ms, new_ms = before['latency_ms']['median'], now['latency_ms']['median']
+        if new_ms > old_ms * (1 + tolerance):
+            regressions.append((name, f"median {old_ms:.1f}ms -> {new_ms:.1f}ms"))
+    return regressions
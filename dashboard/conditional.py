@@ -0,0 +1,124 @@
+# dashboard/conditional.py
+"""
+Conditional GET (ETag / If-None-Match) for the dashboard endpoints.
+
+A dashboard response is built from a handful of tables. Before running the
+expensive aggregation, ``conditional_get`` fingerprints those tables with one
+cheap aggregate per ``Source``: row count, highest pk and latest timestamp,
+optionally scoped to the requesting user. The fingerprint, the endpoint,
+the user and the query string make up the ETag. When the client's
+``If-None-Match`` matches, the view is skipped and a bodyless 304 goes back.
+Otherwise the view runs and its 200 carries the ETag::
+
+    class EvaluatorDashboardView(APIView):
+        @conditional_get(
+            Source(Presentation, scope=lambda request: {'evaluator': request.user}),
+            Source(Service),
+        )
+        def get(self, request, *args, **kwargs):
+            ...
+
+The fingerprint is read from the database, so every worker agrees on it.
+Inserts, deletes and any ``save()`` that bumps the source's timestamp fields
+change it. ``QuerySet.update()`` does not touch ``auto_now`` fields, so
+list a source whose rows are changed that way with a field it does set.
+Responses that also depend on the clock (e.g. "is this call open") pass
+``refresh_every=<seconds>`` so the ETag rolls over at least that often.
+
+The digest of the sources is also left on the request as
+``request.sources_digest``. ``cache_response`` (response_cache.py) puts it
+in its key, so a cached body is only served under the ETag of the state it
+was built from, even for sources that aren't cache tags.
+
+``DASHBOARD_CONDITIONAL_GET = False`` turns the whole thing off.
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class Source:
+    """
+    One table a response depends on. ``timestamps`` are the fields whose
+    maximum moves when rows change; ``scope(request)`` returns filter kwargs.
+    """
+
+    def __init__(self, model, timestamps=('updated_at',), scope=None):
+        self.model = model
+        self.timestamps = (timestamps,) if isinstance(timestamps, str) else tuple(timestamps)
+        self.scope = scope
+
+    def state(self, request):
+        queryset = self.model._default_manager.all()
+        if self.scope is not None:
+            queryset = queryset.filter(**self.scope(request))
+        aggregates = {'rows': Count('pk'), 'top': Max('pk')}
+        for index, field in enumerate(self.timestamps):
+            aggregates[f'ts{index}'] = Max(field)
+        values = queryset.order_by().aggregate(**aggregates)
+        return [self.model._meta.label_lower, *(str(values[key]) for key in sorted(values))]
+
+
+def sources_digest(request, sources, refresh_every=None):
+    """Digest of the sources' state (and the clock bucket), the same for every user of unscoped sources."""
+    parts = []
+    if refresh_every:
+        parts.append(str(int(time.time() // refresh_every)))
+    for source in sources:
+        parts.extend(source.state(request))
+    return hashlib.sha1('\x1f'.join(parts).encode()).hexdigest()
+
+
+def fingerprint(view, request, digest):
+    user = request.user
+    parts = [
+        f'{type(view).__module__}.{type(view).__qualname__}',
+        str(user.pk),
+        str(getattr(user, 'updated_at', '')),  # profile/flag changes
+        request.META.get('QUERY_STRING', ''),
+        digest,
+    ]
+    return hashlib.sha1('\x1f'.join(parts).encode()).hexdigest()
+
+
+def etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match. ``*`` is not
+    # honoured: the view may still refuse the request (403 and friends).
+    strip = lambda tag: tag[2:] if tag.startswith('W/') else tag
+    return strip(etag) in {strip(tag) for tag in parse_etags(header)}
+
+
+def conditional_get(*sources, refresh_every=None):
+    """Decorator for an APIView ``get`` handler; see the module docstring."""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            if not getattr(settings, 'DASHBOARD_CONDITIONAL_GET', True):
+                return handler(view, request, *args, **kwargs)
+
+            request.sources_digest = sources_digest(request, sources, refresh_every)
+            etag = quote_etag(fingerprint(view, request, request.sources_digest))
+            if etag_matches(request, etag):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = handler(view, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+
+            response['ETag'] = etag
+            # Let clients keep the body but revalidate on every poll
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Authorization',))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,61 @@
+# dashboard/management/commands/benchmark_admin_dashboard.py
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from configuration.models import Service
+from dashboard.aggregates import admin_dashboard_summary
+from dynamic_form.models import FormSubmission, FormTemplate
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the query count of the admin dashboard summary while adding '
+        'synthetic services. All synthetic rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--steps', type=int, default=3, help='How many growth steps to measure')
+        parser.add_argument('--services-per-step', type=int, default=20)
+        parser.add_argument('--proposals-per-service', type=int, default=5)
+
+    def handle(self, *args, **options):
+        results = []
+        try:
+            with transaction.atomic():
+                template = FormTemplate.objects.create(title=f"benchmark-{uuid.uuid4().hex[:8]}")
+                results.append(self.measure())
+                for _ in range(options['steps']):
+                    self.grow(template, options['services_per_step'], options['proposals_per_service'])
+                    results.append(self.measure())
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        for services, queries, elapsed in results:
+            self.stdout.write(f"services={services:<6} queries={queries:<4} time={elapsed * 1000:.1f}ms")
+
+        query_counts = {queries for _, queries, _ in results}
+        if len(query_counts) != 1:
+            raise CommandError(f"Query count grows with services: {sorted(query_counts)}")
+        self.stdout.write(self.style.SUCCESS(f"Query count constant at {query_counts.pop()}"))
+
+    def measure(self):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            data = admin_dashboard_summary()
+            elapsed = time.perf_counter() - start
+        return data['services']['total'], len(ctx.captured_queries), elapsed
+
+    def grow(self, template, services, proposals_per_service):
+        for _ in range(services):
+            service = Service.objects.create(name=f"benchmark-{uuid.uuid4().hex}", template=template)
+            for _ in range(proposals_per_service):
+                FormSubmission.objects.create(template=template, service=service)
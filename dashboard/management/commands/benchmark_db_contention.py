@@ -0,0 +1,131 @@
+# dashboard/management/commands/benchmark_db_contention.py
+import statistics
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+
+from auth_service.db_routing import replica_alias, use_replica
+from dashboard.aggregates import admin_dashboard_summary
+from dynamic_form.models import FormSubmission, FormTemplate
+
+
+class Command(BaseCommand):
+    help = (
+        'Run concurrent section autosaves (FormSubmission.save) and admin '
+        'dashboard reads for a fixed time and report the throughput, latency and '
+        '"database is locked" errors of each side, with the connection settings '
+        'in effect (journal mode, synchronous, busy timeout, replica). The '
+        'drafts it creates are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4, help='Autosave threads')
+        parser.add_argument('--readers', type=int, default=4, help='Dashboard read threads')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+        parser.add_argument('--replica', action='store_true',
+                            help='Readers use the replica alias (see auth_service/db_routing.py)')
+
+    def handle(self, *args, **options):
+        if options['writers'] < 0 or options['readers'] < 0 or not options['writers'] + options['readers']:
+            raise CommandError('Need at least one writer or reader')
+        if options['replica'] and not replica_alias():
+            raise CommandError('--replica given but no replica alias is configured')
+
+        self.report_settings(options['replica'])
+        tag = uuid.uuid4().hex[:8]
+        user = get_user_model().objects.create(
+            email=f"contention-{tag}@example.com", mobile=tag, full_name='Benchmark', gender='O',
+        )
+        template = FormTemplate.objects.create(title=f"contention-{tag}")
+        try:
+            drafts = [
+                FormSubmission.objects.create(template=template, applicant=user).pk
+                for _ in range(options['writers'])
+            ]
+            results = self.run(drafts, user, options['readers'], options['duration'], options['replica'])
+        finally:
+            FormSubmission.objects.filter(template=template).delete()
+            template.delete()
+            user.delete()
+
+        for role, samples in results.items():
+            timings, errors = samples['timings'], samples['errors']
+            if not timings and not errors:
+                continue
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))] if timings else 0
+            self.stdout.write(
+                f"{role:<8} ops={len(timings):<6} ops/s={len(timings) / options['duration']:<8.1f} "
+                f"median={statistics.median(timings) * 1000 if timings else 0:.2f}ms "
+                f"p95={p95 * 1000:.2f}ms locked={errors}"
+            )
+
+    def report_settings(self, replica):
+        with connection.cursor() as cursor:
+            if connection.vendor != 'sqlite':
+                self.stdout.write(f"{connection.vendor}, readers on {'replica' if replica else 'default'}")
+                return
+            values = {}
+            for pragma in ('journal_mode', 'synchronous', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {pragma}')
+                values[pragma] = cursor.fetchone()[0]
+        self.stdout.write(
+            f"sqlite journal_mode={values['journal_mode']} synchronous={values['synchronous']} "
+            f"busy_timeout={values['busy_timeout']}ms, readers on {'replica' if replica else 'default'}"
+        )
+
+    def run(self, drafts, user, readers, duration, replica):
+        results = {role: {'timings': [], 'errors': 0} for role in ('autosave', 'read')}
+        lock = threading.Lock()
+        start = threading.Barrier(len(drafts) + readers)
+
+        def record(role, elapsed=None):
+            with lock:
+                if elapsed is None:
+                    results[role]['errors'] += 1
+                else:
+                    results[role]['timings'].append(elapsed)
+
+        def loop(role, operation):
+            try:
+                start.wait()
+                deadline = time.perf_counter() + duration
+                while time.perf_counter() < deadline:
+                    began = time.perf_counter()
+                    try:
+                        operation()
+                    except OperationalError:
+                        record(role)
+                    else:
+                        record(role, time.perf_counter() - began)
+            finally:
+                connections.close_all()
+
+        def autosave(pk):
+            counter = iter(range(10 ** 9))
+
+            def operation():
+                # Same lookup as FormSectionViewSet.get_submission
+                instance = FormSubmission.objects.get(id=pk, applicant=user)
+                instance.subject = f"autosave {next(counter)}"
+                instance.save()
+            return operation
+
+        def read():
+            if replica:
+                with use_replica():
+                    admin_dashboard_summary()
+            else:
+                admin_dashboard_summary()
+
+        threads = [threading.Thread(target=loop, args=('autosave', autosave(pk))) for pk in drafts]
+        threads += [threading.Thread(target=loop, args=('read', read)) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
@@ -0,0 +1,70 @@
+# dashboard/management/commands/generate_synthetic_data.py
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.synthetic import EMAIL_DOMAIN, SyntheticDataGenerator, clear
+from dynamic_form.models import FormSubmission
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic population (users, services, proposals across the '
+        'whole workflow, screening, tech-eval rounds, presentations, milestones '
+        'and finance chains) for load testing. Rows are tagged with --tag and '
+        'can be removed again with --clear. Never run against production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tag', default='synthetic', help='Prefix marking the generated rows')
+        parser.add_argument('--services', type=int, default=5)
+        parser.add_argument('--proposals', type=int, default=2000)
+        parser.add_argument('--applicants', type=int, default=200)
+        parser.add_argument('--evaluators', type=int, default=20)
+        parser.add_argument('--criteria', type=int, default=5, help='Evaluation criteria per service')
+        parser.add_argument('--evaluators-per-round', type=int, default=3)
+        parser.add_argument('--milestones', type=int, default=3, help='Milestones per approved proposal')
+        parser.add_argument('--submilestones', type=int, default=2, help='Submilestones per milestone')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--clear', action='store_true', help='Delete the rows of --tag instead')
+        parser.add_argument('--no-rebuild', action='store_true',
+                            help='Skip rebuilding tech_eval caches, tracker snapshots and dashboard stats')
+
+    def handle(self, *args, **options):
+        tag = options['tag']
+        if '/' in tag or '@' in tag:
+            raise CommandError("--tag must not contain '/' or '@'")
+
+        if options['clear']:
+            deleted = clear(tag)
+            for label, count in sorted(deleted.items()):
+                self.stdout.write(f"  {label}: {count}")
+            self.stdout.write(self.style.SUCCESS(f"Deleted synthetic data for tag '{tag}'"))
+            return
+
+        if FormSubmission.objects.filter(form_id__startswith=f'SYN/{tag}/').exists():
+            raise CommandError(f"Synthetic data for tag '{tag}' already exists; use --clear or another --tag")
+        if options['services'] < 1 or options['applicants'] < 1 or options['evaluators'] < 1:
+            raise CommandError('--services, --applicants and --evaluators must be at least 1')
+
+        self.stdout.write(f"Generating synthetic data for tag '{tag}'...")
+        generator = SyntheticDataGenerator(
+            tag=tag,
+            services=options['services'],
+            proposals=options['proposals'],
+            applicants=options['applicants'],
+            evaluators=options['evaluators'],
+            criteria=options['criteria'],
+            evaluators_per_round=options['evaluators_per_round'],
+            milestones=options['milestones'],
+            submilestones=options['submilestones'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            stdout=self.stdout,
+        )
+        counts = generator.generate(rebuild=not options['no_rebuild'])
+        for label, count in sorted(counts.items()):
+            self.stdout.write(f"  {label}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Admin login: {tag}.admin0@{EMAIL_DOMAIN} (no usable password; "
+            f"run_benchmarks authenticates with JWT)"
+        ))
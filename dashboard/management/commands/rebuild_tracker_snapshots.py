@@ -0,0 +1,34 @@
+# dashboard/management/commands/rebuild_tracker_snapshots.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard.models import ProposalTrackerSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Backfill/rebuild ProposalTrackerSnapshot rows used by the IA dashboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--proposal',
+            action='append',
+            dest='proposals',
+            help='FormSubmission pk to rebuild (repeatable). Rebuilds everything when omitted.',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['proposals']:
+            for proposal_pk in options['proposals']:
+                ProposalTrackerSnapshot.rebuild_for(proposal_pk)
+            count = len(options['proposals'])
+        else:
+            self.stdout.write('Rebuilding all tracker snapshots...')
+            count = ProposalTrackerSnapshot.rebuild_all(batch_size=options['batch_size'])
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {count} tracker snapshots in {elapsed:.2f}s')
+        )
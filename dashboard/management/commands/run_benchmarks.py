@@ -0,0 +1,77 @@
+# dashboard/management/commands/run_benchmarks.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the heavy endpoints (admin and IA dashboards, tech-eval admin list, '
+        'proposal detail, applicant dashboard) against data from '
+        'generate_synthetic_data. Records latency, query count and response size; '
+        'optionally writes them as a JSON baseline or compares with one.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tag', default='synthetic', help='Tag given to generate_synthetic_data')
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--endpoint', action='append', choices=sorted(benchmarks.ENDPOINTS),
+                            help='Only run this endpoint (repeatable)')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='Compare with a JSON file written by --output')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Allowed relative growth of median latency against the baseline')
+        parser.add_argument('--proposal-includes', action='store_true',
+                            help='Also measure proposal detail once per ?include= section')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+        try:
+            results = benchmarks.run(
+                tag=options['tag'], repeat=options['repeat'], warmup=options['warmup'],
+                only=options['endpoint'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(f"{results['meta']['proposals']} synthetic proposals, {options['repeat']} runs each")
+        for name, result in results['endpoints'].items():
+            if 'skipped' in result:
+                self.stdout.write(f"{name:<22} skipped: {result['skipped']}")
+                continue
+            latency = result['latency_ms']
+            self.stdout.write(
+                f"{name:<22} status={result['status']} queries={result['queries']:<5} "
+                f"median={latency['median']:.1f}ms p95={latency['p95']:.1f}ms "
+                f"sql={result['sql_ms_median']:.1f}ms bytes={result['response_bytes']}"
+            )
+
+        if options['proposal_includes']:
+            results['proposal_includes'] = benchmarks.include_matrix(
+                tag=options['tag'], repeat=options['repeat'], warmup=options['warmup'],
+            )
+            self.stdout.write('proposal detail by ?include=')
+            for name, result in results['proposal_includes'].items():
+                self.stdout.write(
+                    f"  {name:<22} status={result['status']} queries={result['queries']:<4} "
+                    f"median={result['latency_ms']['median']:.1f}ms bytes={result['response_bytes']}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as fh:
+                baseline = json.load(fh)
+            regressions = benchmarks.compare(baseline, results, tolerance=options['tolerance'])
+            if regressions:
+                for name, message in regressions:
+                    self.stderr.write(f"REGRESSION {name}: {message}")
+                raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}"))
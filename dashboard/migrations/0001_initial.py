@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('dynamic_form', '0025_alter_teammember_unique_together'),
+        ('milestones', '0008_alter_milestone_funds_requested_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProposalTrackerSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('milestone_title', models.CharField(blank=True, max_length=200, null=True)),
+                ('milestone_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('milestone_due_date', models.DateField(blank=True, null=True)),
+                ('milestone_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('submilestone_title', models.CharField(blank=True, max_length=200, null=True)),
+                ('submilestone_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('submilestone_due_date', models.DateField(blank=True, null=True)),
+                ('submilestone_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('claim_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('claim_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('claim_created_at', models.DateTimeField(blank=True, null=True)),
+                ('finance_request_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('finance_request_created_at', models.DateTimeField(blank=True, null=True)),
+                ('milestone_status_counts', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('latest_finance_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='milestones.financerequest')),
+                ('latest_milestone', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='milestones.milestone')),
+                ('latest_payment_claim', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='milestones.paymentclaim')),
+                ('latest_submilestone', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='milestones.submilestone')),
+                ('proposal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='tracker_snapshot', to='dynamic_form.formsubmission')),
+            ],
+        ),
+    ]
@@ -0,0 +1,87 @@
+from collections import Counter
+
+from django.db import migrations
+
+
+def _first_per_milestone(queryset, milestone_ids, *fields):
+    latest = {}
+    for row in queryset.values('milestone_id', *fields).iterator(chunk_size=2000):
+        if row['milestone_id'] in milestone_ids:
+            latest.setdefault(row['milestone_id'], row)
+    return latest
+
+
+def backfill_tracker_snapshots(apps, schema_editor):
+    # The rebuild_tracker_snapshots pass as of this migration, on historical
+    # models only: latest rows picked in Python from ordered values() scans.
+    Snapshot = apps.get_model('dashboard', 'ProposalTrackerSnapshot')
+    FormSubmission = apps.get_model('dynamic_form', 'FormSubmission')
+    Milestone = apps.get_model('milestones', 'Milestone')
+    SubMilestone = apps.get_model('milestones', 'SubMilestone')
+    PaymentClaim = apps.get_model('milestones', 'PaymentClaim')
+    FinanceRequest = apps.get_model('milestones', 'FinanceRequest')
+
+    latest_milestones = {}
+    histograms = {}
+    for row in (Milestone.objects.order_by('proposal_id', '-updated_at')
+                .values('id', 'proposal_id', 'title', 'status', 'due_date', 'updated_at')
+                .iterator(chunk_size=2000)):
+        latest_milestones.setdefault(row['proposal_id'], row)
+        histograms.setdefault(row['proposal_id'], Counter())[row['status']] += 1
+
+    milestone_ids = {row['id'] for row in latest_milestones.values()}
+    latest_subs = _first_per_milestone(
+        SubMilestone.objects.order_by('milestone_id', '-updated_at'),
+        milestone_ids, 'id', 'title', 'status', 'due_date', 'updated_at',
+    )
+    latest_claims = _first_per_milestone(
+        PaymentClaim.objects.order_by('milestone_id', '-created_at'),
+        milestone_ids, 'id', 'net_claim_amount', 'status', 'created_at',
+    )
+    latest_requests = _first_per_milestone(
+        FinanceRequest.objects.order_by('milestone_id', '-created_at'),
+        milestone_ids, 'id', 'status', 'created_at',
+    )
+
+    snapshots = []
+    for proposal_pk in FormSubmission.objects.values_list('pk', flat=True).iterator(chunk_size=2000):
+        ms = latest_milestones.get(proposal_pk)
+        sub = latest_subs.get(ms['id']) if ms else None
+        claim = latest_claims.get(ms['id']) if ms else None
+        fin = latest_requests.get(ms['id']) if ms else None
+        snapshots.append(Snapshot(
+            proposal_id=proposal_pk,
+            latest_milestone_id=ms['id'] if ms else None,
+            milestone_title=ms['title'] if ms else None,
+            milestone_status=ms['status'] if ms else None,
+            milestone_due_date=ms['due_date'] if ms else None,
+            milestone_updated_at=ms['updated_at'] if ms else None,
+            latest_submilestone_id=sub['id'] if sub else None,
+            submilestone_title=sub['title'] if sub else None,
+            submilestone_status=sub['status'] if sub else None,
+            submilestone_due_date=sub['due_date'] if sub else None,
+            submilestone_updated_at=sub['updated_at'] if sub else None,
+            latest_payment_claim_id=claim['id'] if claim else None,
+            claim_amount=claim['net_claim_amount'] if claim else None,
+            claim_status=claim['status'] if claim else None,
+            claim_created_at=claim['created_at'] if claim else None,
+            latest_finance_request_id=fin['id'] if fin else None,
+            finance_request_status=fin['status'] if fin else None,
+            finance_request_created_at=fin['created_at'] if fin else None,
+            milestone_status_counts=dict(histograms.get(proposal_pk, {})),
+        ))
+
+    Snapshot.objects.all().delete()
+    Snapshot.objects.bulk_create(snapshots, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        ('milestones', '0009_cas_document_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_tracker_snapshots, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,212 @@
-from django.db import models
+from collections import Counter
 
-# Create your models here.
+from django.db import models, transaction
+
+from dynamic_form.models import FormSubmission
+from milestones.models import Milestone, SubMilestone, PaymentClaim, FinanceRequest
+
+
+class ProposalTrackerSnapshot(models.Model):
+    """
+    Denormalized per-proposal row read by the IA dashboard.
+
+    Holds the latest milestone (by updated_at), the latest submilestone, payment
+    claim and finance request of that milestone, and the milestone status
+    histogram. Kept up to date by dashboard/signals.py; filled for existing
+    proposals by migration 0002 and rebuilt with ``manage.py rebuild_tracker_snapshots``.
+    """
+    proposal = models.OneToOneField(
+        FormSubmission,
+        on_delete=models.CASCADE,
+        related_name='tracker_snapshot'
+    )
+
+    latest_milestone = models.ForeignKey(
+        Milestone, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    milestone_title = models.CharField(max_length=200, blank=True, null=True)
+    milestone_status = models.CharField(max_length=20, blank=True, null=True)
+    milestone_due_date = models.DateField(null=True, blank=True)
+    milestone_updated_at = models.DateTimeField(null=True, blank=True)
+
+    latest_submilestone = models.ForeignKey(
+        SubMilestone, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    submilestone_title = models.CharField(max_length=200, blank=True, null=True)
+    submilestone_status = models.CharField(max_length=20, blank=True, null=True)
+    submilestone_due_date = models.DateField(null=True, blank=True)
+    submilestone_updated_at = models.DateTimeField(null=True, blank=True)
+
+    latest_payment_claim = models.ForeignKey(
+        PaymentClaim, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    claim_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    claim_status = models.CharField(max_length=20, blank=True, null=True)
+    claim_created_at = models.DateTimeField(null=True, blank=True)
+
+    latest_finance_request = models.ForeignKey(
+        FinanceRequest, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    finance_request_status = models.CharField(max_length=20, blank=True, null=True)
+    finance_request_created_at = models.DateTimeField(null=True, blank=True)
+
+    milestone_status_counts = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Tracker snapshot for {self.proposal_id}"
+
+    # ------------------------------------------------------------------
+    # Field setters (no queries)
+    # ------------------------------------------------------------------
+    def set_milestone(self, milestone):
+        self.latest_milestone = milestone
+        self.milestone_title = milestone.title if milestone else None
+        self.milestone_status = milestone.status if milestone else None
+        self.milestone_due_date = milestone.due_date if milestone else None
+        self.milestone_updated_at = milestone.updated_at if milestone else None
+
+    def set_submilestone(self, submilestone):
+        self.latest_submilestone = submilestone
+        self.submilestone_title = submilestone.title if submilestone else None
+        self.submilestone_status = submilestone.status if submilestone else None
+        self.submilestone_due_date = submilestone.due_date if submilestone else None
+        self.submilestone_updated_at = submilestone.updated_at if submilestone else None
+
+    def set_payment_claim(self, claim):
+        self.latest_payment_claim = claim
+        self.claim_amount = claim.net_claim_amount if claim else None
+        self.claim_status = claim.status if claim else None
+        self.claim_created_at = claim.created_at if claim else None
+
+    def set_finance_request(self, finance_request):
+        self.latest_finance_request = finance_request
+        self.finance_request_status = finance_request.status if finance_request else None
+        self.finance_request_created_at = finance_request.created_at if finance_request else None
+
+    # ------------------------------------------------------------------
+    # Recomputation
+    # ------------------------------------------------------------------
+    def refresh_submilestone(self):
+        self.set_submilestone(
+            SubMilestone.objects.filter(milestone_id=self.latest_milestone_id).order_by('-updated_at').first()
+            if self.latest_milestone_id else None
+        )
+
+    def refresh_payment_claim(self):
+        self.set_payment_claim(
+            PaymentClaim.objects.filter(milestone_id=self.latest_milestone_id).order_by('-created_at').first()
+            if self.latest_milestone_id else None
+        )
+
+    def refresh_finance_request(self):
+        self.set_finance_request(
+            FinanceRequest.objects.filter(milestone_id=self.latest_milestone_id).order_by('-created_at').first()
+            if self.latest_milestone_id else None
+        )
+
+    def refresh_children(self):
+        """Reload submilestone/claim/finance request of the current latest milestone."""
+        self.refresh_submilestone()
+        self.refresh_payment_claim()
+        self.refresh_finance_request()
+
+    def refresh_status_counts(self):
+        rows = (
+            Milestone.objects.filter(proposal_id=self.proposal_id)
+            .order_by()
+            .values('status')
+            .annotate(cnt=models.Count('id'))
+        )
+        self.milestone_status_counts = {row['status']: row['cnt'] for row in rows}
+
+    def refresh(self):
+        """Full recomputation for this one proposal."""
+        self.set_milestone(
+            Milestone.objects.filter(proposal_id=self.proposal_id).order_by('-updated_at').first()
+        )
+        self.refresh_children()
+        self.refresh_status_counts()
+
+    @classmethod
+    def for_proposal(cls, proposal_pk):
+        snapshot, _ = cls.objects.select_for_update().get_or_create(proposal_id=proposal_pk)
+        return snapshot
+
+    @classmethod
+    def rebuild_for(cls, proposal_pk):
+        with transaction.atomic():
+            snapshot = cls.for_proposal(proposal_pk)
+            snapshot.refresh()
+            snapshot.save()
+        return snapshot
+
+    @classmethod
+    def rebuild_all(cls, batch_size=500):
+        """
+        Recompute every snapshot with a fixed number of queries: latest rows are
+        picked in Python from ordered ``values()`` scans instead of per-proposal lookups.
+        """
+        latest_milestones = {}
+        histograms = {}
+        for row in (Milestone.objects.order_by('proposal_id', '-updated_at')
+                    .values('id', 'proposal_id', 'title', 'status', 'due_date', 'updated_at')
+                    .iterator(chunk_size=2000)):
+            latest_milestones.setdefault(row['proposal_id'], row)
+            histograms.setdefault(row['proposal_id'], Counter())[row['status']] += 1
+
+        milestone_ids = [row['id'] for row in latest_milestones.values()]
+        latest_subs = cls._first_per_milestone(
+            SubMilestone.objects.order_by('milestone_id', '-updated_at'),
+            milestone_ids, 'id', 'title', 'status', 'due_date', 'updated_at',
+        )
+        latest_claims = cls._first_per_milestone(
+            PaymentClaim.objects.order_by('milestone_id', '-created_at'),
+            milestone_ids, 'id', 'net_claim_amount', 'status', 'created_at',
+        )
+        latest_requests = cls._first_per_milestone(
+            FinanceRequest.objects.order_by('milestone_id', '-created_at'),
+            milestone_ids, 'id', 'status', 'created_at',
+        )
+
+        snapshots = []
+        for proposal_pk in FormSubmission.objects.values_list('pk', flat=True).iterator(chunk_size=2000):
+            ms = latest_milestones.get(proposal_pk)
+            sub = latest_subs.get(ms['id']) if ms else None
+            claim = latest_claims.get(ms['id']) if ms else None
+            fin = latest_requests.get(ms['id']) if ms else None
+            snapshots.append(cls(
+                proposal_id=proposal_pk,
+                latest_milestone_id=ms['id'] if ms else None,
+                milestone_title=ms['title'] if ms else None,
+                milestone_status=ms['status'] if ms else None,
+                milestone_due_date=ms['due_date'] if ms else None,
+                milestone_updated_at=ms['updated_at'] if ms else None,
+                latest_submilestone_id=sub['id'] if sub else None,
+                submilestone_title=sub['title'] if sub else None,
+                submilestone_status=sub['status'] if sub else None,
+                submilestone_due_date=sub['due_date'] if sub else None,
+                submilestone_updated_at=sub['updated_at'] if sub else None,
+                latest_payment_claim_id=claim['id'] if claim else None,
+                claim_amount=claim['net_claim_amount'] if claim else None,
+                claim_status=claim['status'] if claim else None,
+                claim_created_at=claim['created_at'] if claim else None,
+                latest_finance_request_id=fin['id'] if fin else None,
+                finance_request_status=fin['status'] if fin else None,
+                finance_request_created_at=fin['created_at'] if fin else None,
+                milestone_status_counts=dict(histograms.get(proposal_pk, {})),
+            ))
+
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(snapshots, batch_size=batch_size)
+        return len(snapshots)
+
+    @staticmethod
+    def _first_per_milestone(queryset, milestone_ids, *fields):
+        latest = {}
+        milestone_ids = set(milestone_ids)
+        for row in queryset.values('milestone_id', *fields).iterator(chunk_size=2000):
+            if row['milestone_id'] in milestone_ids:
+                latest.setdefault(row['milestone_id'], row)
+        return latest
@@ -0,0 +1,213 @@
+# dashboard/response_cache.py
+"""
+Shared response cache for the aggregate endpoints, invalidated by tags.
+
+``cache_response`` stores the ``Response.data`` of a ``get`` handler in the
+``RESPONSE_CACHE_ALIAS`` cache (Redis when ``REDIS_CACHE_URL`` is set, so all
+workers share it, local memory otherwise)::
+
+    class IASummaryAPIView(APIView):
+        @cache_response('formsubmission', 'presentation', per_user=False)
+        def get(self, request, *args, **kwargs):
+            ...
+
+The key covers the view, the requesting user (unless ``per_user=False``),
+the user's roles and the query parameters. It also covers the current token
+of every tag. A tag's token is replaced whenever a row of the matching model
+(see TAG_MODELS) is saved or deleted, after the transaction commits. Entries
+built from older tokens are never read again and simply expire. Under
+``conditional_get`` the key also covers the ETag's ``request.sources_digest``,
+so the body always matches the ETag it goes out with.
+
+Only saves and deletes are seen, plus ``milestones_synced`` from the bulk
+milestone sync (milestones/sync.py). ``QuerySet.update()``, other
+``bulk_create`` calls and tables without a tag are only picked up when the entry times out
+(``RESPONSE_CACHE_TIMEOUT``). Cache errors, such as Redis being down, are
+counted and the view runs uncached.
+
+Hits, misses and errors are counted per view in this process; the admin-only
+``/api/dashboard/response-cache/`` endpoint serves them.
+"""
+import functools
+import hashlib
+import logging
+import threading
+import uuid
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# tag -> model label whose writes invalidate it
+TAG_MODELS = {
+    'formsubmission': 'dynamic_form.FormSubmission',
+    'technicalevaluationround': 'tech_eval.TechnicalEvaluationRound',
+    'presentation': 'presentation.Presentation',
+    'milestone': 'milestones.Milestone',
+    'screeningrecord': 'screening.ScreeningRecord',
+}
+
+_lock = threading.Lock()
+_counters = defaultdict(Counter)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _cache():
+    return caches[_setting('RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _count(view_name, event):
+    with _lock:
+        _counters[view_name][event] += 1
+
+
+def _tag_key(tag):
+    return f'response-cache:tag:{tag}'
+
+
+def tag_tokens(tags):
+    """Current token of each tag, creating the missing ones."""
+    cache = _cache()
+    keys = {tag: _tag_key(tag) for tag in tags}
+    found = cache.get_many(keys.values())
+    tokens = {}
+    for tag, key in keys.items():
+        if key not in found:
+            # add() so concurrent first readers agree on one token
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            found[key] = cache.get(key)
+        tokens[tag] = found[key]
+    return tokens
+
+
+def invalidate(*tags):
+    """Drop every cached response built from ``tags``."""
+    cache = _cache()
+    try:
+        cache.set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, timeout=None)
+    except Exception:
+        logger.exception('Response cache: could not invalidate %s', ', '.join(tags))
+        return
+    for tag in tags:
+        _count(f'tag:{tag}', 'invalidations')
+
+
+def _roles(user):
+    if not user.is_authenticated:
+        return []
+    return sorted(user.roles.values_list('name', flat=True))
+
+
+def response_key(view, request, tags, per_user):
+    user = request.user
+    params = sorted((name, value) for name in request.query_params for value in request.query_params.getlist(name))
+    parts = [
+        str(user.pk) if per_user else '*',
+        str(user.is_staff), str(user.is_superuser), *_roles(user),
+        repr(params),
+        getattr(request, 'sources_digest', ''),
+        *(f'{tag}={token}' for tag, token in sorted(tag_tokens(tags).items())),
+    ]
+    digest = hashlib.sha1('\x1f'.join(parts).encode()).hexdigest()
+    return f'response-cache:{_view_name(view)}:{digest}'
+
+
+def _view_name(view):
+    return f'{type(view).__module__}.{type(view).__qualname__}'
+
+
+def cache_response(*tags, per_user=True, timeout=None):
+    """
+    Decorator for an APIView ``get`` handler. ``tags`` (keys of TAG_MODELS)
+    name the tables the response is built from; ``per_user=False`` shares
+    one entry between users with the same roles. Only plain 200 responses
+    are stored, not streamed ones.
+    """
+    unknown = set(tags) - set(TAG_MODELS)
+    if unknown:
+        raise ValueError(f"Unknown response cache tag(s): {', '.join(sorted(unknown))}")
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            if not _setting('RESPONSE_CACHE_ENABLED', True):
+                return handler(view, request, *args, **kwargs)
+
+            name = _view_name(view)
+            cache = _cache()
+            try:
+                key = response_key(view, request, tags, per_user)
+                data = cache.get(key)
+            except Exception:
+                logger.exception('Response cache unavailable for %s', name)
+                _count(name, 'errors')
+                return handler(view, request, *args, **kwargs)
+
+            if data is not None:
+                _count(name, 'hits')
+                response = Response(data)
+                response['X-Response-Cache'] = 'hit'
+                return response
+
+            _count(name, 'misses')
+            response = handler(view, request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+                try:
+                    cache.set(key, response.data, timeout or _setting('RESPONSE_CACHE_TIMEOUT', 300))
+                except Exception:
+                    logger.exception('Response cache: could not store %s', name)
+                    _count(name, 'errors')
+                response['X-Response-Cache'] = 'miss'
+            return response
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """``{view: {hits, misses, errors, hit_ratio}}`` for this process."""
+    with _lock:
+        counters = {name: dict(counter) for name, counter in _counters.items()}
+    for counter in counters.values():
+        lookups = counter.get('hits', 0) + counter.get('misses', 0)
+        if lookups:
+            counter['hit_ratio'] = round(counter.get('hits', 0) / lookups, 3)
+    return counters
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+
+
+# ----------------------------------------------------------------------
+# Invalidation
+# ----------------------------------------------------------------------
+def _invalidate_on_commit(tag):
+    def handler(sender, **kwargs):
+        transaction.on_commit(lambda: invalidate(tag))
+    return handler
+
+
+def connect_signals():
+    """Called from DashboardConfig.ready()."""
+    from django.apps import apps
+
+    for tag, label in TAG_MODELS.items():
+        model = apps.get_model(label)
+        handler = _invalidate_on_commit(tag)
+        post_save.connect(handler, sender=model, weak=False, dispatch_uid=f'response-cache-save-{tag}')
+        post_delete.connect(handler, sender=model, weak=False, dispatch_uid=f'response-cache-delete-{tag}')
+
+    from milestones.sync import milestones_synced
+    milestones_synced.connect(
+        _invalidate_on_commit('milestone'), weak=False, dispatch_uid='response-cache-sync-milestone'
+    )
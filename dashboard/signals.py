@@ -0,0 +1,136 @@
+# dashboard/signals.py
+"""
+Keep ProposalTrackerSnapshot rows current as milestones, submilestones,
+payment claims and finance requests are written.
+
+Each handler touches only the affected proposal's snapshot and only reloads
+what the write could have changed.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from dynamic_form.models import FormSubmission
+from milestones.models import Milestone, SubMilestone, PaymentClaim, FinanceRequest
+from milestones.sync import milestones_synced
+from .models import ProposalTrackerSnapshot
+
+
+def _touches_updated_at(update_fields):
+    return update_fields is None or 'updated_at' in update_fields
+
+
+def _cascading_from(origin, *models):
+    """True when a delete is part of a cascade started from one of ``models``."""
+    return isinstance(origin, models) or getattr(origin, 'model', None) in models
+
+
+def _snapshot_for_milestone(milestone_id):
+    if milestone_id is None:
+        return None
+    return (
+        ProposalTrackerSnapshot.objects.select_for_update()
+        .filter(latest_milestone_id=milestone_id)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Milestone)
+def track_milestone_save(sender, instance, update_fields=None, **kwargs):
+    with transaction.atomic():
+        snapshot = ProposalTrackerSnapshot.for_proposal(instance.proposal_id)
+        if snapshot.latest_milestone_id != instance.pk:
+            # A saved milestone has the newest updated_at, so it becomes the latest one.
+            if not _touches_updated_at(update_fields):
+                snapshot.refresh_status_counts()
+                snapshot.save()
+                return
+            snapshot.set_milestone(instance)
+            snapshot.refresh_children()
+        else:
+            snapshot.set_milestone(instance)
+        snapshot.refresh_status_counts()
+        snapshot.save()
+
+
+@receiver(post_delete, sender=Milestone)
+def track_milestone_delete(sender, instance, origin=None, **kwargs):
+    if _cascading_from(origin, FormSubmission):
+        return
+    with transaction.atomic():
+        snapshot = (
+            ProposalTrackerSnapshot.objects.select_for_update()
+            .filter(proposal_id=instance.proposal_id)
+            .first()
+        )
+        if snapshot is None:
+            return
+        # The FK was already nulled by SET_NULL, so recompute the proposal fully.
+        snapshot.refresh()
+        snapshot.save()
+
+
+@receiver(milestones_synced)
+def track_milestone_sync(sender, proposal, result, **kwargs):
+    # bulk_create/bulk_update skip post_save and the sync's deletes are
+    # skipped by track_milestone_delete (origin is the proposal); recompute once
+    with transaction.atomic():
+        snapshot = ProposalTrackerSnapshot.for_proposal(proposal.pk)
+        snapshot.refresh()
+        snapshot.save()
+
+
+@receiver(post_save, sender=SubMilestone)
+def track_submilestone_save(sender, instance, update_fields=None, **kwargs):
+    with transaction.atomic():
+        snapshot = _snapshot_for_milestone(instance.milestone_id)
+        if snapshot is None:
+            return
+        if _touches_updated_at(update_fields) or snapshot.latest_submilestone_id == instance.pk:
+            snapshot.set_submilestone(instance)
+            snapshot.save()
+
+
+@receiver(post_save, sender=PaymentClaim)
+def track_payment_claim_save(sender, instance, created, **kwargs):
+    with transaction.atomic():
+        snapshot = _snapshot_for_milestone(instance.milestone_id)
+        if snapshot is None:
+            return
+        # A new claim has the newest created_at; existing claims only matter if they are the latest.
+        if created or snapshot.latest_payment_claim_id == instance.pk:
+            snapshot.set_payment_claim(instance)
+            snapshot.save()
+
+
+@receiver(post_save, sender=FinanceRequest)
+def track_finance_request_save(sender, instance, created, **kwargs):
+    with transaction.atomic():
+        snapshot = _snapshot_for_milestone(instance.milestone_id)
+        if snapshot is None:
+            return
+        if created or snapshot.latest_finance_request_id == instance.pk:
+            snapshot.set_finance_request(instance)
+            snapshot.save()
+
+
+def _child_delete_handler(refresh_method):
+    def handler(sender, instance, origin=None, **kwargs):
+        if _cascading_from(origin, FormSubmission, Milestone):
+            return
+        with transaction.atomic():
+            snapshot = _snapshot_for_milestone(instance.milestone_id)
+            if snapshot is None:
+                return
+            getattr(snapshot, refresh_method)()
+            snapshot.save()
+    return handler
+
+
+track_submilestone_delete = _child_delete_handler('refresh_submilestone')
+track_payment_claim_delete = _child_delete_handler('refresh_payment_claim')
+track_finance_request_delete = _child_delete_handler('refresh_finance_request')
+
+post_delete.connect(track_submilestone_delete, sender=SubMilestone)
+post_delete.connect(track_payment_claim_delete, sender=PaymentClaim)
+post_delete.connect(track_finance_request_delete, sender=FinanceRequest)
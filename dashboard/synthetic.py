@@ -0,0 +1,371 @@
+# dashboard/synthetic.py
+"""
+Synthetic data population for load testing and benchmarks.
+
+Everything is written with ``bulk_create`` (no per-row signals), tagged so it
+can be removed again with ``clear()``, and then the derived tables are
+rebuilt with the same commands used in production (tech_eval caches,
+IA tracker snapshots, applicant DashboardStats).
+
+Tagging:
+* users: ``<tag>.<role><n>@synthetic.invalid``
+* services / templates: name/title starts with ``<tag>:``
+* submissions: ``form_id`` starts with ``SYN/<tag>/``
+
+Proposals are spread over the workflow: drafts, submitted (admin screening
+pending), evaluated (shortlisted, technical screening pending), technical
+(tech-eval round with assignments and criteria marks), approved (plus
+presentations, milestones, submilestones and a finance request -> payment
+claim -> sanction chain) and rejected.
+"""
+import random
+import zlib
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from app_eval.models import EvaluationItem, PassingRequirement
+from configuration.models import CommitteeMember, ScreeningCommittee, Service
+from dynamic_form.models import FormSubmission, FormTemplate
+from milestones.models import FinanceRequest, FinanceSanction, Milestone, PaymentClaim, SubMilestone
+from presentation.models import Presentation
+from screening.models import ScreeningRecord, TechnicalScreeningRecord
+from tech_eval.models import CriteriaEvaluation, EvaluatorAssignment, TechnicalEvaluationRound
+
+User = get_user_model()
+
+EMAIL_DOMAIN = 'synthetic.invalid'
+
+# Share of proposals ending in each workflow status
+STATUS_MIX = (
+    (FormSubmission.DRAFT, 0.20),
+    (FormSubmission.SUBMITTED, 0.25),
+    (FormSubmission.EVALUATED, 0.15),
+    (FormSubmission.TECHNICAL, 0.15),
+    (FormSubmission.APPROVED, 0.15),
+    (FormSubmission.REJECTED, 0.10),
+)
+
+ORG_TYPES = ('Startup', 'MSME', 'Academic', 'R&D Institution', 'Large Enterprise')
+
+
+def user_email(tag, role, n):
+    return f'{tag}.{role}{n}@{EMAIL_DOMAIN}'
+
+
+class SyntheticDataGenerator:
+    def __init__(self, tag='synthetic', services=5, proposals=2000, applicants=200,
+                 evaluators=20, criteria=5, evaluators_per_round=3, milestones=3,
+                 submilestones=2, batch_size=1000, seed=0, stdout=None):
+        self.tag = tag
+        self.services = services
+        self.proposals = proposals
+        self.applicants = applicants
+        self.evaluators = evaluators
+        self.criteria = criteria
+        self.evaluators_per_round = min(evaluators_per_round, evaluators)
+        self.milestones = milestones
+        self.submilestones = submilestones
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.stdout = stdout
+        self.counts = {}
+        self.now = timezone.now()
+        # Keeps mobiles (unique, max 15 chars) apart between tags
+        self.mobile_prefix = f'7{zlib.crc32(tag.encode()) % 10000:04d}'
+
+    def log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+
+    def _bulk(self, model, objs):
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+        self.counts[model._meta.label] = self.counts.get(model._meta.label, 0) + len(objs)
+        return objs
+
+    # ------------------------------------------------------------------
+    def generate(self, rebuild=True):
+        with transaction.atomic():
+            self.make_users()
+            self.make_services()
+            self.make_submissions()
+            self.make_screening()
+            self.make_tech_eval()
+            self.make_presentations()
+            self.make_milestones_and_finance()
+        if rebuild:
+            self.rebuild_derived()
+        return self.counts
+
+    def make_users(self):
+        password = make_password(None)
+        seq = iter(range(10 ** 9))
+
+        def user(role, n, **extra):
+            return User(
+                email=user_email(self.tag, role, n), mobile=f'{self.mobile_prefix}{next(seq):07d}',
+                full_name=f'{role.title()} {n}', gender=self.random.choice('MFO'),
+                password=password, **extra,
+            )
+
+        self.admin = self._bulk(User, [user('admin', 0, is_staff=True, is_superuser=True, is_applicant=False)])[0]
+        self.applicant_users = self._bulk(User, [
+            user('applicant', n, organization=f'Org {n}') for n in range(self.applicants)
+        ])
+        self.evaluator_users = self._bulk(User, [
+            user('evaluator', n, is_applicant=False) for n in range(self.evaluators)
+        ])
+        self.log(f'  users: {1 + self.applicants + self.evaluators}')
+
+    def make_services(self):
+        requirement = PassingRequirement.objects.create(
+            requirement_name=f'{self.tag}: default', evaluation_min_passing=60,
+            presentation_min_passing=60, presentation_max_marks=50, final_status_min_passing=60,
+        )
+        self.counts[PassingRequirement._meta.label] = 1
+        self.criteria_items = self._bulk(EvaluationItem, [
+            EvaluationItem(name=f'{self.tag}: criterion {n}', total_marks=Decimal(10),
+                           weightage=Decimal(20), memberType='technical', type='criteria')
+            for n in range(self.criteria)
+        ])
+        self.templates = self._bulk(FormTemplate, [
+            FormTemplate(title=f'{self.tag}: template {n}', is_active=True) for n in range(self.services)
+        ])
+        self.service_objs = self._bulk(Service, [
+            Service(name=f'{self.tag}: call {n}', template=template, passing_requirement=requirement,
+                    status='active', start_date=self.now - timedelta(days=90),
+                    end_date=self.now + timedelta(days=90), created_by=self.admin)
+            for n, template in enumerate(self.templates)
+        ])
+        for service in self.service_objs:
+            service.evaluation_items.set(self.criteria_items)
+
+        committees, members = [], []
+        for service in self.service_objs:
+            for committee_type in ('administrative', 'technical'):
+                committees.append(ScreeningCommittee(
+                    service=service, name=f'{service.name} {committee_type}',
+                    committee_type=committee_type, head=self.random.choice(self.evaluator_users),
+                    created_by=self.admin, is_created=True,
+                ))
+        self._bulk(ScreeningCommittee, committees)
+        for committee in committees:
+            for evaluator in self.random.sample(self.evaluator_users, min(4, len(self.evaluator_users))):
+                members.append(CommitteeMember(committee=committee, user=evaluator, assigned_by=self.admin))
+        self._bulk(CommitteeMember, members)
+
+    def _pick_status(self):
+        roll, total = self.random.random(), 0.0
+        for status, share in STATUS_MIX:
+            total += share
+            if roll < total:
+                return status
+        return STATUS_MIX[-1][0]
+
+    def make_submissions(self):
+        year = self.now.year
+        submissions = []
+        for n in range(self.proposals):
+            index = n % len(self.service_objs)
+            service, template = self.service_objs[index], self.templates[index]
+            status = self._pick_status()
+            funds = self.random.randrange(10, 500) * 100000
+            submissions.append(FormSubmission(
+                template=template, service=service,
+                applicant=self.random.choice(self.applicant_users),
+                status=status,
+                form_id=f'SYN/{self.tag}/{n:07d}',
+                proposal_id=None if status == FormSubmission.DRAFT else f'SYN/{self.tag}/{year}/{n:07d}',
+                subject=f'Synthetic proposal {n}', description='Generated for benchmarking',
+                org_type=self.random.choice(ORG_TYPES),
+                contact_name=f'Contact {n}', contact_email=f'contact{n}@{EMAIL_DOMAIN}',
+                funds_requested=funds, grant_from_ttdf=Decimal(funds * 8 // 10),
+                contribution_applicant=Decimal(funds * 2 // 10),
+                completed_sections=list(range(self.random.randrange(1, 10))),
+                committee_assigned=status != FormSubmission.DRAFT,
+            ))
+        self.submissions = self._bulk(FormSubmission, submissions)
+        self.by_status = {}
+        for submission in self.submissions:
+            self.by_status.setdefault(submission.status, []).append(submission)
+        self.log(f'  submissions: {len(self.submissions)}')
+
+    def _at_least(self, *statuses):
+        return [s for status in statuses for s in self.by_status.get(status, [])]
+
+    def make_screening(self):
+        screened = self._at_least(
+            FormSubmission.SUBMITTED, FormSubmission.EVALUATED, FormSubmission.TECHNICAL,
+            FormSubmission.APPROVED, FormSubmission.REJECTED,
+        )
+        records = []
+        for submission in screened:
+            decided = submission.status != FormSubmission.SUBMITTED
+            rejected_early = submission.status == FormSubmission.REJECTED and self.random.random() < 0.5
+            records.append(ScreeningRecord(
+                proposal=submission, cycle=1, subject=submission.subject or '',
+                description=submission.description or '', contact_name=submission.contact_name,
+                contact_email=submission.contact_email, admin_evaluator=self.admin if decided else None,
+                admin_decision=('not shortlisted' if rejected_early else 'shortlisted') if decided else 'pending',
+                admin_evaluated=decided, technical_evaluated=decided and not rejected_early,
+                admin_remarks='Synthetic screening' if decided else None,
+            ))
+        self._bulk(ScreeningRecord, records)
+
+        technical = []
+        for record in records:
+            if record.admin_decision != 'shortlisted':
+                continue
+            done = record.proposal.status != FormSubmission.EVALUATED
+            technical.append(TechnicalScreeningRecord(
+                screening_record=record, technical_evaluator=self.random.choice(self.evaluator_users),
+                technical_decision='shortlisted' if done else 'pending',
+                technical_marks=Decimal(self.random.randrange(50, 100)) if done else None,
+                technical_evaluated=done,
+            ))
+        self._bulk(TechnicalScreeningRecord, technical)
+
+    def make_tech_eval(self):
+        evaluated = self._at_least(FormSubmission.TECHNICAL, FormSubmission.APPROVED, FormSubmission.REJECTED)
+        rounds = self._bulk(TechnicalEvaluationRound, [
+            TechnicalEvaluationRound(
+                proposal=submission, assigned_by=self.admin,
+                assignment_status='assigned' if submission.status == FormSubmission.TECHNICAL else 'completed',
+                overall_decision={
+                    FormSubmission.APPROVED: 'recommended',
+                    FormSubmission.REJECTED: 'not_recommended',
+                }.get(submission.status, 'pending'),
+                completed_at=None if submission.status == FormSubmission.TECHNICAL else self.now,
+            )
+            for submission in evaluated
+        ])
+
+        assignments = []
+        for evaluation_round in rounds:
+            finished = evaluation_round.assignment_status == 'completed'
+            for evaluator in self.random.sample(self.evaluator_users, self.evaluators_per_round):
+                completed = finished or self.random.random() < 0.5
+                assignments.append(EvaluatorAssignment(
+                    evaluation_round=evaluation_round, evaluator=evaluator,
+                    current_trl=self.random.randint(2, 6), expected_trl=self.random.randint(5, 9),
+                    is_completed=completed, overall_comments='Synthetic evaluation' if completed else '',
+                    completed_at=self.now if completed else None,
+                ))
+        self._bulk(EvaluatorAssignment, assignments)
+
+        criteria = []
+        for assignment in assignments:
+            if not assignment.is_completed:
+                continue
+            for item in self.criteria_items:
+                criteria.append(CriteriaEvaluation(
+                    evaluator_assignment=assignment, evaluation_criteria=item,
+                    marks_given=Decimal(self.random.randint(3, 10)), remarks='ok',
+                ))
+        self._bulk(CriteriaEvaluation, criteria)
+        self.log(f'  tech-eval rounds: {len(rounds)}, assignments: {len(assignments)}, criteria: {len(criteria)}')
+
+    def make_presentations(self):
+        presentations = []
+        for submission in self._at_least(FormSubmission.APPROVED):
+            for evaluator in self.random.sample(self.evaluator_users, min(2, len(self.evaluator_users))):
+                presentations.append(Presentation(
+                    proposal=submission, applicant=submission.applicant, evaluator=evaluator,
+                    presentation_date=self.now - timedelta(days=self.random.randint(1, 60)),
+                    document_uploaded=True, evaluator_marks=Decimal(self.random.randint(25, 50)),
+                    evaluated_at=self.now, final_decision='shortlisted', admin=self.admin,
+                    admin_evaluated_at=self.now,
+                ))
+        self._bulk(Presentation, presentations)
+
+    def make_milestones_and_finance(self):
+        approved = self._at_least(FormSubmission.APPROVED)
+        milestones = []
+        for submission in approved:
+            start = date.today() - timedelta(days=self.random.randint(30, 300))
+            for n in range(self.milestones):
+                grant = self.random.randrange(5, 50) * 100000
+                milestones.append(Milestone(
+                    proposal=submission, title=f'Milestone {n + 1}', time_required=3,
+                    funds_requested=grant, grant_from_ttdf=grant, initial_grant_from_ttdf=grant,
+                    initial_contri_applicant=grant // 4,
+                    status=self.random.choice(('completed', 'in_progress', 'delayed', 'on_time')),
+                    start_date=start + timedelta(days=90 * n), due_date=start + timedelta(days=90 * (n + 1)),
+                    created_by=submission.applicant,
+                ))
+        self._bulk(Milestone, milestones)
+
+        submilestones = []
+        for milestone in milestones:
+            for n in range(self.submilestones):
+                submilestones.append(SubMilestone(
+                    milestone=milestone, title=f'{milestone.title}.{n + 1}', time_required=1,
+                    grant_from_ttdf=milestone.grant_from_ttdf // max(self.submilestones, 1),
+                    status=milestone.status, due_date=milestone.due_date,
+                    created_by=milestone.created_by,
+                ))
+        self._bulk(SubMilestone, submilestones)
+
+        # First milestone of each proposal goes through the whole finance chain
+        requests = []
+        for milestone in milestones[::max(self.milestones, 1)]:
+            requests.append(FinanceRequest(
+                proposal=milestone.proposal, milestone=milestone, applicant=milestone.proposal.applicant,
+                document=f'synthetic/{self.tag}/finance.pdf', status=FinanceRequest.IA_APPROVED,
+                created_by=milestone.proposal.applicant, reviewed_at=self.now,
+            ))
+        self._bulk(FinanceRequest, requests)
+        claims = self._bulk(PaymentClaim, [
+            PaymentClaim(
+                proposal=request.proposal, finance_request=request, milestone=request.milestone,
+                ia_user=self.admin, status=PaymentClaim.JF_APPROVED, ia_action=PaymentClaim.IA_ACCEPTED,
+                net_claim_amount=Decimal(request.milestone.grant_from_ttdf), reviewed_at=self.now,
+            )
+            for request in requests
+        ])
+        self._bulk(FinanceSanction, [
+            FinanceSanction(
+                proposal=claim.proposal, finance_request=claim.finance_request, payment_claim=claim,
+                sanction_date=date.today(), sanction_amount=claim.net_claim_amount,
+                status=FinanceSanction.JF_APPROVED, jf_user=self.admin, created_by=self.admin,
+            )
+            for claim in claims
+        ])
+
+    def rebuild_derived(self):
+        """Recompute what signals would have maintained for per-row saves."""
+        self.log('  rebuilding tech_eval caches, tracker snapshots and dashboard stats...')
+        call_command('rebuild_cache', batch_size=self.batch_size, stdout=_Null())
+        call_command('rebuild_tracker_snapshots', batch_size=self.batch_size, stdout=_Null())
+        call_command('reconcile_dashboard_stats', stdout=_Null())
+
+
+class _Null:
+    def write(self, *args, **kwargs):
+        pass
+
+    def flush(self):
+        pass
+
+
+def clear(tag):
+    """Delete everything generate() created for ``tag``; returns deleted row counts."""
+    deleted = {}
+
+    def add(result):
+        for label, count in result[1].items():
+            deleted[label] = deleted.get(label, 0) + count
+
+    with transaction.atomic():
+        add(FormSubmission.objects.filter(form_id__startswith=f'SYN/{tag}/').delete())
+        add(Service.objects.filter(name__startswith=f'{tag}: ').delete())
+        add(FormTemplate.objects.filter(title__startswith=f'{tag}: ').delete())
+        add(EvaluationItem.objects.filter(name__startswith=f'{tag}: ').delete())
+        add(PassingRequirement.objects.filter(requirement_name__startswith=f'{tag}: ').delete())
+        add(User.objects.filter(email__startswith=f'{tag}.', email__endswith=f'@{EMAIL_DOMAIN}').delete())
+    return deleted
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import AdminDashboardSummaryView,EvaluatorDashboardView
+from .views import AdminDashboardSummaryView,EvaluatorDashboardView,ResponseCacheStatsView
 
 from .views import (
     UserServiceSummaryView, TRLGrowthView, ScreeningStatusView,
@@ -17,6 +17,7 @@ from .views_super_admin import PermissionManagementAPIView,RolePermissionsAPIVie
 urlpatterns = [
     path('admin-summary/', AdminDashboardSummaryView.as_view(), name='admin-dashboard-summary'),
     path('evaluator-summary/', EvaluatorDashboardView.as_view(), name='evaluator-dashboard'),
+    path('response-cache/', ResponseCacheStatsView.as_view(), name='response-cache-stats'),
 
 
     path('user-service-summary/', UserServiceSummaryView.as_view()),
@@ -1,9 +1,9 @@
 from rest_framework.views import APIView 
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
 from configuration.models import Service
-from users.models import User
+from users.models import User, UserRole
 from dynamic_form.models import FormSubmission
 from tech_eval.models import TechnicalEvaluationRound,EvaluatorAssignment
 
@@ -14,71 +14,24 @@ from screening.models import ScreeningRecord, TechnicalScreeningRecord
 from django.db.models import OuterRef, Subquery
 from tech_eval.models import TRLAnalysis
 from presentation.models import Presentation
+from .aggregates import admin_dashboard_summary
+from .conditional import Source, conditional_get
+from . import response_cache
+from .response_cache import cache_response
 
 
 
 class AdminDashboardSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(
+        Source(User), Source(Service), Source(FormSubmission),
+        Source(TechnicalEvaluationRound), Source(Presentation),
+    )
+    @cache_response('formsubmission', 'technicalevaluationround', 'presentation', per_user=False)
     def get(self, request, *args, **kwargs):
-        # User counts
-        total_users = User.objects.count()
-        active_users = User.objects.filter(is_active=True).count()
-
-        # Service counts
-        total_services = Service.objects.count()
-        active_services = Service.objects.filter(status='active').count()
-        draft_services = Service.objects.filter(status='draft').count()
-
-        # Service-wise stats
-        services_data = []
-        services = Service.objects.all()
-        for service in services:
-            proposals = FormSubmission.objects.filter(service=service)
-            active_proposals = proposals.filter(status='submitted').count()
-            draft_proposals = proposals.filter(status='draft').count()
-
-            tech_evals = TechnicalEvaluationRound.objects.filter(proposal__in=proposals)
-            proposals_under_eval = tech_evals.filter(overall_decision='pending').count()
-
-            presentations = Presentation.objects.filter(proposal__in=proposals)
-            shortlisted = presentations.filter(final_decision='shortlisted').count()
-            not_shortlisted = presentations.filter(final_decision='rejected').count()
-
-            services_data.append({
-                "service_id": str(service.id),
-                "service_name": service.name,
-                "total_proposals": proposals.count(),
-                "active_proposals": active_proposals,
-                "draft_proposals": draft_proposals,
-                "proposals_under_evaluation": proposals_under_eval,
-                "shortlisted_presentations": shortlisted,
-                "not_shortlisted_presentations": not_shortlisted,
-            })
-
-        total_proposals_under_eval = TechnicalEvaluationRound.objects.filter(overall_decision='pending').count()
-        total_shortlisted = Presentation.objects.filter(final_decision='shortlisted').count()
-        total_not_shortlisted = Presentation.objects.filter(final_decision='rejected').count()
-
-        return Response({
-            "users": {
-                "total": total_users,
-                "active": active_users
-            },
-            "services": {
-                "total": total_services,
-                "active": active_services,
-                "draft": draft_services
-            },
-            "proposals": {
-                "under_evaluation": total_proposals_under_eval,
-            },
-            "presentations": {
-                "shortlisted": total_shortlisted,
-                "not_shortlisted": total_not_shortlisted,
-            },
-            "services_breakdown": services_data
-        })
+        # All per-service breakdowns come from grouped queries (see dashboard/aggregates.py)
+        return Response(admin_dashboard_summary())
 
 # class AdminDashboardSummaryView(APIView): 
 #     permission_classes = [IsAuthenticated]
@@ -217,6 +170,16 @@ class AdminDashboardSummaryView(APIView):
 class EvaluatorDashboardView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(
+        Source(EvaluatorAssignment, ('assigned_at', 'completed_at'),
+               scope=lambda request: {'evaluator': request.user}),
+        Source(FormSubmission, scope=lambda request: {
+            'technical_evaluation_rounds__evaluator_assignments__evaluator': request.user}),
+        Source(Presentation, scope=lambda request: {'evaluator': request.user}),
+        Source(Service),
+        # A revoked Evaluator role must not keep answering 304
+        Source(UserRole, timestamps=(), scope=lambda request: {'user': request.user}),
+    )
     def get(self, request, *args, **kwargs):
         user = request.user
 
@@ -591,4 +554,19 @@ class TechnicalEvaluationStatusView(APIView):
                 "not_recommended": eval_rounds.filter(overall_decision='not_recommended').count(),
                 "shortlisted": presentations_shortlisted,
             })
-        return Response(data)
\ No newline at end of file
+        return Response(data)
+
+
+class ResponseCacheStatsView(APIView):
+    """
+    Admin-only hit/miss/error counters of the response cache, per view (this
+    worker process only). DELETE resets them.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(response_cache.snapshot())
+
+    def delete(self, request, *args, **kwargs):
+        response_cache.reset()
+        return Response(status=204)
@@ -10,15 +10,35 @@ from milestones.models import Milestone, SubMilestone, PaymentClaim, FinanceRequ
 
 
 from rest_framework.permissions import IsAuthenticated
+from auth_service.streaming import JSONStream, stream_chunk_size, streaming_json_response, wants_stream
 from configuration.models import Service
-from milestones.models import MilestoneDocument
+from milestones.models import MilestoneDocument, ProposalMouDocument
 from presentation.models import Presentation
+from users.models import User
+from .conditional import Source, conditional_get
+from .response_cache import cache_response
+from .models import ProposalTrackerSnapshot
+
+SNAPSHOT_FIELDS = [
+    'latest_milestone', 'milestone_title', 'milestone_status', 'milestone_due_date', 'milestone_updated_at',
+    'latest_submilestone', 'submilestone_title', 'submilestone_status', 'submilestone_due_date',
+    'submilestone_updated_at',
+    'latest_payment_claim', 'claim_amount', 'claim_status', 'claim_created_at',
+    'latest_finance_request', 'finance_request_status', 'finance_request_created_at',
+    'milestone_status_counts',
+]
 
 class IADashboardAPIView(APIView):
     """
     Fast IA Dashboard API with summary and per-proposal breakdown.
+    ``?stream=true`` streams the proposals array (see auth_service/streaming.py).
     """
 
+    @conditional_get(
+        Source(FormSubmission), Source(Milestone), Source(ProposalTrackerSnapshot),
+        Source(ProposalMouDocument, 'uploaded_at'), Source(User),
+    )
+    @cache_response('formsubmission', 'milestone', per_user=False)
     def get(self, request, *args, **kwargs):
         # --- Summary Cards ---
         total_proposals = FormSubmission.objects.filter(is_active=True).count()
@@ -42,89 +62,76 @@ class IADashboardAPIView(APIView):
         unutilized = (total_requirement or 0) - (total_expenditure or 0)
 
         # --- Proposal Breakdown ---
+        # Latest milestone/claim/finance data comes from the precomputed
+        # ProposalTrackerSnapshot (kept current by dashboard/signals.py).
         proposals = (
             FormSubmission.objects.filter(is_active=True)
-            .select_related('service', 'applicant')
-            .prefetch_related(
-                'milestones__submilestones',
-                'milestones__documents',
-                'milestones__payment_claims',
-                'milestones__finance_requests'
+            .select_related('service', 'applicant', 'tracker_snapshot')
+            .only(
+                'proposal_id', 'subject', 'org_type', 'status', 'created_at',
+                'service__name', 'applicant__organization',
+                *(f'tracker_snapshot__{f}' for f in SNAPSHOT_FIELDS),
             )
             .order_by('-created_at')
         )
 
-        proposal_data = []
-        for proposal in proposals:
-            # Get latest milestone (by updated_at)
-            latest_ms = proposal.milestones.order_by('-updated_at').first()
-            latest_subms = (
-                latest_ms.submilestones.order_by('-updated_at').first()
-                if latest_ms else None
-            )
-
-            # Latest Payment Claim
-            latest_claim = (
-                latest_ms.payment_claims.order_by('-created_at').first()
-                if latest_ms else None
-            )
-            # Latest Finance Request
-            latest_fin_req = (
-                latest_ms.finance_requests.order_by('-created_at').first()
-                if latest_ms else None
-            )
-
-            # Milestone status counts for this proposal
-            milestone_counts = proposal.milestones.values('status').annotate(cnt=Count('id'))
-            ms_status_map = {row['status']: row['cnt'] for row in milestone_counts}
-
-            proposal_data.append({
-                "proposal_id": proposal.proposal_id,
-                "service": proposal.service.name if proposal.service else None,
-                "subject": proposal.subject,
-                "org_type": proposal.org_type,
-                "org_name": getattr(proposal.applicant, 'organization', None),
-                "status": proposal.status,
-                "created_at": proposal.created_at,
-                # Milestones & submilestones
-                "latest_milestone": {
-                    "title": latest_ms.title if latest_ms else None,
-                    "status": latest_ms.status if latest_ms else None,
-                    "due_date": latest_ms.due_date if latest_ms else None,
-                    "updated_at": latest_ms.updated_at if latest_ms else None,
-                } if latest_ms else None,
-                "latest_submilestone": {
-                    "title": latest_subms.title if latest_subms else None,
-                    "status": latest_subms.status if latest_subms else None,
-                    "due_date": latest_subms.due_date if latest_subms else None,
-                    "updated_at": latest_subms.updated_at if latest_subms else None,
-                } if latest_subms else None,
-                # Finance/claim summary
-                "latest_payment_claim": {
-                    "amount": latest_claim.net_claim_amount if latest_claim else None,
-                    "status": latest_claim.status if latest_claim else None,
-                    "created_at": latest_claim.created_at if latest_claim else None,
-                } if latest_claim else None,
-                "latest_finance_request": {
-                    "status": latest_fin_req.status if latest_fin_req else None,
-                    "created_at": latest_fin_req.created_at if latest_fin_req else None,
-                } if latest_fin_req else None,
-                "milestone_status_counts": ms_status_map,
-            })
+        rows = (_ia_proposal_row(p) for p in proposals.iterator(chunk_size=stream_chunk_size()))
 
         # --- Response ---
-        return Response({
-            "summary": {
-                "total_proposals": total_proposals,
-                "mou_signed": mou_signed,
-                "mou_pending": mou_pending,
-                "shortlisted": shortlisted,
-                "total_requirement": total_requirement,
-                "utilization": utilization,
-                "unutilized": unutilized,
-            },
-            "proposals": proposal_data,
-        })
+        summary = {
+            "total_proposals": total_proposals,
+            "mou_signed": mou_signed,
+            "mou_pending": mou_pending,
+            "shortlisted": shortlisted,
+            "total_requirement": total_requirement,
+            "utilization": utilization,
+            "unutilized": unutilized,
+        }
+        if wants_stream(request):
+            return streaming_json_response({"summary": summary, "proposals": JSONStream(rows)})
+        return Response({"summary": summary, "proposals": list(rows)})
+
+
+def _ia_proposal_row(proposal):
+    snap = getattr(proposal, 'tracker_snapshot', None)
+    has_ms = bool(snap and snap.latest_milestone_id)
+    has_subms = bool(snap and snap.latest_submilestone_id)
+    has_claim = bool(snap and snap.latest_payment_claim_id)
+    has_fin_req = bool(snap and snap.latest_finance_request_id)
+
+    return {
+        "proposal_id": proposal.proposal_id,
+        "service": proposal.service.name if proposal.service else None,
+        "subject": proposal.subject,
+        "org_type": proposal.org_type,
+        "org_name": getattr(proposal.applicant, 'organization', None),
+        "status": proposal.status,
+        "created_at": proposal.created_at,
+        # Milestones & submilestones
+        "latest_milestone": {
+            "title": snap.milestone_title,
+            "status": snap.milestone_status,
+            "due_date": snap.milestone_due_date,
+            "updated_at": snap.milestone_updated_at,
+        } if has_ms else None,
+        "latest_submilestone": {
+            "title": snap.submilestone_title,
+            "status": snap.submilestone_status,
+            "due_date": snap.submilestone_due_date,
+            "updated_at": snap.submilestone_updated_at,
+        } if has_subms else None,
+        # Finance/claim summary
+        "latest_payment_claim": {
+            "amount": snap.claim_amount,
+            "status": snap.claim_status,
+            "created_at": snap.claim_created_at,
+        } if has_claim else None,
+        "latest_finance_request": {
+            "status": snap.finance_request_status,
+            "created_at": snap.finance_request_created_at,
+        } if has_fin_req else None,
+        "milestone_status_counts": snap.milestone_status_counts if snap else {},
+    }
 
 
 class AllServicesAPIView(APIView):
@@ -211,6 +218,11 @@ class DocumentStatusCountAPIView(APIView):
 
 
 class IASummaryAPIView(APIView):
+    @conditional_get(
+        Source(Service), Source(FormSubmission), Source(Presentation),
+        Source(ProposalMouDocument, 'uploaded_at'),
+    )
+    @cache_response('formsubmission', 'presentation', per_user=False)
     def get(self, request, *args, **kwargs):
         services = Service.objects.all()
         service_data = []
@@ -256,6 +268,8 @@ class IASummaryAPIView(APIView):
     
 
 class IAUtilizationOverviewAPIView(APIView):
+    @conditional_get(Source(Service), Source(Milestone), Source(FormSubmission))
+    @cache_response('milestone', 'formsubmission', per_user=False)
     def get(self, request, *args, **kwargs):
         services = Service.objects.all()
         overall_total_requirement = 0
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Blob
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'ref_count', 'created_at', 'last_saved_at')
+    search_fields = ('name', 'digest')
+    readonly_fields = ('name', 'digest', 'size', 'ref_count', 'created_at', 'last_saved_at')
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class DocumentsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'documents'
+    verbose_name = 'Document Store'
+
+    def ready(self):
+        # Keep Blob.ref_count in step with every FileField on the CAS storage
+        from .refcount import connect_signals
+        connect_signals()
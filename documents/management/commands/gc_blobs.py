@@ -0,0 +1,48 @@
+# documents/management/commands/gc_blobs.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Sum
+
+from documents.models import Blob
+from documents.refcount import collect_garbage, recount
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete content-addressed blobs that no FileField references any more, '
+        'plus stray files under MEDIA_ROOT/cas/ without a Blob row.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age', type=float, default=24.0,
+            help='Only collect blobs not saved again for this many hours (default 24)',
+        )
+        parser.add_argument('--recount', action='store_true',
+                            help='Rebuild every ref_count from the tables first')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+
+    def handle(self, *args, **options):
+        if options['min_age'] < 0:
+            raise CommandError('--min-age must not be negative')
+
+        if options['recount']:
+            if options['dry_run']:
+                self.stdout.write('Skipping --recount in a dry run')
+            else:
+                self.stdout.write(f"Recounted: {recount()} ref_counts corrected")
+
+        result = collect_garbage(
+            min_age=timedelta(hours=options['min_age']), dry_run=options['dry_run'],
+        )
+        for name in result.still_referenced:
+            self.stdout.write(self.style.WARNING(f'{name} is still referenced; ref_count corrected'))
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result.blobs} blobs and {result.orphan_files} orphan files "
+            f"({result.bytes / 1024 / 1024:.1f} MB)"
+        ))
+        totals = Blob.objects.aggregate(blobs=Count('pk'), size=Sum('size'))
+        self.stdout.write(f"Store now holds {totals['blobs']} blobs ({(totals['size'] or 0) / 1024 / 1024:.1f} MB)")
@@ -0,0 +1,26 @@
+# documents/models.py
+from django.db import models
+
+
+class Blob(models.Model):
+    """
+    One file kept by ``ContentAddressedStorage``.
+
+    ``name`` is what the FileFields store (``cas/ab/cd/<sha256>.<ext>``).
+    ``ref_count`` is the number of FileField values pointing at it; it is
+    maintained by ``documents.refcount`` and blobs at zero are removed by
+    ``manage.py gc_blobs`` once they have not been saved again for a while
+    (``last_saved_at``).
+    """
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_saved_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['ref_count', 'last_saved_at'])]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
@@ -0,0 +1,192 @@
+# documents/refcount.py
+"""
+Reference counts and garbage collection for ``ContentAddressedStorage``.
+
+``connect_signals()`` (called from DocumentsConfig.ready()) finds every
+FileField that uses the CAS storage. It then watches those models:
+
+* post_init remembers the blob names a row was loaded with;
+* post_save adds one to a newly referenced blob and takes one off the blob
+  it replaced;
+* post_delete takes one off each blob the row referenced.
+
+The updates are ``F()`` expressions inside the saving transaction, so a
+rollback undoes them too. ``QuerySet.update()`` on those fields goes
+unnoticed. ``recount()`` rebuilds the counts from the tables, and
+``collect_garbage()`` re-checks the tables before deleting anything, so a
+drifted count can leave a blob in place for longer but never removes a
+referenced one.
+"""
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.apps import apps
+from django.db.models import F, FileField
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from .models import Blob
+from .storage import CAS_PREFIX, INCOMING_DIR, ContentAddressedStorage, content_addressed_storage, is_blob_name
+
+_LOADED_ATTR = '_cas_loaded_names'
+
+
+def cas_fields():
+    """``{model: [attname, ...]}`` for every concrete CAS-backed FileField."""
+    found = {}
+    for model in apps.get_models():
+        names = [
+            f.attname for f in model._meta.concrete_fields
+            if isinstance(f, FileField) and isinstance(f.storage, ContentAddressedStorage)
+        ]
+        if names:
+            found[model] = names
+    return found
+
+
+def _blob(value):
+    """The blob name of a field value, or None (empty, legacy or not yet saved)."""
+    name = value if isinstance(value, str) else getattr(value, 'name', None)
+    if getattr(value, '_committed', True) and is_blob_name(name):
+        return name
+    return None
+
+
+def _apply(deltas):
+    for name, delta in deltas.items():
+        if delta:
+            Blob.objects.filter(name=name).update(ref_count=F('ref_count') + delta)
+
+
+def _watch(model, attnames):
+    def remember(sender, instance, **kwargs):
+        # Deferred fields are missing from __dict__ and stay unknown
+        instance.__dict__[_LOADED_ATTR] = {
+            attname: _blob(instance.__dict__[attname])
+            for attname in attnames if attname in instance.__dict__
+        }
+
+    def saved(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        loaded = instance.__dict__.get(_LOADED_ATTR, {})
+        current = {}
+        deltas = Counter()
+        for attname in attnames:
+            if attname not in instance.__dict__:
+                continue
+            new = current[attname] = _blob(instance.__dict__[attname])
+            if attname in loaded:
+                old = loaded[attname]
+                if old == new:
+                    continue
+                if old:
+                    deltas[old] -= 1
+            # An unknown old value only adds; recount() fixes the overcount
+            if new:
+                deltas[new] += 1
+        _apply(deltas)
+        instance.__dict__[_LOADED_ATTR] = {**loaded, **current}
+
+    def deleted(sender, instance, **kwargs):
+        deltas = Counter()
+        for attname in attnames:
+            name = _blob(instance.__dict__.get(attname))
+            if name:
+                deltas[name] -= 1
+        _apply(deltas)
+
+    uid = f'cas-refcount-{model._meta.label_lower}'
+    post_init.connect(remember, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=uid)
+
+
+def connect_signals():
+    for model, attnames in cas_fields().items():
+        _watch(model, attnames)
+
+
+def count_references(names=None):
+    """Counter of blob name -> number of FileField values referencing it."""
+    counts = Counter()
+    for model, attnames in cas_fields().items():
+        for attname in attnames:
+            qs = model._base_manager.filter(**{f'{attname}__startswith': f'{CAS_PREFIX}/'})
+            if names is not None:
+                qs = qs.filter(**{f'{attname}__in': names})
+            counts.update(qs.values_list(attname, flat=True).iterator())
+    return counts
+
+
+def recount():
+    """Set every Blob.ref_count from the tables; returns how many changed."""
+    counts = count_references()
+    changed = []
+    for blob in Blob.objects.only('pk', 'name', 'ref_count').iterator():
+        actual = counts.get(blob.name, 0)
+        if blob.ref_count != actual:
+            blob.ref_count = actual
+            changed.append(blob)
+    Blob.objects.bulk_update(changed, ['ref_count'], batch_size=500)
+    return len(changed)
+
+
+@dataclass
+class GCResult:
+    blobs: int = 0
+    orphan_files: int = 0
+    bytes: int = 0
+    still_referenced: list = field(default_factory=list)
+
+
+def collect_garbage(min_age=timedelta(hours=24), dry_run=False, storage=None):
+    """
+    Delete blobs with no references that have not been saved for
+    ``min_age``, and files under cas/ without a Blob row (left by a crash
+    between writing the file and the row) older than ``min_age``.
+    """
+    storage = storage or content_addressed_storage
+    cutoff = timezone.now() - min_age
+    result = GCResult()
+
+    candidates = list(Blob.objects.filter(ref_count__lte=0, last_saved_at__lt=cutoff).order_by('pk'))
+    for start in range(0, len(candidates), 500):
+        chunk = candidates[start:start + 500]
+        referenced = count_references([blob.name for blob in chunk])
+        for blob in chunk:
+            if referenced.get(blob.name):
+                # The count drifted; fix it instead of deleting
+                result.still_referenced.append(blob.name)
+                if not dry_run:
+                    Blob.objects.filter(pk=blob.pk).update(ref_count=referenced[blob.name])
+                continue
+            if not dry_run:
+                # Skipped when an upload reused the blob since it was selected
+                deleted, _ = Blob.objects.filter(
+                    pk=blob.pk, ref_count__lte=0, last_saved_at__lt=cutoff,
+                ).delete()
+                if not deleted:
+                    continue
+                storage.delete(blob.name)
+            result.blobs += 1
+            result.bytes += blob.size
+
+    root = storage.path(CAS_PREFIX)
+    if not os.path.isdir(root):
+        return result
+    known = set(Blob.objects.values_list('name', flat=True))
+    cutoff_ts = cutoff.timestamp()
+    for dirpath, _dirs, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+            in_incoming = os.path.basename(dirpath) == INCOMING_DIR
+            if (in_incoming or name not in known) and os.path.getmtime(path) < cutoff_ts:
+                result.orphan_files += 1
+                result.bytes += os.path.getsize(path)
+                if not dry_run:
+                    os.remove(path)
+    return result
@@ -0,0 +1,114 @@
+# documents/storage.py
+"""
+Content-addressed file storage.
+
+``ContentAddressedStorage`` stores every file under the SHA-256 of its
+content, ``cas/<d[0:2]>/<d[2:4]>/<digest>.<ext>``, and ignores the name
+produced by ``upload_to`` apart from its extension. Saving the same bytes
+again returns the existing name instead of writing a copy, so a committee
+document attached to 600 screening records is written once::
+
+    evaluated_document = models.FileField(storage=ContentAddressedStorage(), ...)
+
+The content is hashed while it is copied to a temporary file next to the
+blobs, then moved into place, so each upload is read once. The digest is
+remembered on the uploaded file object; assigning that same object to more
+records (``upload_document``) costs a ``stat()`` per save and no reading.
+
+Each stored file gets a ``documents.Blob`` row. Its reference count is kept
+by ``documents.refcount`` and ``manage.py gc_blobs`` deletes the blobs
+nothing points at. Names saved before the switch keep working because
+files are still looked up relative to MEDIA_ROOT.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+CAS_PREFIX = 'cas'
+INCOMING_DIR = '.incoming'
+
+# Attribute set on the saved File object so re-saving it skips the hashing
+_DIGEST_ATTR = '_content_digest'
+
+_EXTENSION_RE = re.compile(r'^[a-z0-9]{1,10}$')
+
+
+def blob_name(digest, extension=''):
+    return f"{CAS_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(f"{CAS_PREFIX}/")
+
+
+def _extension(name):
+    ext = os.path.splitext(name or '')[1][1:].lower()
+    return f".{ext}" if _EXTENSION_RE.match(ext) else ''
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # _save() picks the final name; identical content is meant to collide
+        return name
+
+    def _save(self, name, content):
+        from .models import Blob
+
+        extension = _extension(name)
+        cached = getattr(content, _DIGEST_ATTR, None)
+        if cached and self.exists(blob_name(cached[0], extension)):
+            return blob_name(cached[0], extension)
+
+        digest, size, temp_path = self._write_temp(content)
+        target = blob_name(digest, extension)
+        full_path = self.path(target)
+        try:
+            if os.path.exists(full_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        blob, created = Blob.objects.get_or_create(name=target, defaults={'digest': digest, 'size': size})
+        if not created:
+            # Reused: keep gc_blobs off it until the referencing row is saved
+            Blob.objects.filter(pk=blob.pk).update(last_saved_at=timezone.now())
+        try:
+            setattr(content, _DIGEST_ATTR, (digest, size))
+        except AttributeError:
+            pass
+        return target
+
+    def _write_temp(self, content):
+        """Copy ``content`` into the incoming dir, hashing it on the way."""
+        incoming = self.path(f"{CAS_PREFIX}/{INCOMING_DIR}")
+        os.makedirs(incoming, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=incoming)
+        sha = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    sha.update(chunk)
+                    size += len(chunk)
+                    fh.write(chunk)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return sha.hexdigest(), size, temp_path
+
+
+content_addressed_storage = ContentAddressedStorage()
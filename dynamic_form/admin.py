@@ -6,6 +6,7 @@ from .models import (
     FormSubmission,
     FieldResponse,
     ApplicationStatusHistory,
+    ProposalSequence,
 )
 
 @admin.register(FormTemplate)
@@ -168,6 +169,14 @@ class ApplicationStatusHistoryAdmin(admin.ModelAdmin):
     readonly_fields = ('change_date',)
 
 
+@admin.register(ProposalSequence)
+class ProposalSequenceAdmin(admin.ModelAdmin):
+    list_display = ('prefix', 'year', 'last_value', 'updated_at')
+    list_filter = ('year',)
+    search_fields = ('prefix',)
+    readonly_fields = ('updated_at',)
+
+
 
 
 
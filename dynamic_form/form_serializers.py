@@ -670,8 +670,11 @@ class ObjectiveTimelineSerializer(serializers.ModelSerializer):
     
     def get_milestones(self, obj):
         """Get milestone data from the milestone app"""
+        milestones = self.context.get('milestones')  # already loaded by the caller, by id
+        if milestones is None:
+            milestones = obj.milestones.all().order_by('id')
         milestones_data = []
-        for milestone in obj.milestones.all().order_by('id'):
+        for milestone in milestones:
             milestones_data.append({
                 'id': milestone.id,
                 'title': milestone.title or '',
@@ -1,10 +1,14 @@
 # dynamic_form/form_views.py 
+import json
+import logging
+
 from rest_framework import viewsets, status,serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from milestones.models import Milestone
+from milestones.sync import sync_milestones
 from django.shortcuts import get_object_or_404
 from .models import (
     FormSubmission, Collaborator, Equipment, ShareHolder,
@@ -22,6 +26,8 @@ from .form_serializers import (
 from users.utils import upsert_profile_and_user_from_submission
 from django.db import IntegrityError
 
+logger = logging.getLogger(__name__)
+
 
 class FormSectionViewSet(viewsets.ViewSet):
     """Base viewset for form sections"""
@@ -1212,23 +1218,14 @@ class ObjectiveTimelineViewSet(FormSectionViewSet):
             
         submission = self.get_submission(submission_id)
         
-        print(f"\n🔍 OBJECTIVE TIMELINE UPDATE DEBUG:")
-        print(f"   Submission ID: {submission_id}")
-        print(f"   Request data keys: {list(request.data.keys())}")
-        
         # Handle milestone data - check both 'milestones' and 'milestoneData'
         milestone_data = request.data.get('milestones', request.data.get('milestoneData', []))
-        print(f"   Raw milestone data type: {type(milestone_data)}")
-        print(f"   Raw milestone data: {milestone_data}")
         
         # Handle case where milestone_data comes as JSON string
         if isinstance(milestone_data, str):
             try:
-                import json
                 milestone_data = json.loads(milestone_data)
-                print(f"   ✅ Successfully parsed JSON string to list")
             except json.JSONDecodeError as e:
-                print(f"   ❌ Failed to parse JSON: {e}")
                 return Response({
                     'success': False,
                     'error': f'Invalid JSON in milestones: {str(e)}'
@@ -1236,17 +1233,14 @@ class ObjectiveTimelineViewSet(FormSectionViewSet):
         
         # Ensure milestone_data is a list
         if not isinstance(milestone_data, list):
-            print(f"   ❌ milestone_data is not a list: {type(milestone_data)}")
             return Response({
                 'success': False,
                 'error': 'Milestones must be a list'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        print(f"   Final milestone data: {milestone_data}")
-        
-        # Filter out empty milestones BEFORE processing
-        valid_milestones = []
-        for i, milestone_info in enumerate(milestone_data):
+        # Filter out empty milestones and map the form's keys to Milestone fields
+        rows = []
+        for milestone_info in milestone_data:
             if not isinstance(milestone_info, dict):
                 continue
                 
@@ -1262,134 +1256,40 @@ class ObjectiveTimelineViewSet(FormSectionViewSet):
             time_required = milestone_info.get('time_required') or milestone_info.get('timeRequiredMonths') or milestone_info.get('timeRequired') or 0
             
             # Only include milestones with actual content
-            if scope_of_work or activities or float(time_required) >= 0:
-                valid_milestones.append({
-                    'index': i,
-                    'data': milestone_info,
-                    'scope_of_work': scope_of_work,
-                    'activities': activities,
-                    'time_required': float(time_required)
-                })
-                print(f"   ✅ Valid milestone {i+1}: {scope_of_work}")
-            else:
-                print(f"   ⏭️ Skipping incomplete milestone {i+1}")
+            if not (scope_of_work or activities or float(time_required) >= 0):
+                continue
+
+            grant_from_ttdf = milestone_info.get('grant_from_ttdf')
+            initial_contri_applicant = (milestone_info.get('applicantContributionINR') or
+                                        milestone_info.get('initialContriApplicant') or 0)
+            rows.append({
+                'id': milestone_info.get('id'),
+                'title': scope_of_work,
+                'description': milestone_info.get('description', '').strip(),
+                'activities': activities,
+                'time_required': int(float(time_required)),
+                'grant_from_ttdf': int(float(grant_from_ttdf if grant_from_ttdf is not None else 0)),
+                'initial_contri_applicant': int(float(initial_contri_applicant)),
+                'start_date': milestone_info.get('startDate') or None,
+                'due_date': milestone_info.get('endDate') or milestone_info.get('dueDate') or None,
+            })
         
         try:
-            with transaction.atomic():
-                # Get existing milestones for this proposal
-                existing_milestones = {
-                    m.id: m for m in Milestone.objects.filter(proposal=submission)
-                }
-                processed_milestone_ids = set()
-                
-                print(f"   📋 Found {len(existing_milestones)} existing milestones")
-                print(f"   📋 Processing {len(valid_milestones)} valid new milestones")
-                
-                # Process each valid milestone
-                for milestone_info in valid_milestones:
-                    milestone_data_item = milestone_info['data']
-                    scope_of_work = milestone_info['scope_of_work']
-                    
-                    print(f"   🔄 Processing milestone: {scope_of_work}")
-                    
-                    # Extract other milestone data
-                    description = milestone_data_item.get('description', '').strip()
-                    activities = milestone_info['activities']
-                    time_required = milestone_info['time_required']
-                    
-                    # Handle grant amounts
-                    # grant_from_ttdf = float(milestone_data_item.get('ttdfGrantINR') or 
-                    #                       milestone_data_item.get('grantFromTtdf') or 0)
-
-                    grant_from_ttdf = float(
-                        milestone_data_item.get('grant_from_ttdf')
-                        if 'grant_from_ttdf' in milestone_data_item and milestone_data_item.get('grant_from_ttdf') is not None
-                        # else milestone_data_item.get('ttdfGrantINR')
-                        # if 'ttdfGrantINR' in milestone_data_item and milestone_data_item.get('ttdfGrantINR') is not None
-                        # else milestone_data_item.get('grantFromTtdf')
-                        # if 'grantFromTtdf' in milestone_data_item and milestone_data_item.get('grantFromTtdf') is not None
-                        else 0
-                    )
-                    
-                    # Handle applicant contribution
-                    initial_contri_applicant = float(milestone_data_item.get('applicantContributionINR') or 
-                                                   milestone_data_item.get('initialContriApplicant') or 0)
-                    
-                    # Handle dates
-                    start_date = milestone_data_item.get('startDate')
-                    due_date = (milestone_data_item.get('endDate') or 
-                              milestone_data_item.get('dueDate'))
-                    
-                    # Check if this is an update to existing milestone
-                    milestone_id = milestone_data_item.get('id')
-                    existing_milestone = None
-                    
-                    if milestone_id and milestone_id in existing_milestones:
-                        existing_milestone = existing_milestones[milestone_id]
-                        processed_milestone_ids.add(milestone_id)
-                        print(f"   🔄 Updating existing milestone {milestone_id}")
-                    else:
-                        print(f"   ➕ Creating new milestone")
-                    
-                    # Create or update milestone
-                    if existing_milestone:
-                        # Update existing milestone
-                        existing_milestone.title = scope_of_work
-                        existing_milestone.description = description
-                        existing_milestone.activities = activities
-                        existing_milestone.time_required = int(time_required)
-                        existing_milestone.grant_from_ttdf = int(grant_from_ttdf)
-                        existing_milestone.initial_contri_applicant = int(initial_contri_applicant)
-                        existing_milestone.start_date = start_date
-                        existing_milestone.due_date = due_date
-                        existing_milestone.updated_by = request.user
-                        existing_milestone.save()
-                        
-                        print(f"   ✅ Updated milestone {existing_milestone.id}: {existing_milestone.title}")
-                    else:
-                        # Create new milestone
-                        milestone = Milestone.objects.create(
-                            proposal=submission,
-                            title=scope_of_work,
-                            description=description,
-                            activities=activities,
-                            time_required=int(time_required),
-                            grant_from_ttdf=int(grant_from_ttdf),
-                            initial_contri_applicant=int(initial_contri_applicant),
-                            start_date=start_date,
-                            due_date=due_date,
-                            status='in_progress',
-                            created_by=request.user
-                        )
-                        processed_milestone_ids.add(milestone.id)
-                        print(f"   ✅ Created milestone {milestone.id}: {milestone.title}")
-                
-                # Delete milestones that are no longer in the form
-                milestones_to_delete = set(existing_milestones.keys()) - processed_milestone_ids
-                if milestones_to_delete:
-                    deleted_count = Milestone.objects.filter(
-                        id__in=milestones_to_delete,
-                        proposal=submission
-                    ).delete()[0]
-                    print(f"   🗑️ Deleted {deleted_count} removed milestones: {milestones_to_delete}")
-                
-                print(f"   ✅ Successfully processed {len(valid_milestones)} milestones")
-                
+            # One bulk diff-and-upsert; milestones missing from the form are deleted
+            result = sync_milestones(submission, rows, user=request.user)
         except Exception as e:
-            print(f"   ❌ Error saving milestones: {e}")
-            import traceback
-            print(f"   Traceback: {traceback.format_exc()}")
+            logger.exception("Error saving milestones of submission %s", submission.pk)
             return Response({
                 'success': False,
                 'error': f'Error saving milestones: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-        # Get updated data
-        serializer = ObjectiveTimelineSerializer(submission)
+        # The synced milestones are already in memory; no need to load them again
+        serializer = ObjectiveTimelineSerializer(submission, context={'milestones': result.milestones})
         
         return Response({
             'success': True,
-            'message': f'Timeline details saved successfully ({len(valid_milestones)} milestones processed)',
+            'message': f'Timeline details saved successfully ({len(rows)} milestones processed)',
             'data': serializer.data
         })
     
@@ -1738,15 +1638,17 @@ class FormSubmissionControlViewSet(FormSectionViewSet):
                 'errors': exc.detail
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # 3. Submit the form
-        submission.status = FormSubmission.SUBMITTED
-        submission.save()
+        # 3. Submit the form (the PDF is rendered later by the jobs worker)
+        with transaction.atomic():
+            submission.status = FormSubmission.SUBMITTED
+            submission.save()
 
         return Response({
             'success': True,
             'message': 'Form submitted successfully',
             'proposal_id': submission.proposal_id,
-            'form_id': submission.form_id
+            'form_id': submission.form_id,
+            'pdf_status': submission.pdf_status
         }, status=status.HTTP_200_OK)
 
 
@@ -1770,6 +1672,7 @@ class FormSubmissionControlViewSet(FormSectionViewSet):
                 'form_id': submission.form_id,
                 'proposal_id': submission.proposal_id,
                 'status': submission.status,
+                'pdf_status': submission.pdf_status,
                 'created_at': submission.created_at,
                 'updated_at': submission.updated_at,
                 'can_edit': submission.can_edit(),
@@ -0,0 +1,68 @@
+# dynamic_form/management/commands/benchmark_autosave.py
+import statistics
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from dynamic_form.models import FormSubmission, FormTemplate
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure section autosave latency: load a draft FormSubmission the way '
+        'the section views do, change one field and save(). Reports queries per '
+        'save, how many of them re-read the submission row, and latency. All '
+        'synthetic rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--saves', type=int, default=200, help='Number of autosaves to time')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                result = self.run(options['saves'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        timings, queries, row_reads = result
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f"saves={len(timings)}")
+        self.stdout.write(f"queries/save={statistics.mean(queries):.1f} "
+                          f"submission re-reads/save={statistics.mean(row_reads):.1f}")
+        self.stdout.write(f"median={statistics.median(timings) * 1000:.2f}ms p95={p95 * 1000:.2f}ms")
+
+    def run(self, saves):
+        tag = uuid.uuid4().hex[:8]
+        user = get_user_model().objects.create(
+            email=f"benchmark-{tag}@example.com", mobile=tag, full_name='Benchmark', gender='O',
+        )
+        template = FormTemplate.objects.create(title=f"benchmark-{tag}")
+        submission = FormSubmission.objects.create(template=template, applicant=user)
+        table = FormSubmission._meta.db_table
+
+        timings, queries, row_reads = [], [], []
+        for i in range(saves):
+            # Same lookup as FormSectionViewSet.get_submission
+            instance = FormSubmission.objects.get(id=submission.pk, applicant=user)
+            instance.subject = f"autosave {i}"
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                instance.save()
+                timings.append(time.perf_counter() - start)
+            queries.append(len(ctx.captured_queries))
+            row_reads.append(sum(
+                1 for q in ctx.captured_queries
+                if q['sql'].lstrip().upper().startswith('SELECT') and f'FROM "{table}"' in q['sql']
+            ))
+        return timings, queries, row_reads
@@ -0,0 +1,58 @@
+# dynamic_form/management/commands/seed_proposal_sequences.py
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dynamic_form.models import FormSubmission, ProposalSequence, proposal_id_number
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed ProposalSequence counters from the proposal_ids already issued, '
+        'so the next submit of each ID series/year continues after the highest '
+        'number. Counters are only ever raised.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report the counters without saving them')
+
+    def handle(self, *args, **options):
+        ids = (
+            FormSubmission.objects.filter(proposal_id__startswith='TTDF/')
+            .values_list('proposal_id', flat=True).iterator()
+        )
+        # Keyed like the counters: templates with the same sanitized title share a series
+        highest = defaultdict(int)
+        for proposal_id in ids:
+            parts = proposal_id.split('/')
+            if len(parts) != 4 or not parts[2].isdigit():
+                continue
+            number = proposal_id_number(proposal_id, '/'.join(parts[:3]) + '/')
+            if number is None:
+                continue
+            key = ('/'.join(parts[:2]) + '/', int(parts[2]))
+            highest[key] = max(highest[key], number)
+
+        existing = {(seq.prefix, seq.year): seq for seq in ProposalSequence.objects.all()}
+        created = raised = unchanged = 0
+        with transaction.atomic():
+            for (prefix, year), seed in sorted(highest.items()):
+                sequence = existing.get((prefix, year))
+                if sequence is None:
+                    created += 1
+                    self.stdout.write(f'  {prefix}{year}: new counter at {seed}')
+                    if not options['dry_run']:
+                        ProposalSequence.objects.create(prefix=prefix, year=year, last_value=seed)
+                elif sequence.last_value < seed:
+                    raised += 1
+                    self.stdout.write(f'  {prefix}{year}: {sequence.last_value} -> {seed}')
+                    if not options['dry_run']:
+                        ProposalSequence.objects.filter(pk=sequence.pk, last_value__lt=seed).update(last_value=seed)
+                else:
+                    unchanged += 1
+
+        verb = 'Would seed' if options['dry_run'] else 'Seeded'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {created} new counters, raised {raised}, {unchanged} already up to date'
+        ))
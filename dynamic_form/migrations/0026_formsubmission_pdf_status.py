@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dynamic_form', '0025_alter_teammember_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formsubmission',
+            name='pdf_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], help_text='State of the background applicationDocument rendering', max_length=10, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dynamic_form', '0026_formsubmission_pdf_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formsubmission',
+            name='workflow_category',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='formsubmission',
+            name='workflow_status',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=50),
+        ),
+    ]
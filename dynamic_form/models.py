@@ -6,6 +6,8 @@ from django.conf import settings
 from .utils.pdf_generator import generate_submission_pdf
 from functools import partial
 from django.utils import timezone
+from django.db import transaction
+from jobs.registry import enqueue
 
 YES_NO_CHOICES = [
     ('yes','Yes'),
@@ -43,6 +45,74 @@ class FormTemplate(models.Model):
         return self.title
 
 
+def proposal_id_series(template):
+    """``TTDF/<TEMPLATE TITLE>/``, the part of a proposal_id before the year"""
+    name = template.title.upper() if template and template.title else "GENERAL"
+    # Remove non-alphanumeric characters for ID safety
+    name = "".join(c for c in name if c.isalnum())
+    return f"TTDF/{name}/"
+
+
+def proposal_id_prefix(template, year):
+    """``TTDF/<TEMPLATE TITLE>/<year>/``, the part of a proposal_id before the number"""
+    return f"{proposal_id_series(template)}{year}/"
+
+
+def proposal_id_number(proposal_id, prefix):
+    """Trailing number of ``proposal_id`` if it starts with ``prefix``, else None"""
+    if not proposal_id or not proposal_id.startswith(prefix):
+        return None
+    number = proposal_id[len(prefix):]
+    return int(number) if number.isdigit() else None
+
+
+class ProposalSequence(models.Model):
+    """
+    Last proposal number handed out per (series, year).
+
+    The series is the sanitized ``TTDF/<TITLE>/`` part of the ID, not the
+    template: templates whose titles sanitize to the same series ("Dup x",
+    "DUP-x") issue IDs from one number space, so they share one counter.
+
+    ``allocate()`` increments the row with one UPDATE and reads the value back
+    in the same transaction. The UPDATE holds the row's write lock until
+    commit, so concurrent submits each get their own number. A rolled-back
+    submit gives its number back. A missing row is seeded from the highest
+    existing proposal_id with the same prefix, so an unseeded table never
+    hands out a number that is already taken. ``manage.py
+    seed_proposal_sequences`` does the same for every series up front.
+    """
+    prefix     = models.CharField(max_length=300)
+    year       = models.PositiveIntegerField()
+    last_value = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('prefix', 'year')
+
+    def __str__(self):
+        return f"{self.prefix}{self.year}: {self.last_value}"
+
+    @staticmethod
+    def highest_existing(prefix, year):
+        id_prefix = f"{prefix}{year}/"
+        ids = FormSubmission.objects.filter(proposal_id__startswith=id_prefix).values_list('proposal_id', flat=True)
+        return max((n for n in (proposal_id_number(pid, id_prefix) for pid in ids) if n is not None), default=0)
+
+    @classmethod
+    def allocate(cls, template, year):
+        prefix = proposal_id_series(template)
+        with transaction.atomic():
+            sequence, _ = cls.objects.get_or_create(
+                prefix=prefix, year=year,
+                defaults={'last_value': cls.highest_existing(prefix, year)},
+            )
+            cls.objects.filter(pk=sequence.pk).update(
+                last_value=models.F('last_value') + 1, updated_at=timezone.now(),
+            )
+            return cls.objects.filter(pk=sequence.pk).values_list('last_value', flat=True).get()
+
+
 # def upload_to_dynamic(instance, filename, subfolder=None):
 #     # Handles both direct file fields and related models if needed
 #     service = getattr(instance, 'service', None)
@@ -111,6 +181,17 @@ class FormSubmission(models.Model):
         (REJECTED,   'Rejected'),
     ]
 
+    # applicationDocument PDF rendering (runs in the jobs worker)
+    PDF_PENDING = 'pending'
+    PDF_DONE    = 'done'
+    PDF_FAILED  = 'failed'
+
+    PDF_STATUS_CHOICES = [
+        (PDF_PENDING, 'Pending'),
+        (PDF_DONE,    'Done'),
+        (PDF_FAILED,  'Failed'),
+    ]
+
     id           = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     template     = models.ForeignKey(
         'dynamic_form.FormTemplate',
@@ -144,10 +225,16 @@ class FormSubmission(models.Model):
     contact_name = models.CharField(max_length=200, blank=True)
     contact_email= models.EmailField(blank=True)
     applicationDocument = models.FileField(upload_to=partial(upload_to_dynamic, subfolder="pdf"), blank=True, null=True)
+    pdf_status   = models.CharField(max_length=10, choices=PDF_STATUS_CHOICES, blank=True, null=True,
+                                    help_text="State of the background applicationDocument rendering")
     is_active    = models.BooleanField(default=True)
     created_at   = models.DateTimeField(auto_now_add=True)
     updated_at   = models.DateTimeField(auto_now=True)
     committee_assigned = models.BooleanField(default=False)
+    # Materialized by applicant_dashboard.workflow from the screening,
+    # evaluation and presentation records; not edited directly
+    workflow_category = models.CharField(max_length=20, blank=True, default='', db_index=True, editable=False)
+    workflow_status = models.CharField(max_length=50, blank=True, default='', db_index=True, editable=False)
 
 
      # ---9. Summary Section ---
@@ -591,17 +678,9 @@ class FormSubmission(models.Model):
 
     def generate_proposal_id(self):
         year = datetime.now().year
-        # Use template title instead of service name
-        template_name = self.template.title.upper() if self.template and self.template.title else "GENERAL"
-        # Remove non-alphanumeric characters for ID safety
-        template_name = "".join(c for c in template_name if c.isalnum())
-        # Count per template for the year (not per service)
-        count = FormSubmission.objects.filter(
-            status=self.SUBMITTED,
-            created_at__year=year,
-            template=self.template
-        ).count() + 1
-        return f"TTDF/{template_name}/{year}/{count:05d}"
+        # Numbered per ID series and year (not per service) from ProposalSequence
+        number = ProposalSequence.allocate(self.template, year)
+        return f"{proposal_id_prefix(self.template, year)}{number:05d}"
 
 
 
@@ -635,40 +714,99 @@ class FormSubmission(models.Model):
     #         filename = f"{self.proposal_id or self.form_id}.pdf"
     #         self.applicationDocument.save(filename, pdf_file, save=True)
 
+    # ---- Persisted state (status transitions) ----
+    # The status/applicant the row had in the database, remembered when the
+    # instance is loaded so save() and the pre/post_save receivers can all see
+    # the transition without each re-reading the row.
+    TRACKED_STATE_FIELDS = ('status', 'applicant_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_persisted_state()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember_persisted_state(fields)
+
+    def _remember_persisted_state(self, fields=None):
+        state = self.__dict__.get('_persisted_state') or {}
+        for name in self.TRACKED_STATE_FIELDS:
+            if fields is not None and name not in fields and name.removesuffix('_id') not in fields:
+                continue
+            if name in self.__dict__:  # skip deferred fields
+                state[name] = self.__dict__[name]
+        self._persisted_state = state
+
+    def persisted_state(self):
+        """
+        {'status': .., 'applicant_id': ..} as currently stored, or None for a
+        row that isn't in the database yet. Instances that were loaded normally
+        answer from memory; anything else (built by hand, status deferred)
+        costs one narrow query, which is then kept on the instance.
+        """
+        if self._state.adding:
+            return None
+        state = self.__dict__.get('_persisted_state')
+        if state is None or len(state) < len(self.TRACKED_STATE_FIELDS):
+            state = (
+                FormSubmission.objects.filter(pk=self.pk)
+                .values(*self.TRACKED_STATE_FIELDS)
+                .first()
+            )
+            self._persisted_state = state
+        return state
+
+    def persisted_status(self):
+        state = self.persisted_state()
+        return state['status'] if state else None
+
     def save(self, *args, **kwargs):
-        is_new_submission = not self.pk  # True if this is a new object
-        was_draft = False
+        is_new_submission = self._state.adding  # True if this is a new object
 
         # if self.status == self.SUBMITTED:
         #     self.committee_assigned = True
 
-        if not is_new_submission:
-            try:
-                existing = FormSubmission.objects.get(pk=self.pk)
-                was_draft = (existing.status == self.DRAFT)
-            except FormSubmission.DoesNotExist:
-                pass
+        was_draft = self.persisted_status() == self.DRAFT
 
         if not self.form_id:
             self.form_id = self.generate_form_id()
 
-        # On first submission, generate a proposal_id if it's not already set
-        if self.status == self.SUBMITTED and not self.proposal_id:
-            self.proposal_id = self.generate_proposal_id()
+        just_submitted = self.status == self.SUBMITTED and (is_new_submission or was_draft)
+        if just_submitted:
+            self.pdf_status = self.PDF_PENDING
 
         # ---- 1. Save the object to the database (MUST DO THIS FIRST!) ----
-        super().save(*args, **kwargs)
-
-        # ---- 2. If just submitted, move files out of /draft/ to final location ----
-        if self.status == self.SUBMITTED and (is_new_submission or was_draft):
-            # self.move_all_files_to_proposal_folder()
-            # Save again to update file fields with new paths
-            super().save(update_fields=[f.name for f in self._meta.fields if isinstance(f, models.FileField)])
-
-            # ---- 3. Now, generate the PDF (so PDF also ends up in correct folder) ----
-            pdf_file = generate_submission_pdf(self)
-            filename = f"{self.proposal_id or self.form_id}.pdf"
-            self.applicationDocument.save(filename, pdf_file, save=True)
+        with transaction.atomic():
+            # On first submission, generate a proposal_id if it's not already set.
+            # Inside the transaction so a failed save doesn't use up the number.
+            if self.status == self.SUBMITTED and not self.proposal_id:
+                self.proposal_id = self.generate_proposal_id()
+
+            super().save(*args, **kwargs)
+
+            # ---- 2. If just submitted, queue the PDF rendering ----
+            # The job row commits together with the status change; the
+            # jobs worker (manage.py run_jobs) renders applicationDocument.
+            if just_submitted:
+                enqueue(
+                    'dynamic_form.generate_submission_pdf',
+                    {'submission_id': str(self.pk)},
+                    dedupe_key=f'submission-pdf:{self.pk}',
+                )
+
+        # post_save receivers have seen the old state; from here on the
+        # saved values are what's in the database.
+        self._remember_persisted_state(kwargs.get('update_fields'))
+
+    def render_application_document(self):
+        """Render and store applicationDocument (called by the jobs worker)."""
+        pdf_file = generate_submission_pdf(self)
+        filename = f"{self.proposal_id or self.form_id}.pdf"
+        self.applicationDocument.save(filename, pdf_file, save=False)
+        self.pdf_status = self.PDF_DONE
+        super().save(update_fields=['applicationDocument', 'pdf_status'])
 
 
 
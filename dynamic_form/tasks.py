@@ -0,0 +1,20 @@
+# dynamic_form/tasks.py
+"""Background job handlers for dynamic_form (run by ``manage.py run_jobs``)."""
+from jobs.registry import register
+from .models import FormSubmission
+
+
+def mark_pdf_failed(payload):
+    FormSubmission.objects.filter(pk=payload['submission_id']).update(
+        pdf_status=FormSubmission.PDF_FAILED
+    )
+
+
+@register('dynamic_form.generate_submission_pdf', on_failure=mark_pdf_failed)
+def generate_submission_pdf(payload):
+    submission = (
+        FormSubmission.objects
+        .select_related('applicant', 'template')
+        .get(pk=payload['submission_id'])
+    )
+    submission.render_application_document()
@@ -20,7 +20,7 @@ from django.db import transaction
 
 # Committee‐head lives in the configuration app
 from configuration.models import ScreeningCommittee
-from milestones.models import Milestone
+from milestones.sync import sync_milestones
 from users.utils import upsert_profile_and_user_from_submission
 import json
 
@@ -40,50 +40,40 @@ class FormTemplateViewSet(viewsets.ReadOnlyModelViewSet):
         return qs
 
 
+# Milestone keys accepted from the submission payload
+MILESTONE_FIELDS = (
+    "title", "description", "time_required", "revised_time_required", "grant_from_ttdf",
+    "initial_contri_applicant", "revised_contri_applicant", "initial_grant_from_ttdf", "revised_grant_from_ttdf",
+)
+
+
 def save_milestones_for_submission(form_submission, milestones_data, user=None):
     """
     Create/Update/Delete Milestone objects for a FormSubmission, given a list of milestone dicts.
+    Existing milestones (matched by "id") only take the non-empty values; milestones not in the
+    list are deleted. See milestones.sync for how the writes are batched.
     """
-    existing_milestones = {str(m.id): m for m in form_submission.milestones.all()}  # Use related_name or milestone_set if not set
-
-    received_ids = set()
-    for idx, m in enumerate(milestones_data):
-        milestone_id = m.get("id")
-        if milestone_id and str(milestone_id) in existing_milestones:
-            # UPDATE existing milestone
-            milestone = existing_milestones[str(milestone_id)]
-            milestone.title = m.get("title") or milestone.title
-            milestone.description = m.get("description") or milestone.description
-            milestone.time_required = m.get("time_required") or milestone.time_required
-            milestone.revised_time_required = m.get("revised_time_required") or milestone.revised_time_required
-            milestone.grant_from_ttdf = m.get("grant_from_ttdf") or milestone.grant_from_ttdf
-            milestone.initial_contri_applicant = m.get("initial_contri_applicant") or milestone.initial_contri_applicant
-            milestone.revised_contri_applicant = m.get("revised_contri_applicant") or milestone.revised_contri_applicant
-            milestone.initial_grant_from_ttdf = m.get("initial_grant_from_ttdf") or milestone.initial_grant_from_ttdf
-            milestone.revised_grant_from_ttdf = m.get("revised_grant_from_ttdf") or milestone.revised_grant_from_ttdf
-            milestone.save()
-            received_ids.add(str(milestone_id))
-        else:
-            # CREATE new milestone
-            new_milestone = Milestone.objects.create(
-                proposal=form_submission,
-                title=m.get("title") or f"Milestone {idx+1}",
-                description=m.get("description") or "",
-                time_required=m.get("time_required") or 0,
-                revised_time_required=m.get("revised_time_required"),
-                grant_from_ttdf=m.get("grant_from_ttdf") or 0,
-                initial_contri_applicant=m.get("initial_contri_applicant") or 0,
-                revised_contri_applicant=m.get("revised_contri_applicant"),
-                initial_grant_from_ttdf=m.get("initial_grant_from_ttdf"),
-                revised_grant_from_ttdf=m.get("revised_grant_from_ttdf"),
-                created_by=user,
-            )
-            received_ids.add(str(new_milestone.id))
-    
-    # Optionally DELETE milestones not present anymore (for PATCH, not for POST)
-    to_delete = [m for mid, m in existing_milestones.items() if mid not in received_ids]
-    for milestone in to_delete:
-        milestone.delete()
+    rows = []
+    for m in milestones_data:
+        row = {field: m.get(field) for field in MILESTONE_FIELDS if m.get(field)}
+        row['id'] = m.get("id")
+        rows.append(row)
+
+    def create_defaults(idx):
+        m = milestones_data[idx]
+        return {
+            "title": f"Milestone {idx+1}",
+            "description": "",
+            "time_required": 0,
+            "grant_from_ttdf": 0,
+            "initial_contri_applicant": 0,
+            "revised_time_required": m.get("revised_time_required"),
+            "revised_contri_applicant": m.get("revised_contri_applicant"),
+            "initial_grant_from_ttdf": m.get("initial_grant_from_ttdf"),
+            "revised_grant_from_ttdf": m.get("revised_grant_from_ttdf"),
+        }
+
+    return sync_milestones(form_submission, rows, user=user, create_defaults=create_defaults)
 
 
 # class FormSubmissionViewSet(viewsets.ModelViewSet): 
@@ -360,7 +350,6 @@ class FormSubmissionViewSet(viewsets.ModelViewSet):
             # Optional: handle milestones if needed
             milestones = request.data.get("milestones")
             if milestones and isinstance(milestones, list):
-                instance.milestones.all().delete()
                 save_milestones_for_submission(submission, milestones, request.user)
             return Response(
                 {
@@ -440,7 +429,8 @@ class FormSubmissionViewSet(viewsets.ModelViewSet):
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from collections import defaultdict
+from django.db.models import Count
+from auth_service.streaming import JSONStream, stream_chunk_size, streaming_json_response, wants_stream
 from .models import FormSubmission
 
 class ProposalVillageStatsAPIView(APIView):
@@ -448,6 +438,7 @@ class ProposalVillageStatsAPIView(APIView):
     API to get:
         - total_proposals
         - per_village stats (village code, label, count, proposals with id/service/template)
+    ``?stream=true`` streams the per-village proposal lists (see auth_service/streaming.py).
     """
     def get(self, request):
         # Only proposals where proposed_village is set
@@ -459,37 +450,46 @@ class ProposalVillageStatsAPIView(APIView):
             .exclude(proposed_village__exact="")
         )
 
-        total_proposals = queryset.count()
-
         # Get the display names for village choices
         village_field = FormSubmission._meta.get_field('proposed_village')
         village_map = dict(village_field.choices)
 
-        # Collect proposals per village code
-        per_village_data = defaultdict(list)
-        for proposal in queryset:
-            per_village_data[proposal.proposed_village].append(proposal)
+        # Counts per village code in one grouped query; the proposals of each
+        # village are then read one village at a time
+        counts = dict(
+            queryset.order_by().values_list('proposed_village').annotate(n=Count('id'))
+        )
+        total_proposals = sum(counts.values())
+        villages = sorted(
+            ((code, village_map.get(code, code) or "Unknown", n) for code, n in counts.items()),
+            key=lambda village: village[1] or "",
+        )
 
+        stream = wants_stream(request)
         results = []
-        for village_code, proposals in per_village_data.items():
-            display_name = village_map.get(village_code, village_code) or "Unknown"
+        for village_code, display_name, count in villages:
+            proposals = (
+                {
+                    "proposal_id": p['proposal_id'],
+                    "service_name": p['service__name'] or "",
+                    "template_title": p['template__title'] or "",
+                    "status": p['status'],
+                }
+                for p in queryset.filter(proposed_village=village_code)
+                .values('proposal_id', 'service__name', 'template__title', 'status')
+                .iterator(chunk_size=stream_chunk_size())
+            )
             results.append({
                 "village": village_code,
                 "village_display": display_name,
-                "count": len(proposals),
-                "proposals": [
-                    {
-                        "proposal_id": p.proposal_id,
-                        "service_name": getattr(p.service, "name", ""),
-                        "template_title": getattr(p.template, "title", ""),
-                        "status": p.status,
-                    } for p in proposals
-                ]
+                "count": count,
+                "proposals": JSONStream(proposals) if stream else list(proposals),
             })
 
-        results = sorted(results, key=lambda x: x['village_display'] or "")
-
-        return Response({
+        document = {
             "total_proposals": total_proposals,
             "per_village": results,
-        })
+        }
+        if stream:
+            return streaming_json_response(document)
+        return Response(document)
@@ -0,0 +1,41 @@
+# jobs/management/commands/run_jobs.py
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.registry import run_pending, requeue_stale
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (PDF generation, deferred recomputation, ...)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process due jobs once and exit')
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--sleep', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--name', action='append', dest='names', help='Only run jobs with this name (repeatable)')
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help='Requeue jobs stuck in RUNNING for this many seconds',
+        )
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(seconds=options['stale_after'])
+        self.stdout.write('Job worker started')
+        try:
+            while True:
+                requeued = requeue_stale(stale_after)
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale jobs'))
+
+                succeeded, failed = run_pending(limit=options['batch_size'], names=options['names'])
+                if succeeded or failed:
+                    self.stdout.write(f'Processed jobs: {succeeded} succeeded, {failed} failed')
+
+                if options['once']:
+                    break
+                if not (succeeded or failed):
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write('Job worker stopped')
@@ -0,0 +1,54 @@
+# jobs/models.py
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of deferred work stored in the database.
+
+    Rows are created with ``jobs.registry.enqueue`` (usually inside the same
+    transaction as the data they refer to) and executed by
+    ``manage.py run_jobs``.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100, db_index=True)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    dedupe_key = models.CharField(
+        max_length=255, blank=True, null=True, db_index=True,
+        help_text="While a job with this key is pending, enqueueing the same key is a no-op"
+    )
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [models.Index(fields=['status', 'run_at'])]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    def backoff(self, base_seconds=30):
+        """Exponential retry delay: 30s, 60s, 120s, ..."""
+        return timedelta(seconds=base_seconds * (2 ** max(self.attempts - 1, 0)))
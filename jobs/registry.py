@@ -0,0 +1,146 @@
+# jobs/registry.py
+"""
+Job handler registry and the enqueue/run API.
+
+Apps declare handlers in a ``tasks.py`` module::
+
+    from jobs.registry import register
+
+    @register('dynamic_form.generate_pdf', on_failure=mark_pdf_failed)
+    def generate_pdf(payload):
+        ...
+
+and enqueue work with ``enqueue('dynamic_form.generate_pdf', {...})``.
+"""
+import logging
+import traceback
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+class JobHandler:
+    def __init__(self, func, on_failure=None, max_attempts=5):
+        self.func = func
+        self.on_failure = on_failure
+        self.max_attempts = max_attempts
+
+
+def register(name, on_failure=None, max_attempts=5):
+    """Register ``func(payload)`` as the handler for jobs called ``name``."""
+    def decorator(func):
+        _handlers[name] = JobHandler(func, on_failure=on_failure, max_attempts=max_attempts)
+        return func
+    return decorator
+
+
+def get_handler(name):
+    return _handlers.get(name)
+
+
+def autodiscover():
+    autodiscover_modules('tasks')
+
+
+def enqueue(name, payload=None, dedupe_key=None, run_at=None, max_attempts=None):
+    """
+    Create a pending job. Call inside the caller's transaction so the job only
+    becomes visible to workers once the data it refers to is committed.
+    """
+    if dedupe_key:
+        existing = Job.objects.filter(dedupe_key=dedupe_key, status=Job.PENDING).first()
+        if existing:
+            return existing
+
+    handler = _handlers.get(name)
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        dedupe_key=dedupe_key,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or (handler.max_attempts if handler else 5),
+    )
+
+
+def claim(job):
+    """Atomically move a pending job to running. Returns False if another worker won."""
+    return bool(
+        Job.objects.filter(pk=job.pk, status=Job.PENDING)
+        .update(status=Job.RUNNING, locked_at=timezone.now(), attempts=F('attempts') + 1)
+    )
+
+
+def run_job(job):
+    """Execute one claimed job and record the outcome."""
+    job.refresh_from_db()
+    handler = get_handler(job.name)
+    if handler is None:
+        _finish(job, Job.FAILED, f"No handler registered for '{job.name}'")
+        return False
+
+    try:
+        with transaction.atomic():
+            handler.func(job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Job %s failed (attempt %s/%s)", job, job.attempts, job.max_attempts)
+        if job.attempts < job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.PENDING,
+                locked_at=None,
+                run_at=timezone.now() + job.backoff(),
+                last_error=error,
+            )
+        else:
+            _finish(job, Job.FAILED, error)
+            if handler.on_failure:
+                try:
+                    handler.on_failure(job.payload)
+                except Exception:
+                    logger.exception("on_failure hook for job %s raised", job)
+        return False
+
+    _finish(job, Job.DONE)
+    return True
+
+
+def _finish(job, status, error=None):
+    Job.objects.filter(pk=job.pk).update(
+        status=status,
+        locked_at=None,
+        finished_at=timezone.now(),
+        last_error=error,
+    )
+
+
+def run_pending(limit=20, names=None):
+    """Claim and run up to ``limit`` due jobs. Returns (succeeded, failed)."""
+    due = Job.objects.filter(status=Job.PENDING, run_at__lte=timezone.now())
+    if names:
+        due = due.filter(name__in=names)
+
+    succeeded = failed = 0
+    for job in due.order_by('run_at', 'id')[:limit]:
+        if not claim(job):
+            continue
+        if run_job(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def requeue_stale(older_than):
+    """Return jobs left RUNNING by a crashed worker to the queue."""
+    cutoff = timezone.now() - older_than
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(
+        status=Job.PENDING, locked_at=None
+    )
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:16
+
+import documents.storage
+import milestones.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('milestones', '0008_alter_milestone_funds_requested_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='milestonedocument',
+            name='assets',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to=milestones.models.upload_to_assets),
+        ),
+        migrations.AlterField(
+            model_name='milestonedocument',
+            name='mcr',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to=milestones.models.upload_to_mcr),
+        ),
+        migrations.AlterField(
+            model_name='milestonedocument',
+            name='mpr',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to=milestones.models.upload_to_mpr),
+        ),
+        migrations.AlterField(
+            model_name='milestonedocument',
+            name='uc',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to=milestones.models.upload_to_uc),
+        ),
+        migrations.AlterField(
+            model_name='submilestonedocument',
+            name='assets',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to='submilestones/assets/'),
+        ),
+        migrations.AlterField(
+            model_name='submilestonedocument',
+            name='mcr',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to='submilestones/mcr/'),
+        ),
+        migrations.AlterField(
+            model_name='submilestonedocument',
+            name='mpr',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to='submilestones/mpr/'),
+        ),
+        migrations.AlterField(
+            model_name='submilestonedocument',
+            name='uc',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to='submilestones/uc/'),
+        ),
+    ]
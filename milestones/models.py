@@ -8,6 +8,8 @@ import json
 from django.core.serializers.json import DjangoJSONEncoder
 import datetime
 
+from documents.storage import content_addressed_storage
+
 
 
 def service_based_upload_path(subfolder):
@@ -229,7 +231,8 @@ class Milestone(models.Model):
     import json
     from django.core.serializers.json import DjangoJSONEncoder
 
-    def save_snapshot_to_history(self):
+    def history_snapshot(self):
+        """JSON-safe dict stored in MilestoneHistory.snapshot."""
         data = {
         "proposal_id": self.proposal.proposal_id if self.proposal and self.proposal.proposal_id else None,
         "proposal_pk": str(self.proposal.id) if self.proposal and self.proposal.id else None,
@@ -250,9 +253,7 @@ class Milestone(models.Model):
         "updated_at": self.updated_at.isoformat() if self.updated_at else None,
     }
         json_snapshot = json.dumps(data, cls=DjangoJSONEncoder)
-        safe_data = json.loads(json_snapshot)
-        from .models import MilestoneHistory
-        MilestoneHistory.objects.create(milestone=self, snapshot=safe_data)
+        return json.loads(json_snapshot)
 
 
 
@@ -263,14 +264,14 @@ class DocumentStatus(models.TextChoices):
 
 class MilestoneDocument(models.Model):
     milestone = models.ForeignKey(Milestone, on_delete=models.CASCADE, related_name='documents')
-    mpr = models.FileField(upload_to=upload_to_mpr, null=True, blank=True)
+    mpr = models.FileField(upload_to=upload_to_mpr, storage=content_addressed_storage, null=True, blank=True)
     mpr_for_month = models.DateField(null=True, blank=True, help_text="Month this MPR covers (any date in the target month)")
     mpr_status = models.CharField(max_length=10, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
-    mcr = models.FileField(upload_to=upload_to_mcr, null=True, blank=True)
+    mcr = models.FileField(upload_to=upload_to_mcr, storage=content_addressed_storage, null=True, blank=True)
     mcr_status = models.CharField(max_length=10, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
-    uc = models.FileField(upload_to=upload_to_uc, null=True, blank=True)
+    uc = models.FileField(upload_to=upload_to_uc, storage=content_addressed_storage, null=True, blank=True)
     uc_status = models.CharField(max_length=10, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
-    assets = models.FileField(upload_to=upload_to_assets, null=True, blank=True)
+    assets = models.FileField(upload_to=upload_to_assets, storage=content_addressed_storage, null=True, blank=True)
     assets_status = models.CharField(max_length=10, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     remarks = models.TextField(blank=True, null=True, help_text="Additional remarks for milestone documents")
@@ -306,14 +307,14 @@ class SubMilestone(models.Model):
 
 class SubMilestoneDocument(models.Model):
     submilestone = models.ForeignKey(SubMilestone, on_delete=models.CASCADE, related_name='documents')
-    mpr = models.FileField(upload_to='submilestones/mpr/', null=True, blank=True)
+    mpr = models.FileField(upload_to='submilestones/mpr/', storage=content_addressed_storage, null=True, blank=True)
     mpr_for_month = models.DateField(null=True, blank=True, help_text="Month this MPR covers (any date in the target month)")
     mpr_status = models.CharField(max_length=10, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
-    mcr = models.FileField(upload_to='submilestones/mcr/', null=True, blank=True)
+    mcr = models.FileField(upload_to='submilestones/mcr/', storage=content_addressed_storage, null=True, blank=True)
     mcr_status = models.CharField(max_length=10, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
-    uc = models.FileField(upload_to='submilestones/uc/', null=True, blank=True)
+    uc = models.FileField(upload_to='submilestones/uc/', storage=content_addressed_storage, null=True, blank=True)
     uc_status = models.CharField(max_length=10, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
-    assets = models.FileField(upload_to='submilestones/assets/', null=True, blank=True)
+    assets = models.FileField(upload_to='submilestones/assets/', storage=content_addressed_storage, null=True, blank=True)
     assets_status = models.CharField(max_length=10, choices=DocumentStatus.choices, default=DocumentStatus.PENDING)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     remarks = models.TextField(blank=True, null=True, help_text="Document description/remarks for submilestone documents")
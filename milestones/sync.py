@@ -0,0 +1,163 @@
+# milestones/sync.py
+"""
+Diff-and-upsert of a proposal's milestones.
+
+``sync_milestones(proposal, rows)`` matches the incoming rows to the
+proposal's milestones by ``id`` and writes the difference with a fixed
+number of queries: one ``bulk_create`` for rows without a (known) id, one
+``bulk_update`` for rows whose values actually changed, one ``delete()``
+for milestones missing from ``rows`` and one ``bulk_create`` of
+MilestoneHistory snapshots. Rows that match what is stored are not written.
+
+bulk_create/bulk_update send no model signals. Instead of one audit entry
+and one tracker refresh per milestone, the sync records a single audit
+entry on the proposal and sends ``milestones_synced`` once; dashboard
+refreshes the proposal's tracker snapshot and response cache from it.
+Deleted milestones still go through the normal delete signals (audit logs
+each one) and cascade to their submilestones and documents.
+"""
+from dataclasses import dataclass, field
+
+from django.db import router, transaction
+from django.db.models.deletion import Collector
+from django.dispatch import Signal
+from django.utils import timezone
+
+from audit import changes
+from audit.middleware import get_current_user
+from audit.utils import log_bulk_change
+
+from .models import Milestone, MilestoneHistory
+
+# Sent once per sync that wrote anything: sender=Milestone, proposal, result
+milestones_synced = Signal()
+
+# Fields a row may set; anything else in a row is an error
+FIELDS = (
+    'title', 'description', 'activities', 'status', 'start_date', 'due_date',
+    'time_required', 'revised_time_required', 'funds_requested', 'grant_from_ttdf',
+    'initial_contri_applicant', 'revised_contri_applicant',
+    'initial_grant_from_ttdf', 'revised_grant_from_ttdf',
+)
+
+
+@dataclass
+class SyncResult:
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+    deleted: list = field(default_factory=list)  # pks
+
+    @property
+    def changed(self):
+        return bool(self.created or self.updated or self.deleted)
+
+    @property
+    def milestones(self):
+        """The proposal's milestones after the sync, by id."""
+        return sorted(self.created + self.updated + self.unchanged, key=lambda m: m.pk)
+
+
+def _pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean(values):
+    unknown = set(values) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown milestone fields: {', '.join(sorted(unknown))}")
+    # Same coercion the row would get when loaded back (str -> date, 3.0 -> 3, ...)
+    return {name: Milestone._meta.get_field(name).to_python(value) for name, value in values.items()}
+
+
+def sync_milestones(proposal, rows, user=None, create_defaults=None, delete_missing=True):
+    """
+    Make the milestones of ``proposal`` match ``rows``.
+
+    Each row is a dict of FIELDS plus an optional ``id``. Rows with the id
+    of one of the proposal's milestones update only the fields they
+    contain; other rows create a milestone from ``create_defaults(index)``
+    (if given) overlaid with the row. With ``delete_missing`` milestones
+    not named by any row are deleted. Returns a SyncResult.
+    """
+    user = user or get_current_user()
+    if user is not None and not user.is_authenticated:
+        user = None
+    result = SyncResult()
+
+    with transaction.atomic():
+        # Through the related manager every milestone has .proposal cached
+        existing = {m.pk: m for m in proposal.milestones.all()}
+        matched = {}
+        dirty = set()  # pks of matched milestones with a changed value
+        changed_fields = set()
+        for index, row in enumerate(rows):
+            row = dict(row)
+            pk = _pk(row.pop('id', None))
+            values = _clean(row)
+            milestone = existing.get(pk)
+            if milestone is None:
+                defaults = _clean(create_defaults(index)) if create_defaults else {}
+                milestone = Milestone(proposal=proposal, created_by=user, **{**defaults, **values})
+                changes.forget(milestone)  # constructor values aren't a before-image
+                result.created.append(milestone)
+                continue
+            matched[pk] = milestone
+            for name, value in values.items():
+                if getattr(milestone, name) != value:
+                    setattr(milestone, name, value)
+                    changed_fields.add(name)
+                    dirty.add(pk)
+
+        now = timezone.now()
+        audit = {}
+        for pk, milestone in matched.items():
+            if pk not in dirty:
+                result.unchanged.append(milestone)
+                continue
+            # Only for the audit entry; it covers just the audited fields
+            diff = changes.diff(milestone)
+            if diff:
+                audit.setdefault('updated', {})[str(pk)] = diff
+            if user is not None:
+                milestone.updated_by = user
+            milestone.updated_at = now  # auto_now isn't applied by bulk_update
+            result.updated.append(milestone)
+
+        if delete_missing:
+            result.deleted = sorted(set(existing) - set(matched))
+            if result.deleted:
+                audit['deleted'] = {str(pk): existing[pk].title for pk in result.deleted}
+                # QuerySet.delete() would load the rows again (and their proposal
+                # for every audit repr); collect the instances we hold instead.
+                # origin=proposal makes the per-milestone tracker handlers step
+                # aside, the milestones_synced receiver recomputes once.
+                collector = Collector(using=router.db_for_write(Milestone), origin=proposal)
+                collector.collect([existing[pk] for pk in result.deleted])
+                collector.delete()
+        else:
+            result.unchanged += [m for pk, m in existing.items() if pk not in matched]
+
+        if result.updated:
+            Milestone.objects.bulk_update(
+                result.updated, sorted(changed_fields) + ['updated_by', 'updated_at']
+            )
+        if result.created:
+            Milestone.objects.bulk_create(result.created)
+            audit['created'] = {str(m.pk): changes.diff(m) for m in result.created}
+
+        written = result.created + result.updated
+        if written:
+            MilestoneHistory.objects.bulk_create(
+                MilestoneHistory(milestone=m, snapshot=m.history_snapshot()) for m in written
+            )
+            for milestone in written:
+                changes.capture(milestone)
+
+        if result.changed:
+            log_bulk_change(user, proposal, {'milestones': audit})
+            milestones_synced.send(sender=Milestone, proposal=proposal, result=result)
+    return result
@@ -1,9 +1,17 @@
 # notifications/admin.py
 from django.contrib import admin
-from .models import Notification
+from .models import EmailOutbox, Notification
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ('recipient', 'message', 'notification_type', 'event_id', 'created_at', 'is_read')
 
     list_filter = ('is_read', 'created_at')
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'to', 'status', 'attempts', 'run_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('created_at', 'sent_at', 'locked_at', 'last_error')
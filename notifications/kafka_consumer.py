@@ -1,10 +1,13 @@
 import json
 import logging
+import os
 import time
-from kafka import KafkaConsumer
-from kafka.errors import KafkaError
+from collections import namedtuple
+from dataclasses import dataclass
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, InterfaceError, OperationalError, transaction
 from .models import Notification
 
 logger = logging.getLogger(__name__)
@@ -13,73 +16,337 @@ User = get_user_model()
 KAFKA_TOPIC = 'user_events'
 KAFKA_BOOTSTRAP_SERVERS = ['localhost:9092']
 
-def process_message(message):
+# Database errors worth retrying as a whole batch (connection lost, locked);
+# anything else is taken to be caused by a record and the batch is split.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+
+@dataclass
+class BatchStats:
+    received: int = 0
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    unknown_users: int = 0
+    dead_lettered: int = 0
+    seconds: float = 0.0
+
+    def add(self, other):
+        for name in ('received', 'created', 'duplicates', 'invalid', 'unknown_users', 'dead_lettered', 'seconds'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    @property
+    def rate(self):
+        """Messages handled per second."""
+        return self.received / self.seconds if self.seconds else 0.0
+
+
+def _parse(message, stats):
     try:
         data = json.loads(message.value.decode('utf-8'))
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError) as e:
         logger.error("JSON decode error: %s", e)
-        return
-
-    event_id = data.get('event_id')
-    user_id = data.get('user_id')
-    message_text = data.get('message')
-    notification_type = data.get('notification_type', 'general')
+        stats.invalid += 1
+        return None
 
-    if not (event_id and user_id and message_text):
+    if not isinstance(data, dict) or not (data.get('event_id') and data.get('user_id') and data.get('message')):
         logger.error("Missing required fields in message: %s", data)
-        return
-
-    if Notification.objects.filter(event_id=event_id).exists():
-        logger.info("Duplicate event_id %s, skipping message", event_id)
-        return
-    
+        stats.invalid += 1
+        return None
     try:
-        recipient = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        logger.error("User with id %s does not exist", user_id)
-        return
+        data['user_id'] = int(data['user_id'])
+    except (TypeError, ValueError):
+        logger.error("Invalid user_id in message: %s", data)
+        stats.invalid += 1
+        return None
+    data['event_id'] = str(data['event_id'])
+    return data
 
-    try:
-        Notification.objects.create(
-            event_id=event_id,
-            recipient=recipient,
-            message=message_text,
-            notification_type=notification_type
+
+def process_batch(messages):
+    """
+    Turn a batch of records into Notifications with a fixed number of queries:
+    one IN query for already-seen event_ids, one for the recipients and one
+    bulk insert (see _insert for another consumer storing the same events
+    meanwhile). Runs in one transaction; an exception means nothing from the
+    batch was written.
+    """
+    started = time.perf_counter()
+    stats = BatchStats(received=len(messages))
+
+    events = {}
+    for message in messages:
+        data = _parse(message, stats)
+        if data is None:
+            continue
+        if data['event_id'] in events:
+            stats.duplicates += 1
+            continue
+        events[data['event_id']] = data
+
+    with transaction.atomic():
+        seen = set(
+            Notification.objects.filter(event_id__in=list(events)).values_list('event_id', flat=True)
         )
-        logger.info("Notification created for user %s, event_id %s", recipient.username, event_id)
-    except Exception as e:
-        logger.exception("Database error creating notification for event_id %s: %s", event_id, e)
+        for event_id in seen:
+            del events[event_id]
+        if seen:
+            logger.debug("Skipping %s already stored event_ids", len(seen))
+        stats.duplicates += len(seen)
+
+        user_ids = set(
+            User.objects.filter(id__in={data['user_id'] for data in events.values()}).values_list('id', flat=True)
+        )
+        notifications = []
+        for data in events.values():
+            if data['user_id'] not in user_ids:
+                logger.error("User with id %s does not exist", data['user_id'])
+                stats.unknown_users += 1
+                continue
+            notifications.append(Notification(
+                event_id=data['event_id'],
+                recipient_id=data['user_id'],
+                message=data['message'],
+                notification_type=data.get('notification_type', 'general'),
+            ))
+        stats.created = _insert(notifications, stats)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def _insert(notifications, stats):
+    """
+    Insert ``notifications`` and return how many rows were written. A plain
+    insert rather than ``ignore_conflicts``, which can't report what it
+    skipped: if another consumer stored some of these event_ids since the
+    duplicate check, they are counted as duplicates and the rest is retried.
+    """
+    while notifications:
+        try:
+            with transaction.atomic():
+                Notification.objects.bulk_create(notifications)
+            return len(notifications)
+        except IntegrityError:
+            taken = set(
+                Notification.objects.filter(event_id__in=[n.event_id for n in notifications])
+                .values_list('event_id', flat=True)
+            )
+            if not taken:
+                raise  # not a duplicate event_id
+            stats.duplicates += len(taken)
+            notifications = [n for n in notifications if n.event_id not in taken]
+    return 0
+
+
+def process_messages(messages):
+    """
+    process_batch(), splitting the batch in halves when it fails so that one
+    bad record can't hold back the others. A record that still fails on its
+    own is logged as dead-lettered and skipped. TRANSIENT_ERRORS are not
+    split but raised, run_consumer retries those.
+    """
+    try:
+        return process_batch(messages)
+    except TRANSIENT_ERRORS:
+        raise
+    except Exception:
+        if len(messages) == 1:
+            message = messages[0]
+            logger.exception(
+                "Dead-lettering record at offset %s: %r", getattr(message, 'offset', None), message.value,
+            )
+            return BatchStats(received=1, dead_lettered=1)
+    half = len(messages) // 2
+    stats = process_messages(messages[:half])
+    stats.add(process_messages(messages[half:]))
+    return stats
 
 
+def process_message(message):
+    return process_messages([message])
+
+
+# ----------------------------------------------------------------------
+# Sources
+# ----------------------------------------------------------------------
+FileRecord = namedtuple('FileRecord', 'offset value')
+
+
+class FileSource:
+    """
+    Stand-in for KafkaConsumer reading one JSON event per line of ``path``,
+    for benchmarks and local runs without a broker. ``commit()`` stores the
+    position in ``<path>.offset`` so a restart resumes after the last
+    committed batch, like a consumer group would.
+    """
+    topic_partition = ('file', 0)
+
+    def __init__(self, path, from_start=False):
+        self.path = path
+        self.offset_path = f'{path}.offset'
+        self.committed = 0
+        if not from_start and os.path.exists(self.offset_path):
+            with open(self.offset_path) as fh:
+                self.committed = int(fh.read().strip() or 0)
+        self.position = self.committed
+        self._file = open(path, 'rb')
+        for _ in range(self.committed):
+            self._file.readline()
+
+    def poll(self, timeout_ms=0, max_records=500):
+        records = []
+        while len(records) < max_records:
+            line = self._file.readline()
+            if not line:
+                break
+            records.append(FileRecord(self.position, line.rstrip(b'\n')))
+            self.position += 1
+        return {self.topic_partition: records} if records else {}
+
+    def seek(self, partition, offset):
+        self._file.seek(0)
+        for _ in range(offset):
+            self._file.readline()
+        self.position = offset
+
+    def commit(self):
+        self.committed = self.position
+        with open(self.offset_path, 'w') as fh:
+            fh.write(str(self.committed))
+
+    def close(self):
+        self._file.close()
+
 
-def run_consumer():
-    consumer = KafkaConsumer(
+def write_sample_events(path, count, user_ids, duplicate_every=20):
+    """
+    Write ``count`` events for ``user_ids`` to ``path`` for FileSource; every
+    ``duplicate_every``-th event repeats an earlier event_id.
+    """
+    user_ids = list(user_ids)
+    run = int(time.time())
+    with open(path, 'w') as fh:
+        for n in range(count):
+            event = n - 1 if duplicate_every and n and n % duplicate_every == 0 else n
+            fh.write(json.dumps({
+                'event_id': f'sample-{run}-{event}',
+                'user_id': user_ids[n % len(user_ids)],
+                'message': f'Sample event {event}',
+                'notification_type': 'general',
+            }) + '\n')
+
+
+def _kafka_consumer():
+    from kafka import KafkaConsumer
+
+    return KafkaConsumer(
         KAFKA_TOPIC,
         bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
         auto_offset_reset='earliest',
         enable_auto_commit=False,  # Disable auto commit for manual control.
         group_id='notification_service_group'
     )
-    logger.info("Kafka consumer started for topic: %s", KAFKA_TOPIC)
+
+
+def _kafka_errors():
+    from kafka.errors import KafkaError
+
+    return (KafkaError,)
+
+
+def _collect(consumer, batch_size, linger_ms, broker_errors=()):
+    """
+    Poll until ``batch_size`` records arrived or ``linger_ms`` passed. A
+    broker error after some records arrived ends the batch with what was
+    collected: the consumer position is already past those records, so
+    dropping them here would let the next commit skip them.
+    """
+    batch = {}
+    count = 0
+    deadline = time.monotonic() + linger_ms / 1000
+    while count < batch_size:
+        remaining_ms = max(int((deadline - time.monotonic()) * 1000), 0)
+        try:
+            msg_pack = consumer.poll(timeout_ms=remaining_ms, max_records=batch_size - count)
+        except broker_errors as ke:
+            if not batch:
+                raise
+            logger.error("Kafka error while filling a batch, processing the %s records received: %s", count, ke)
+            break
+        for tp, messages in msg_pack.items():
+            batch.setdefault(tp, []).extend(messages)
+            count += len(messages)
+        if not msg_pack and remaining_ms == 0:
+            break
+        if not msg_pack and isinstance(consumer, FileSource):
+            break  # end of file; nothing more will arrive
+    return batch
+
+
+def run_consumer(batch_size=None, linger_ms=None, source=None, stop_when_idle=False, report=None,
+                 max_retries=None, retry_delay=5):
+    """
+    Consume in batches: poll up to ``batch_size`` records (waiting at most
+    ``linger_ms`` for a batch to fill), write them with process_messages()
+    and commit the offsets once that succeeded. Records that fail on their
+    own are dead-lettered and committed past. On a transient database error
+    the partitions are rewound to the start of the batch and it is retried
+    up to ``max_retries`` times, then the error is raised with the offsets
+    uncommitted. ``report(batch_stats, total_stats)`` is called after every batch.
+    """
+    batch_size = batch_size or getattr(settings, 'KAFKA_CONSUMER_BATCH_SIZE', 500)
+    linger_ms = linger_ms if linger_ms is not None else getattr(settings, 'KAFKA_CONSUMER_LINGER_MS', 1000)
+    if max_retries is None:
+        max_retries = getattr(settings, 'KAFKA_CONSUMER_MAX_RETRIES', 5)
+    consumer = source or _kafka_consumer()
+    broker_errors = _kafka_errors() if source is None else ()
+    total = BatchStats()
+    attempts = 0
+    logger.info("Notification consumer started (batch_size=%s, linger_ms=%s)", batch_size, linger_ms)
     try:
         while True:
             try:
-                # Poll messages in batches with a timeout (e.g., 5 seconds) and limit to 10 records per batch.
-                msg_pack = consumer.poll(timeout_ms=5000, max_records=10)
+                msg_pack = _collect(consumer, batch_size, linger_ms, broker_errors)
                 if not msg_pack:
+                    if stop_when_idle:
+                        break
                     continue
 
-                for tp, messages in msg_pack.items():
-                    for message in messages:
-                        process_message(message)
-                # Commit offsets after processing the batch successfully.
+                messages = [message for records in msg_pack.values() for message in records]
+                try:
+                    stats = process_messages(messages)
+                except TRANSIENT_ERRORS:
+                    attempts += 1
+                    if attempts > max_retries:
+                        logger.error("Batch of %s messages failed %s times; giving up", len(messages), attempts)
+                        raise
+                    logger.exception(
+                        "Batch of %s messages failed (attempt %s/%s); rewinding",
+                        len(messages), attempts, max_retries,
+                    )
+                    for tp, records in msg_pack.items():
+                        consumer.seek(tp, records[0].offset)
+                    time.sleep(retry_delay)
+                    continue
+                attempts = 0
+                # Commit offsets only after the batch is stored.
                 consumer.commit()
-            except KafkaError as ke:
+                total.add(stats)
+                if report:
+                    report(stats, total)
+                logger.info(
+                    "Stored batch: %s received, %s created, %s duplicates, %s invalid, %s unknown users, "
+                    "%s dead-lettered (%.0f msg/s, %.0f msg/s overall)",
+                    stats.received, stats.created, stats.duplicates, stats.invalid, stats.unknown_users,
+                    stats.dead_lettered,
+                    stats.rate, total.rate,
+                )
+            except broker_errors as ke:
                 logger.error("Kafka error encountered: %s", ke)
                 time.sleep(5)  # Back off before retrying.
-            except Exception as e:
-                logger.exception("Unexpected error during message processing: %s", e)
     except KeyboardInterrupt:
         logger.info("Consumer interrupted by user")
     finally:
         consumer.close()
+    return total
@@ -0,0 +1,57 @@
+# notifications/management/commands/deliver_emails.py
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import deliver_batch, outbox_stats, requeue_stale
+
+
+class Command(BaseCommand):
+    help = 'Send queued notification emails from the outbox, a batch per SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the due emails once and exit')
+        parser.add_argument('--batch-size', type=int, default=100, help='Emails sent per connection')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Seconds to wait when the outbox is empty')
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help='Requeue emails stuck in SENDING for this many seconds',
+        )
+        parser.add_argument('--stats', action='store_true', help='Print outbox counts and exit')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            for key, value in outbox_stats().items():
+                self.stdout.write(f'{key}: {value}')
+            return
+
+        stale_after = timedelta(seconds=options['stale_after'])
+        totals = {'sent': 0, 'retried': 0, 'failed': 0, 'seconds': 0.0}
+        self.stdout.write('Email worker started')
+        try:
+            while True:
+                requeued = requeue_stale(stale_after)
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale emails'))
+
+                result = deliver_batch(limit=options['batch_size'])
+                if result.processed:
+                    self.stdout.write(
+                        f'Batch: {result.sent} sent, {result.retried} to retry, {result.failed} failed '
+                        f'in {result.seconds:.2f}s ({result.rate:.1f}/s)'
+                    )
+                    for key in totals:
+                        totals[key] += getattr(result, key)
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write('Email worker stopped')
+
+        rate = totals['sent'] / totals['seconds'] if totals['seconds'] else 0.0
+        self.stdout.write(
+            f"Total: {totals['sent']} sent, {totals['retried']} to retry, {totals['failed']} failed "
+            f"in {totals['seconds']:.2f}s ({rate:.1f}/s)"
+        )
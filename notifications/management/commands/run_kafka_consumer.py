@@ -1,9 +1,40 @@
-from django.core.management.base import BaseCommand
-from notifications.kafka_consumer import run_consumer
+from django.core.management.base import BaseCommand, CommandError
+from notifications.kafka_consumer import FileSource, run_consumer, write_sample_events
 
 class Command(BaseCommand):
     help = 'Run Kafka consumer for notifications'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Records per batch (default KAFKA_CONSUMER_BATCH_SIZE)')
+        parser.add_argument('--linger-ms', type=int, help='Max wait for a batch to fill (default KAFKA_CONSUMER_LINGER_MS)')
+        parser.add_argument('--max-retries', type=int,
+                            help='Retries of a batch after a database error (default KAFKA_CONSUMER_MAX_RETRIES)')
+        parser.add_argument('--file', help='Read JSON-lines events from this file instead of Kafka')
+        parser.add_argument('--from-start', action='store_true', help='With --file: ignore the stored offset')
+        parser.add_argument('--write-sample', type=int, metavar='N',
+                            help='With --file: write N sample events for existing users and exit')
+
     def handle(self, *args, **options):
-        self.stdout.write("Starting Kafka consumer...")
-        run_consumer()
+        path = options['file']
+        if options['write_sample']:
+            if not path:
+                raise CommandError('--write-sample needs --file')
+            from django.contrib.auth import get_user_model
+            user_ids = list(get_user_model().objects.values_list('pk', flat=True)[:1000])
+            if not user_ids:
+                raise CommandError('No users to address the sample events to')
+            write_sample_events(path, options['write_sample'], user_ids)
+            self.stdout.write(f"Wrote {options['write_sample']} events to {path}")
+            return
+
+        source = FileSource(path, from_start=options['from_start']) if path else None
+        self.stdout.write(f"Starting {'file' if path else 'Kafka'} consumer...")
+        total = run_consumer(
+            batch_size=options['batch_size'], linger_ms=options['linger_ms'],
+            source=source, stop_when_idle=bool(path), max_retries=options['max_retries'],
+        )
+        self.stdout.write(
+            f"{total.received} received, {total.created} created, {total.duplicates} duplicates, "
+            f"{total.invalid} invalid, {total.unknown_users} unknown users, {total.dead_lettered} dead-lettered "
+            f"in {total.seconds:.2f}s ({total.rate:.0f} msg/s)"
+        )
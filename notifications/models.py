@@ -1,6 +1,9 @@
 # notifications/models.py
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class Notification(models.Model):
     event_id = models.CharField(max_length=100, unique=True, null=True, blank=True)  # For idempotency (Kafka)
@@ -17,3 +20,50 @@ class Notification(models.Model):
     def __str__(self):
         return f"Notification for {self.recipient} at {self.created_at}"
 
+
+class EmailOutbox(models.Model):
+    """
+    An email waiting to be sent.
+
+    Rows are written with ``notifications.outbox.queue_email`` inside the same
+    transaction as the change they announce, so nothing is sent for a rolled
+    back change and a slow or failing SMTP server never blocks the request.
+    ``manage.py deliver_emails`` sends them in batches.
+    """
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.JSONField(default=list)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [models.Index(fields=['status', 'run_at'])]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+    def backoff(self, base_seconds=60):
+        """Exponential retry delay: 1, 2, 4, 8... minutes."""
+        return timedelta(seconds=base_seconds * (2 ** max(self.attempts - 1, 0)))
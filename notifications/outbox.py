@@ -0,0 +1,150 @@
+# notifications/outbox.py
+"""
+Transactional email outbox.
+
+``queue_email()`` only inserts an EmailOutbox row, inside whatever
+transaction the caller is in. ``deliver_batch()`` (run by
+``manage.py deliver_emails``) claims up to ``limit`` due rows, sends them over
+a single connection of the configured EMAIL_BACKEND and records the outcome.
+A failed row is retried with exponential backoff until ``max_attempts``.
+If the connection itself cannot be opened, the whole batch is put back.
+
+With ``EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend``
+the messages are written under EMAIL_FILE_PATH instead of being sent,
+which is handy for local testing.
+"""
+import logging
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def queue_email(subject, body, to, from_email=None, max_attempts=5):
+    """Add an email to the outbox. Call inside the caller's transaction."""
+    if isinstance(to, str):
+        to = [to]
+    return EmailOutbox.objects.create(
+        subject=subject,
+        body=body,
+        to=list(to),
+        from_email=from_email or getattr(settings, 'NOTIFICATION_FROM_EMAIL', settings.DEFAULT_FROM_EMAIL),
+        max_attempts=max_attempts,
+    )
+
+
+@dataclass
+class BatchResult:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def processed(self):
+        return self.sent + self.retried + self.failed
+
+    @property
+    def rate(self):
+        """Messages sent per second."""
+        return self.sent / self.seconds if self.seconds else 0.0
+
+
+def claim_batch(limit):
+    """Move up to ``limit`` due rows to SENDING and return them."""
+    now = timezone.now()
+    ids = list(
+        EmailOutbox.objects.filter(status=EmailOutbox.PENDING, run_at__lte=now)
+        .order_by('run_at', 'id').values_list('pk', flat=True)[:limit]
+    )
+    if not ids:
+        return []
+    # Only rows still pending are taken; locked_at tells ours from another worker's
+    EmailOutbox.objects.filter(pk__in=ids, status=EmailOutbox.PENDING).update(
+        status=EmailOutbox.SENDING, locked_at=now, attempts=F('attempts') + 1,
+    )
+    return list(EmailOutbox.objects.filter(pk__in=ids, status=EmailOutbox.SENDING, locked_at=now))
+
+
+def _retry_or_fail(email, error, result):
+    if email.attempts < email.max_attempts:
+        EmailOutbox.objects.filter(pk=email.pk).update(
+            status=EmailOutbox.PENDING, locked_at=None,
+            run_at=timezone.now() + email.backoff(), last_error=error,
+        )
+        result.retried += 1
+    else:
+        EmailOutbox.objects.filter(pk=email.pk).update(
+            status=EmailOutbox.FAILED, locked_at=None, last_error=error,
+        )
+        result.failed += 1
+
+
+def deliver_batch(limit=100):
+    """Send one batch of due emails over a single connection."""
+    started = time.perf_counter()
+    result = BatchResult()
+    batch = claim_batch(limit)
+    if not batch:
+        return result
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.exception('Could not open the email connection; %s emails put back', len(batch))
+        for email in batch:
+            _retry_or_fail(email, f'connection: {exc}', result)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    sent_ids = []
+    try:
+        for email in batch:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email or None, email.to, connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as exc:
+                logger.warning('Email %s failed (attempt %s/%s): %s', email.pk, email.attempts, email.max_attempts, exc)
+                _retry_or_fail(email, repr(exc), result)
+            else:
+                sent_ids.append(email.pk)
+    finally:
+        connection.close()
+        if sent_ids:
+            EmailOutbox.objects.filter(pk__in=sent_ids).update(
+                status=EmailOutbox.SENT, locked_at=None, sent_at=timezone.now(), last_error=None,
+            )
+        result.sent = len(sent_ids)
+        result.seconds = time.perf_counter() - started
+    return result
+
+
+def requeue_stale(older_than):
+    """Return rows left SENDING by a crashed worker to the queue."""
+    cutoff = timezone.now() - older_than
+    return EmailOutbox.objects.filter(status=EmailOutbox.SENDING, locked_at__lt=cutoff).update(
+        status=EmailOutbox.PENDING, locked_at=None
+    )
+
+
+def outbox_stats():
+    """Row counts per status and the age in seconds of the oldest due email."""
+    counts = dict(
+        EmailOutbox.objects.order_by().values_list('status').annotate(n=Count('pk'))
+    )
+    oldest = EmailOutbox.objects.filter(status=EmailOutbox.PENDING).aggregate(oldest=Min('run_at'))['oldest']
+    lag = (timezone.now() - oldest).total_seconds() if oldest else 0.0
+    return {
+        **{status: counts.get(status, 0) for status, _ in EmailOutbox.STATUS_CHOICES},
+        'oldest_pending_seconds': round(max(lag, 0.0), 1),
+    }
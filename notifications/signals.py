@@ -1,9 +1,8 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from dynamic_form.models import ApplicationStatusHistory  
-from notifications.utils import send_notification
-from django.conf import settings
+from notifications.outbox import queue_email
+from notifications.utils import send_bulk_notification, send_notification
 from configuration.models import Service 
 from django.contrib.auth import get_user_model
 User = get_user_model()
@@ -25,15 +24,9 @@ def notify_on_status_change(sender, instance, created, **kwargs):
         )
         subject = "Application Status Update"
 
-        # Sending email using Django's send_mail function
+        # Queued in this transaction, sent by manage.py deliver_emails
         if applicant.email:
-            send_mail(
-                subject,
-                message,
-                'noreply@example.com',  # Update with your sender email
-                [applicant.email],
-                fail_silently=False,
-            )
+            queue_email(subject, message, [applicant.email])
 
         # Use the notification utility
         send_notification(
@@ -47,12 +40,12 @@ def notify_on_status_change(sender, instance, created, **kwargs):
 def notify_on_service_creation(sender, instance, created, **kwargs):
     if created:
         target_roles = ["Admin", "User", "Evaluator"]
-        notified_users = User.objects.filter(
-            roles__name__in=target_roles
-        ).distinct()
-        for user in notified_users:
-            send_notification(
-                recipient=user,
-                message=f'A new service "{instance.name}" has been created.',
-                notification_type="service_created"
-            )
\ No newline at end of file
+        recipient_ids = (
+            User.objects.filter(roles__name__in=target_roles)
+            .distinct().values_list('pk', flat=True).iterator()
+        )
+        send_bulk_notification(
+            recipient_ids,
+            message=f'A new service "{instance.name}" has been created.',
+            notification_type="service_created"
+        )
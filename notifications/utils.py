@@ -1,3 +1,5 @@
+from django.conf import settings
+
 from .models import Notification
 
 def send_notification(recipient, message, notification_type="general"):
@@ -6,3 +8,24 @@ def send_notification(recipient, message, notification_type="general"):
         message=message,
         notification_type=notification_type
     )
+
+
+def send_bulk_notification(recipient_ids, message, notification_type="general", batch_size=None):
+    """
+    One Notification per id in ``recipient_ids`` (any iterable, e.g. a
+    ``values_list('pk', flat=True)`` queryset), inserted with bulk_create in
+    chunks of NOTIFICATION_FANOUT_BATCH_SIZE. Returns the number created.
+    """
+    batch_size = batch_size or getattr(settings, 'NOTIFICATION_FANOUT_BATCH_SIZE', 1000)
+    created, chunk = 0, []
+    for recipient_id in recipient_ids:
+        chunk.append(Notification(
+            recipient_id=recipient_id, message=message, notification_type=notification_type,
+        ))
+        if len(chunk) >= batch_size:
+            Notification.objects.bulk_create(chunk)
+            created, chunk = created + len(chunk), []
+    if chunk:
+        Notification.objects.bulk_create(chunk)
+        created += len(chunk)
+    return created
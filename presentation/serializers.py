@@ -4,6 +4,7 @@ from .models import Presentation
 from tech_eval.models import TechnicalEvaluationRound
 from dynamic_form.models import FormSubmission
 from configuration.models import ScreeningCommittee
+from configuration.reference_data import reference_data
 from screening.models import ScreeningRecord
 from app_eval.models import EvaluationAssignment
 import logging
@@ -52,17 +53,26 @@ class PresentationSerializer(serializers.ModelSerializer):
             'has_passed_presentation', 'has_passed_final'
         ]
 
+    def to_representation(self, instance):
+        # The service's requirement comes from the shared reference data;
+        # Presentation.passing_requirement picks it up from here.
+        if instance.proposal_id:
+            instance._cached_passing_requirement = reference_data(self.context).passing_requirement(
+                instance.proposal.service_id
+            )
+        return super().to_representation(instance)
+
     def get_presentation_max_marks(self, obj):
         # Pull from service.passing_requirement if exists
-        req = getattr(obj.service, 'passing_requirement', None)
+        req = obj.passing_requirement
         return req.presentation_max_marks if req else None
 
     def get_min_passing_percentage(self, obj):
-        req = getattr(obj.service, 'passing_requirement', None)
+        req = obj.passing_requirement
         return req.presentation_min_passing if req else None
 
     def get_final_passing_percentage(self, obj):
-        req = getattr(obj.service, 'passing_requirement', None)
+        req = obj.passing_requirement
         return req.final_status_min_passing if req else None
 
     def get_has_passed_presentation(self, obj):
@@ -84,7 +94,7 @@ class PresentationSerializer(serializers.ModelSerializer):
                     max_marks = req.presentation_max_marks
                 else:
                     # fallback to any active requirement
-                    requirement = PassingRequirement.objects.filter(status='Active').first()
+                    requirement = reference_data(self.context).active_passing_requirement()
                     if requirement:
                         max_marks = requirement.presentation_max_marks
             except:
@@ -177,8 +187,7 @@ class EvaluatorPresentationSerializer(serializers.ModelSerializer):
  
     def get_max_marks(self, obj):
         try:
-            from app_eval.models import PassingRequirement
-            requirement = PassingRequirement.objects.filter(status='Active').first()
+            requirement = reference_data(self.context).active_passing_requirement()
             return requirement.presentation_max_marks if requirement else 50
         except:
             return 50
@@ -295,22 +304,10 @@ class PersonalInterviewSerializer(serializers.ModelSerializer):
         return any(p.final_decision == 'shortlisted' for p in presentations)
  
     def get_committeeDetails(self, obj):
-        committee = (
-            ScreeningCommittee.objects
-            .filter(service=obj.service, committee_type='administrative')
-            .first()
+        return reference_data(self.context).committee_details(
+            obj.service_id, 'administrative',
+            lambda: ScreeningRecord.objects.filter(proposal=obj).exists(),
         )
-        if not committee:
-            return None
- 
-        members = [m.user.full_name for m in committee.members.all()]
-        return {
-            'name': committee.name,
-            'head': committee.head.full_name if committee.head else None,
-            'members': members,
-            'documentUploaded': ScreeningRecord.objects.filter(proposal=obj).exists(),
-            'evaluationStopped': not committee.is_active,
-        }
  
     def get_applicationDocument(self, obj):
         field = getattr(obj, 'applicationDocument', None)
@@ -381,8 +378,7 @@ class PersonalInterviewSerializer(serializers.ModelSerializer):
        
         # Get max marks for context
         try:
-            from app_eval.models import PassingRequirement
-            requirement = PassingRequirement.objects.filter(status='Active').first()
+            requirement = reference_data(self.context).active_passing_requirement()
             max_marks = requirement.presentation_max_marks if requirement else 50
         except:
             max_marks = 50
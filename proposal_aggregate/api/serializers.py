@@ -1,18 +1,15 @@
 # proposal_aggregate/api/serializers.py
 from rest_framework import serializers
 from dynamic_form.models import FormSubmission, FieldResponse, ApplicationStatusHistory
-from app_eval.models import (
-    EvaluationAssignment, CriteriaEvaluation as AppEvalCriteriaEvaluation,
-    QuestionEvaluation, EvaluationCutoff
-)
-from configuration.models import (
-    Application as ConfigApplication,
-    ApplicationStageProgress, ScreeningResult
-)
+from app_eval.models import EvaluationAssignment, CriteriaEvaluation as AppEvalCriteriaEvaluation
+from configuration.models import ScreeningResult
+from configuration.reference_data import reference_data
 from milestones.models import Milestone, SubMilestone, FinanceRequest, PaymentClaim, FinanceSanction
 from presentation.models import Presentation
 from screening.models import ScreeningRecord, TechnicalScreeningRecord
-from tech_eval.models import TechnicalEvaluationRound, CriteriaEvaluation as TechEvalCriteriaEvaluation
+from tech_eval.models import (
+    TechnicalEvaluationRound, EvaluatorAssignment, CriteriaEvaluation as TechEvalCriteriaEvaluation
+)
 
 # --- Nested Serializers ---
 class FieldResponseSerializer(serializers.ModelSerializer):
@@ -28,13 +25,6 @@ class ApplicationStatusHistorySerializer(serializers.ModelSerializer):
         fields = ['previous_status', 'new_status', 'changed_by', 'change_date', 'comment']
 
 # Configuration nested
-class ApplicationStageProgressSerializer(serializers.ModelSerializer):
-    stage_name = serializers.CharField(source='stage.name', read_only=True)
-
-    class Meta:
-        model = ApplicationStageProgress
-        fields = ['id', 'stage', 'stage_name', 'status', 'start_date', 'completion_date', 'total_score']
-
 class ScreeningResultSerializer(serializers.ModelSerializer):
     committee_name = serializers.CharField(source='committee.name', read_only=True)
 
@@ -42,14 +32,6 @@ class ScreeningResultSerializer(serializers.ModelSerializer):
         model = ScreeningResult
         fields = ['id', 'committee', 'committee_name', 'result', 'notes', 'screened_by', 'screened_at']
 
-class ConfigApplicationSerializer(serializers.ModelSerializer):
-    stage_progress = ApplicationStageProgressSerializer(many=True, read_only=True)
-    screening_results = ScreeningResultSerializer(many=True, read_only=True)
-
-    class Meta:
-        model = ConfigApplication
-        fields = ['id', 'service', 'status', 'submitted_at', 'current_stage', 'stage_progress', 'screening_results']
-
 # AppEval nested
 class AppEvalCriteriaEvaluationSerializer(serializers.ModelSerializer):
     criteria_name = serializers.CharField(source='criteria.name', read_only=True)
@@ -58,17 +40,9 @@ class AppEvalCriteriaEvaluationSerializer(serializers.ModelSerializer):
         model = AppEvalCriteriaEvaluation
         fields = ['criteria', 'criteria_name', 'marks_given', 'comments', 'date_evaluated']
 
-class QuestionEvaluationSerializer(serializers.ModelSerializer):
-    question_name = serializers.CharField(source='question.name', read_only=True)
-
-    class Meta:
-        model = QuestionEvaluation
-        fields = ['question', 'question_name', 'marks_given', 'comments', 'date_evaluated']
-
 class EvaluationAssignmentSerializer(serializers.ModelSerializer):
     evaluator_email = serializers.EmailField(source='evaluator.email', read_only=True)
     criteria_evaluations = AppEvalCriteriaEvaluationSerializer(many=True, read_only=True)
-    question_evaluations = QuestionEvaluationSerializer(many=True, read_only=True)
 
     class Meta:
         model = EvaluationAssignment
@@ -76,14 +50,9 @@ class EvaluationAssignmentSerializer(serializers.ModelSerializer):
             'evaluator', 'evaluator_email', 'current_trl', 'expected_trl',
             'remarks', 'conflict_of_interest', 'conflict_remarks',
             'total_marks_assigned', 'evaluated_at',
-            'criteria_evaluations', 'question_evaluations',
+            'criteria_evaluations',
         ]
 
-class EvaluationCutoffSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = EvaluationCutoff
-        fields = ['cutoff_marks']
-
 # Milestones nested
 class SubMilestoneSerializer(serializers.ModelSerializer):
     class Meta:
@@ -162,25 +131,58 @@ class TechEvalCriteriaEvaluationSerializer(serializers.ModelSerializer):
         model = TechEvalCriteriaEvaluation
         fields = ['evaluation_criteria', 'criteria_name', 'marks_given', 'remarks', 'evaluated_at']
 
-class TechnicalEvaluationRoundSerializer(serializers.ModelSerializer):
+class TechEvalAssignmentSerializer(serializers.ModelSerializer):
+    evaluator_email = serializers.EmailField(source='evaluator.email', read_only=True)
     criteria_evaluations = TechEvalCriteriaEvaluationSerializer(many=True, read_only=True)
 
+    class Meta:
+        model = EvaluatorAssignment
+        fields = [
+            'evaluator', 'evaluator_email', 'current_trl', 'expected_trl',
+            'conflict_of_interest', 'is_completed', 'overall_comments',
+            'completed_at', 'criteria_evaluations',
+        ]
+
+class TechnicalEvaluationRoundSerializer(serializers.ModelSerializer):
+    evaluator_assignments = TechEvalAssignmentSerializer(many=True, read_only=True)
+
     class Meta:
         model = TechnicalEvaluationRound
         fields = [
-            'evaluated_by', 'technical_comments', 'technical_decision',
-            'evaluated_at', 'criteria_evaluations'
+            'assignment_status', 'overall_decision', 'created_at', 'completed_at',
+            'cached_average_percentage', 'evaluator_assignments'
         ]
 
+# Sections of the detail view: name -> prefetch lookups it needs.
+# ?include= / ?exclude= pick sections; unpicked ones are neither loaded nor serialized.
+SECTIONS = {
+    'responses': ('responses__field',),
+    'status_history': ('status_history',),
+    'screening_results': ('screening_results__committee',),
+    'eval_assignments': ('eval_assignments__evaluator', 'eval_assignments__criteria_evaluations__criteria'),
+    'eval_cutoff': (),
+    'screening_records': (
+        'screening_records__admin_evaluator', 'screening_records__technical_record__technical_evaluator',
+    ),
+    'technical_evaluations': (
+        'technical_evaluation_rounds__evaluator_assignments__evaluator',
+        'technical_evaluation_rounds__evaluator_assignments__criteria_evaluations__evaluation_criteria',
+    ),
+    'presentations': ('presentations',),
+    'milestones': ('milestones__submilestones', 'milestones__finance_requests__payment_claim__finance_sanction'),
+}
+
 # Master Serializer
 class ProposalDetailSerializer(serializers.ModelSerializer):
     responses = FieldResponseSerializer(many=True, read_only=True)
     status_history = ApplicationStatusHistorySerializer(many=True, read_only=True)
-    applications = ConfigApplicationSerializer(many=True, read_only=True)
+    screening_results = ScreeningResultSerializer(many=True, read_only=True)
     eval_assignments = EvaluationAssignmentSerializer(many=True, read_only=True)
-    eval_cutoff = EvaluationCutoffSerializer(read_only=True)
+    eval_cutoff = serializers.SerializerMethodField()
     screening_records = ScreeningRecordSerializer(many=True, read_only=True)
-    technical_evaluations = TechnicalEvaluationRoundSerializer(many=True, read_only=True)
+    technical_evaluations = TechnicalEvaluationRoundSerializer(
+        source='technical_evaluation_rounds', many=True, read_only=True
+    )
     presentations = PresentationSerializer(many=True, read_only=True)
     milestones = MilestoneSerializer(many=True, read_only=True)
 
@@ -189,8 +191,33 @@ class ProposalDetailSerializer(serializers.ModelSerializer):
         fields = [
             'form_id', 'proposal_id', 'status', 'contact_name', 'contact_email',
             'created_at', 'updated_at',
-            'responses', 'status_history', 'applications',
+            'responses', 'status_history', 'screening_results',
             'eval_assignments', 'eval_cutoff',
             'screening_records', 'technical_evaluations',
             'presentations', 'milestones'
         ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # context['sections']: the sections to render (default: all)
+        sections = self.context.get('sections')
+        if sections is not None:
+            for name in SECTIONS:
+                if name not in sections:
+                    self.fields.pop(name, None)
+
+    def get_eval_cutoff(self, obj):
+        cutoff = reference_data(self.context).cutoff_marks(obj.service_id)
+        return {'cutoff_marks': cutoff} if cutoff is not None else None
+
+
+class ProposalSummarySerializer(serializers.ModelSerializer):
+    """List mode: one row per proposal, no nested sections"""
+    service_name = serializers.CharField(source='service.name', read_only=True, default=None)
+
+    class Meta:
+        model = FormSubmission
+        fields = [
+            'form_id', 'proposal_id', 'status', 'subject', 'service_name',
+            'contact_name', 'contact_email', 'created_at', 'updated_at',
+        ]
@@ -1,26 +1,84 @@
 # proposal_aggregate/api/views.py
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from dynamic_form.models import FormSubmission
-from .serializers import ProposalDetailSerializer
+from .serializers import SECTIONS, ProposalDetailSerializer, ProposalSummarySerializer
+
+
+class ProposalSummaryPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+def requested_sections(request):
+    """
+    Sections named by ``?include=a,b`` (default: all) minus ``?exclude=c``.
+    Raises ValidationError for unknown names.
+    """
+    def names(param):
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    include, exclude = names('include'), names('exclude') or []
+    unknown = [name for name in (include or []) + exclude if name not in SECTIONS]
+    if unknown:
+        raise ValidationError({
+            'include': f"Unknown section(s): {', '.join(unknown)}. Available: {', '.join(SECTIONS)}"
+        })
+    selected = SECTIONS if include is None else include
+    return [name for name in SECTIONS if name in selected and name not in exclude]
+
 
 class ProposalDetailViewSet(viewsets.ReadOnlyModelViewSet):
     """
     GET /api/proposals/{proposal_id}/
-    Returns a full snapshot of a proposal across all apps.
+    Returns a snapshot of a proposal across all apps. ``?include=`` /
+    ``?exclude=`` (comma separated, see SECTIONS) pick the sections; only the
+    relations of the picked sections are prefetched.
+
+    GET /api/proposals/ lists a paginated one-row summary per proposal.
     """
-    queryset = FormSubmission.objects.all().prefetch_related(
-        'responses__field', 'status_history',
-        'applications__stage_progress', 'applications__screening_results',
-        'eval_assignments__criteria_evaluations', 'eval_assignments__question_evaluations',
-        'milestones__submilestones', 'milestones__finance_requests__payment_claim__finance_sanction',
-        'presentations',
-        'screening_records__technical_record',
-        'technical_evaluations__criteria_evaluations',
-    )
+    queryset = FormSubmission.objects.all()
     serializer_class = ProposalDetailSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = ProposalSummaryPagination
     lookup_field = 'proposal_id'
+    # Proposal IDs look like TTDF/<TEMPLATE>/<year>/<n>
+    lookup_value_regex = r'[^/]+(?:/[^/]+)*'
+
+    def get_sections(self):
+        if not hasattr(self, '_sections'):
+            self._sections = requested_sections(self.request)
+        return self._sections
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return (
+                queryset.select_related('service')
+                .only(
+                    'form_id', 'proposal_id', 'status', 'subject', 'contact_name',
+                    'contact_email', 'created_at', 'updated_at', 'service__name',
+                )
+                .order_by('-created_at')
+            )
+        lookups = [lookup for name in self.get_sections() for lookup in SECTIONS[name]]
+        return queryset.prefetch_related(*lookups)
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ProposalSummarySerializer
+        return super().get_serializer_class()
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action != 'list':
+            context['sections'] = self.get_sections()
+        return context
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('screening', '0002_alter_technicalscreeningrecord_technical_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screeningrecord',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:16
+
+import documents.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('screening', '0003_screeningrecord_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='screeningrecord',
+            name='evaluated_document',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to='screening/admin_docs/'),
+        ),
+        migrations.AlterField(
+            model_name='technicalscreeningrecord',
+            name='technical_document',
+            field=models.FileField(blank=True, null=True, storage=documents.storage.ContentAddressedStorage(), upload_to='screening/technical_screening_docs/'),
+        ),
+    ]
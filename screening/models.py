@@ -6,6 +6,8 @@ from django.db import models
 from datetime import datetime
 from django.db.models import Max
 
+from documents.storage import content_addressed_storage
+
 # link to your static‐column proposal model
 from dynamic_form.models import FormSubmission
 
@@ -45,8 +47,10 @@ class ScreeningRecord(models.Model):
     )
     admin_decision   = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     admin_remarks    = models.TextField(blank=True, null=True)
-    evaluated_document   = models.FileField(upload_to="screening/admin_docs/", null=True, blank=True)
+    evaluated_document   = models.FileField(upload_to="screening/admin_docs/", storage=content_addressed_storage, null=True, blank=True)
     admin_screened_at= models.DateTimeField(auto_now_add=True)
+    # Moves on every save (decisions are edited in place); dashboard ETags read it
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
     # once tech_screen is created, we mark this flag
     technical_evaluated = models.BooleanField(default=False)
@@ -127,7 +131,7 @@ class TechnicalScreeningRecord(models.Model):
     technical_decision   = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     technical_marks      = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     technical_remarks    = models.TextField(blank=True, null=True)
-    technical_document   = models.FileField(upload_to="screening/technical_screening_docs/", null=True, blank=True)
+    technical_document   = models.FileField(upload_to="screening/technical_screening_docs/", storage=content_addressed_storage, null=True, blank=True)
     technical_screened_at= models.DateTimeField(auto_now_add=True)
     technical_evaluated = models.BooleanField(default=False)
 
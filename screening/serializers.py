@@ -3,6 +3,7 @@ from rest_framework import serializers
 from .models import ScreeningRecord, TechnicalScreeningRecord
 from dynamic_form.models import FormSubmission
 from configuration.models import ScreeningCommittee
+from configuration.reference_data import reference_data
 from screening.models import ScreeningRecord
 from tech_eval.models import TechnicalEvaluationRound
 
@@ -275,24 +276,10 @@ class AdministrativeScreeningSerializer(serializers.ModelSerializer):
             return 'admin_rejected'
 
     def get_committeeDetails(self, obj):
-        committee = (
-            ScreeningCommittee.objects
-            .filter(service=obj.service, committee_type='administrative')
-            .select_related('head')
-            .prefetch_related('members')
-            .first()
+        return reference_data(self.context).committee_details(
+            obj.service_id, 'administrative',
+            lambda: bool(obj.screening_records.filter(evaluated_document__isnull=False).exists()),
         )
-        if not committee:
-            return None
-
-        members = [m.user.full_name for m in committee.members.all()]
-        return {
-            'name': committee.name,
-            'head': committee.head.full_name if committee.head else None,
-            'members': members,
-            'documentUploaded': bool(obj.screening_records.filter(evaluated_document__isnull=False).exists()),
-            'evaluationStopped': not committee.is_active,
-        }
 
     def get_administrativeScreeningDocument(self, obj):
         admin_record = getattr(obj, '_latest_screening_record', None)
@@ -386,24 +373,12 @@ class TechnicalScreeningDashboardSerializer(serializers.ModelSerializer):
         return technical_record.technical_decision if technical_record else None
 
     def get_committeeDetails(self, obj):
-        committee = (
-            ScreeningCommittee.objects
-            .filter(service=obj.service, committee_type='technical')
-            .first()
-        )
-        if not committee:
-            return None
-
-        members = [m.user.full_name for m in committee.members.all()]
-        return {
-            'name': committee.name,
-            'head': committee.head.full_name if committee.head else None,
-            'members': members,
-            'documentUploaded': bool(obj.screening_records.filter(
+        return reference_data(self.context).committee_details(
+            obj.service_id, 'technical',
+            lambda: bool(obj.screening_records.filter(
                 technical_record__technical_document__isnull=False
             ).exists()),
-            'evaluationStopped': not committee.is_active,
-        }
+        )
 
     def get_administrativeScreeningDocument(self, obj):
         admin_record = obj.screening_records.order_by('-cycle').first()
@@ -462,13 +437,7 @@ class AdminScreeningSerializer(serializers.ModelSerializer):
     
     
     def get_is_committee_created(self, obj):
-        from configuration.models import ScreeningCommittee
-        exists = ScreeningCommittee.objects.filter(
-            service=obj.service,
-            committee_type='administrative'
-        ).exists()
-        # print('is_committee_created for', obj.id, ':', exists)
-        return exists
+        return reference_data(self.context).committee(obj.service_id, 'administrative') is not None
     
 
     def get_committee_assigned(self, obj):
@@ -563,27 +532,21 @@ class AdminScreeningSerializer(serializers.ModelSerializer):
         return 'admin_rejected'
 
     def get_committeeDetails(self, obj):
-        # Use prefetched committees attached to service
-        committees = getattr(obj.service, 'admin_committees', [])
-        committee = committees[0] if committees else None
-        if not committee:
-            return None
-        # screening_records may be RelatedManager or list
-        screening_records = getattr(obj, 'screening_records', None)
-        if screening_records is not None:
-            if hasattr(screening_records, 'all'):
-                sr_iter = screening_records.all()
+        def document_uploaded():
+            # screening_records may be RelatedManager or list
+            screening_records = getattr(obj, 'screening_records', None)
+            if screening_records is not None:
+                if hasattr(screening_records, 'all'):
+                    sr_iter = screening_records.all()
+                else:
+                    sr_iter = screening_records
             else:
-                sr_iter = screening_records
-        else:
-            sr_iter = []
-        return {
-            'name': committee.name,
-            'head': committee.head.full_name if committee.head else None,
-            'members': [m.user.full_name for m in committee.members.all()],
-            'documentUploaded': any(getattr(rec, 'evaluated_document', None) for rec in sr_iter),
-            'evaluationStopped': not committee.is_active,
-        }
+                sr_iter = []
+            return any(getattr(rec, 'evaluated_document', None) for rec in sr_iter)
+
+        return reference_data(self.context).committee_details(
+            obj.service_id, 'administrative', document_uploaded,
+        )
     
 
 # Technical Screening
@@ -686,20 +649,10 @@ class AdminTechnicalScreeningSerializer(serializers.ModelSerializer):
 
     def get_committeeDetails(self, obj):
         fs = obj.screening_record.proposal
-        committee = ScreeningCommittee.objects.filter(
-            service=fs.service,
-            committee_type='technical'
-        ).first()
-        if not committee:
-            return None
-        members = [m.user.full_name for m in committee.members.all()]
-        return {
-            'name': committee.name,
-            'head': committee.head.full_name if committee.head else None,
-            'members': members,
-            'documentUploaded': ScreeningRecord.objects.filter(proposal=fs).exists(),
-            'evaluationStopped': not committee.is_active,
-        }
+        return reference_data(self.context).committee_details(
+            fs.service_id, 'technical',
+            lambda: ScreeningRecord.objects.filter(proposal=fs).exists(),
+        )
 
     def get_proposalDocument(self, obj):
         try:
@@ -693,7 +693,6 @@ class AdminScreeningViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         from screening.models import ScreeningRecord
         from milestones.models import Milestone
-        from configuration.models import ScreeningCommittee
 
         # Subquery to get latest ScreeningRecord and Milestone for each FormSubmission
         latest_screening = ScreeningRecord.objects.filter(
@@ -703,11 +702,6 @@ class AdminScreeningViewSet(viewsets.ReadOnlyModelViewSet):
             proposal=OuterRef('pk')
         ).order_by('-created_at').values('id')[:1]
 
-        # Prefetch committees for all services (for committeeDetails)
-        admin_committees = ScreeningCommittee.objects.filter(
-            committee_type='administrative'
-        ).select_related('head').prefetch_related('members__user')
-
         return (
             FormSubmission.objects
             .filter(status=FormSubmission.SUBMITTED)
@@ -718,11 +712,6 @@ class AdminScreeningViewSet(viewsets.ReadOnlyModelViewSet):
                     queryset=ScreeningRecord.objects.select_related('technical_record')
                 ),
                 'milestones',
-                Prefetch(
-                    'service__screening_committees',
-                    queryset=admin_committees,
-                    to_attr='admin_committees'  # custom attribute for fast access
-                ),
             )
             .annotate(
                 latest_screening_id=Subquery(latest_screening),
@@ -0,0 +1,356 @@
+# tech_eval/cache_rebuild.py
+"""
+Set-based rebuild of the tech_eval cached columns.
+
+Replaces the per-row ``update_cached_values()`` loops of the old maintenance
+commands. Each stage walks its table in primary-key order, ``batch_size`` rows
+at a time, and for every chunk:
+
+* reads the inputs with aggregate queries (``Sum``/``Count``/``Avg``
+  annotations instead of one query per row),
+* writes only the rows whose cached values actually changed with one
+  ``bulk_update`` (no signals fire, so nothing cascades),
+* commits in its own short transaction and records the last primary key in a
+  checkpoint file, so an interrupted run can continue with ``resume=True``.
+
+A finished stage stays in the checkpoint as done, so resuming skips it; the
+file is removed once every stage of the run has finished.
+
+Stages run in dependency order: criteria -> assignments -> rounds. The rounds
+stage also moves ``assignment_status`` of undecided rounds to what their
+assignment counts say (pending / assigned / completed).
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from .models import CriteriaEvaluation, EvaluatorAssignment, TechnicalEvaluationRound
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('criteria', 'assignments', 'rounds')
+
+# Outside the source tree; override with TECH_EVAL_REBUILD_CHECKPOINT or --checkpoint
+DEFAULT_CHECKPOINT = getattr(
+    settings, 'TECH_EVAL_REBUILD_CHECKPOINT',
+    os.path.join(tempfile.gettempdir(), 'tech_eval_rebuild_checkpoint.json'),
+)
+
+
+class Checkpoint:
+    """
+    Last processed primary key per stage (or ``DONE`` once the stage
+    finished), persisted as a small JSON file.
+    """
+
+    DONE = 'done'
+
+    def __init__(self, path=None):
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path) as fh:
+                self.state = json.load(fh)
+
+    def get(self, stage):
+        return self.state.get(stage)
+
+    def save(self, stage, last_pk):
+        self.state[stage] = last_pk
+        self._write()
+
+    def finish(self, stage):
+        self.save(stage, self.DONE)
+
+    def is_done(self, stage):
+        return self.state.get(stage) == self.DONE
+
+    def clear(self, stage=None):
+        if stage is None:
+            self.state = {}
+        else:
+            self.state.pop(stage, None)
+        self._write()
+
+    def _write(self):
+        if not self.path:
+            return
+        if not self.state:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as fh:
+            json.dump(self.state, fh, default=str)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class StageResult:
+    stage: str
+    rows: int = 0
+    changed: int = 0
+    seconds: float = 0.0
+    skipped: bool = False  # already done in the checkpoint being resumed
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else float(self.rows)
+
+
+class CacheRebuilder:
+    """
+    Usage::
+
+        rebuilder = CacheRebuilder(batch_size=1000, checkpoint_path=DEFAULT_CHECKPOINT)
+        for result in rebuilder.run(['criteria', 'assignments', 'rounds'], resume=True):
+            print(result.stage, result.rows_per_second)
+
+    ``progress(stage, done, total, elapsed)`` is called after every chunk.
+    """
+
+    def __init__(self, batch_size=500, dry_run=False, checkpoint_path=None, progress=None):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.checkpoint = Checkpoint(None if dry_run else checkpoint_path)
+        self.progress = progress
+
+    def run(self, stages=STAGES, resume=False):
+        if not resume:
+            self.checkpoint.clear()
+        results = []
+        for stage in STAGES:
+            if stage in stages:
+                results.append(getattr(self, f'rebuild_{stage}')(resume=resume))
+        # Only now: a crash in a later stage must not redo the earlier ones
+        for stage in stages:
+            self.checkpoint.clear(stage)
+        return results
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+    def rebuild_criteria(self, resume=False):
+        """cached_percentage / cached_weighted_score of CriteriaEvaluation"""
+        def compute(ids):
+            rows = (
+                CriteriaEvaluation.objects.filter(pk__in=ids)
+                .select_related('evaluation_criteria')
+                .only('marks_given', 'cached_percentage', 'cached_weighted_score',
+                      'evaluation_criteria__total_marks', 'evaluation_criteria__weightage')
+            )
+            changed = []
+            for ce in rows:
+                before = (ce.cached_percentage, ce.cached_weighted_score)
+                ce.compute_cached_values()
+                if (ce.cached_percentage, ce.cached_weighted_score) != before:
+                    changed.append(ce)
+            return changed
+
+        return self._run_stage(
+            'criteria', CriteriaEvaluation, compute,
+            ['cached_percentage', 'cached_weighted_score'], resume,
+        )
+
+    def rebuild_assignments(self, resume=False):
+        """Raw/max marks, percentage score and criteria data of EvaluatorAssignment"""
+        fields = ['cached_raw_marks', 'cached_max_marks', 'cached_percentage_score',
+                  'cached_criteria_count', 'cached_criteria_data']
+
+        def compute(ids):
+            assignments = (
+                EvaluatorAssignment.objects.filter(pk__in=ids)
+                .order_by()
+                .annotate(
+                    agg_raw=Sum('criteria_evaluations__marks_given'),
+                    agg_max=Sum('criteria_evaluations__evaluation_criteria__total_marks'),
+                    agg_count=Count('criteria_evaluations'),
+                )
+                .only('is_completed', *fields)
+            )
+            criteria_by_assignment = defaultdict(list)
+            criteria = (
+                CriteriaEvaluation.objects
+                .filter(evaluator_assignment_id__in=ids, evaluator_assignment__is_completed=True)
+                .select_related('evaluation_criteria')
+                .only('evaluator_assignment_id', 'marks_given', 'remarks', 'cached_percentage',
+                      'evaluation_criteria__name', 'evaluation_criteria__total_marks')
+            )
+            for ce in criteria:
+                criteria_by_assignment[ce.evaluator_assignment_id].append(ce.cache_entry())
+
+            changed = []
+            for assignment in assignments:
+                before = [getattr(assignment, f) for f in fields]
+                self._apply_assignment_aggregates(assignment, criteria_by_assignment.get(assignment.pk, []))
+                if [getattr(assignment, f) for f in fields] != before:
+                    changed.append(assignment)
+            return changed
+
+        return self._run_stage('assignments', EvaluatorAssignment, compute, fields, resume)
+
+    @staticmethod
+    def _apply_assignment_aggregates(assignment, criteria_data):
+        # Mirrors EvaluatorAssignment.update_cached_values
+        if not assignment.is_completed:
+            assignment.cached_raw_marks = None
+            assignment.cached_max_marks = None
+            assignment.cached_percentage_score = None
+            assignment.cached_criteria_count = 0
+            assignment.cached_criteria_data = None
+        elif assignment.agg_count:
+            raw_total = float(assignment.agg_raw or 0)
+            max_total = float(assignment.agg_max or 0)
+            assignment.cached_raw_marks = raw_total
+            assignment.cached_max_marks = max_total
+            assignment.cached_percentage_score = round((raw_total / max_total) * 100, 2) if max_total > 0 else 0
+            assignment.cached_criteria_count = assignment.agg_count
+            assignment.cached_criteria_data = criteria_data
+        else:
+            assignment.cached_raw_marks = 0
+            assignment.cached_max_marks = 0
+            assignment.cached_percentage_score = 0
+            assignment.cached_criteria_count = 0
+            assignment.cached_criteria_data = []
+
+    def rebuild_rounds(self, resume=False):
+        """Counts, average, summaries, proposal data and assignment_status of TechnicalEvaluationRound"""
+        fields = ['assignment_status', 'cached_assigned_count', 'cached_completed_count', 'cached_average_percentage',
+                  'cached_marks_summary', 'cached_evaluator_data', 'cached_proposal_data']
+
+        def compute(ids):
+            rounds = (
+                TechnicalEvaluationRound.objects.filter(pk__in=ids)
+                .order_by()
+                .select_related('proposal__service')
+                .annotate(
+                    agg_assigned=Count('evaluator_assignments'),
+                    agg_completed=Count('evaluator_assignments', filter=Q(evaluator_assignments__is_completed=True)),
+                    agg_average=Avg('evaluator_assignments__cached_percentage_score',
+                                    filter=Q(evaluator_assignments__is_completed=True)),
+                )
+            )
+            completed_by_round = defaultdict(list)
+            completed = (
+                EvaluatorAssignment.objects
+                .filter(evaluation_round_id__in=ids, is_completed=True)
+                .select_related('evaluator')
+            )
+            for assignment in completed:
+                completed_by_round[assignment.evaluation_round_id].append(assignment)
+
+            now = timezone.now()
+            changed = []
+            for evaluation_round in rounds:
+                before = [getattr(evaluation_round, f) for f in fields]
+                self._apply_round_aggregates(evaluation_round, completed_by_round.get(evaluation_round.pk, []))
+                if [getattr(evaluation_round, f) for f in fields] != before:
+                    evaluation_round.cache_updated_at = now
+                    changed.append(evaluation_round)
+            return changed
+
+        return self._run_stage(
+            'rounds', TechnicalEvaluationRound, compute, fields + ['cache_updated_at'], resume,
+        )
+
+    @staticmethod
+    def _round_assignment_status(evaluation_round):
+        """
+        assignment_status implied by the assignment counts. Rounds with a
+        decision keep theirs (shortlisting marks them completed).
+        """
+        if evaluation_round.overall_decision != 'pending':
+            return evaluation_round.assignment_status
+        if not evaluation_round.agg_assigned:
+            return 'pending'
+        if evaluation_round.agg_completed == evaluation_round.agg_assigned:
+            return 'completed'
+        return 'assigned'
+
+    @staticmethod
+    def _apply_round_aggregates(evaluation_round, completed):
+        # Mirrors TechnicalEvaluationRound.update_cached_values(refresh_assignments=False)
+        evaluation_round.cached_assigned_count = evaluation_round.agg_assigned
+        evaluation_round.cached_completed_count = evaluation_round.agg_completed
+        evaluation_round.assignment_status = CacheRebuilder._round_assignment_status(evaluation_round)
+
+        scored = [a for a in completed if a.cached_percentage_score is not None]
+        if scored:
+            average = round(evaluation_round.agg_average, 2)
+            evaluation_round.cached_average_percentage = average
+            evaluation_round.cached_marks_summary = {
+                'average_percentage': average,
+                'total_evaluators': len(scored),
+                'individual_marks': [TechnicalEvaluationRound.marks_entry(a) for a in scored],
+            }
+        else:
+            evaluation_round.cached_average_percentage = None
+            evaluation_round.cached_marks_summary = None
+        evaluation_round.cached_evaluator_data = [TechnicalEvaluationRound.evaluator_entry(a) for a in completed]
+
+        if evaluation_round.proposal:
+            evaluation_round.cached_proposal_data = TechnicalEvaluationRound.build_proposal_data(
+                evaluation_round.proposal
+            )
+
+    # ------------------------------------------------------------------
+    # Chunk driver
+    # ------------------------------------------------------------------
+    def _run_stage(self, stage, model, compute, fields, resume=False, queryset=None):
+        if resume and self.checkpoint.is_done(stage):
+            logger.info("tech_eval cache rebuild %s: already done, skipped", stage)
+            return StageResult(stage, skipped=True)
+
+        queryset = (queryset if queryset is not None else model.objects.all()).order_by('pk')
+        last_pk = self.checkpoint.get(stage) if resume else None
+        if last_pk is not None:
+            queryset = queryset.filter(pk__gt=last_pk)
+
+        total = queryset.count()
+        result = StageResult(stage)
+        started = time.monotonic()
+
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            ids = list(chunk.values_list('pk', flat=True)[:self.batch_size])
+            if not ids:
+                break
+
+            with transaction.atomic():
+                changed = compute(ids)
+                if changed and not self.dry_run:
+                    model.objects.bulk_update(changed, fields, batch_size=self.batch_size)
+
+            last_pk = ids[-1]
+            self.checkpoint.save(stage, last_pk)
+            result.rows += len(ids)
+            result.changed += len(changed)
+            result.seconds = time.monotonic() - started
+            if self.progress:
+                self.progress(stage, result.rows, total, result.seconds)
+
+        result.seconds = time.monotonic() - started
+        self.checkpoint.finish(stage)
+        logger.info(
+            "tech_eval cache rebuild %s: %s rows (%s changed) in %.2fs, %.0f rows/s",
+            stage, result.rows, result.changed, result.seconds, result.rows_per_second,
+        )
+        return result
+
+    def run_custom(self, stage, queryset, compute, fields, resume=False):
+        """
+        Drive an ad-hoc cache fix through the same chunking/checkpointing.
+        ``compute(ids)`` must return the changed model instances.
+        """
+        result = self._run_stage(stage, queryset.model, compute, fields, resume, queryset=queryset)
+        self.checkpoint.clear(stage)
+        return result
@@ -0,0 +1,165 @@
+# tech_eval/cache_sync.py
+"""
+Coalesced recomputation of tech_eval cached columns.
+
+Signal handlers only record *which* criteria evaluations, evaluator
+assignments and evaluation rounds became stale. The ids are collected in a
+per-thread, per-transaction ``_Batch`` and recomputed once, after the
+surrounding transaction commits, in dependency order (criteria ->
+assignments -> rounds). An evaluator saving 15 criteria in one request
+therefore recomputes the assignment and the round once instead of 15 times.
+
+The batch itself is the ``on_commit`` callback. When the transaction (or
+the savepoint the batch was started in) rolls back, Django drops the
+callback and the ids go with it, so a later commit never recomputes them.
+One object failing to recompute is logged and the rest still are.
+
+Outside an atomic block ``transaction.on_commit`` runs immediately, so
+behaviour degrades to the previous "recompute on every save".
+
+With ``TECH_EVAL_DEFERRED_ROUND_CACHE = True`` dirty rounds are not
+recomputed at commit; one ``tech_eval.refresh_round`` job per round is
+queued instead (coalesced while pending) and flushed by ``manage.py run_jobs``.
+"""
+import logging
+import threading
+import weakref
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+class _Batch:
+    """Ids marked dirty in one transaction; flushed when it commits."""
+
+    def __init__(self):
+        self.criteria = set()
+        self.assignments = set()
+        self.rounds = set()
+        self.done = False
+
+    def __call__(self):
+        flush(self)
+
+
+def _batch():
+    """The batch to add marks to, and whether it still has to be scheduled."""
+    flushing = getattr(_state, 'flushing', None)
+    if flushing is not None:
+        return flushing, False  # recomputation dirtied more; the running flush drains it
+    # Only on_commit holds the pending batch: once it ran or was rolled back, it's gone
+    ref = getattr(_state, 'batch', None)
+    batch = ref() if ref is not None else None
+    if batch is not None and not batch.done:
+        return batch, False
+    batch = _Batch()
+    _state.batch = weakref.ref(batch)
+    return batch, True
+
+
+def _schedule(batch, new):
+    if new:
+        transaction.on_commit(batch)
+
+
+def mark_criteria_dirty(criteria_id, assignment_id=None):
+    batch, new = _batch()
+    if criteria_id is not None:
+        batch.criteria.add(criteria_id)
+    if assignment_id is not None:
+        batch.assignments.add(assignment_id)
+    _schedule(batch, new)
+
+
+def mark_assignment_dirty(assignment_id):
+    if assignment_id is None:
+        return
+    batch, new = _batch()
+    batch.assignments.add(assignment_id)
+    _schedule(batch, new)
+
+
+def mark_round_dirty(round_id):
+    if round_id is None:
+        return
+    batch, new = _batch()
+    batch.rounds.add(round_id)
+    _schedule(batch, new)
+
+
+def deferred_rounds_enabled():
+    return getattr(settings, 'TECH_EVAL_DEFERRED_ROUND_CACHE', False)
+
+
+def refresh_rounds(round_ids):
+    """Recompute round caches from already up-to-date assignment caches."""
+    from .models import TechnicalEvaluationRound
+
+    rounds = TechnicalEvaluationRound.objects.filter(pk__in=round_ids).select_related('proposal__service')
+    for evaluation_round in rounds:
+        evaluation_round.update_cached_values(refresh_assignments=False)
+
+
+def _each(label, objects, update):
+    for obj in objects:
+        try:
+            update(obj)
+        except Exception:
+            logger.exception("Error recomputing tech_eval cache of %s %s", label, obj.pk)
+
+
+def _enqueue_round(round_id):
+    from jobs.registry import enqueue
+
+    try:
+        enqueue('tech_eval.refresh_round', {'round_id': round_id}, dedupe_key=f'tech_eval-round:{round_id}')
+    except Exception:
+        logger.exception("Error queueing tech_eval cache refresh of round %s", round_id)
+
+
+def flush(batch):
+    """Recompute everything marked dirty in ``batch``, each object exactly once."""
+    from .models import CriteriaEvaluation, EvaluatorAssignment, TechnicalEvaluationRound
+
+    if batch.done:
+        return
+    batch.done = True
+    _state.flushing = batch
+    try:
+        # Recomputing an assignment can dirty its round, so drain until stable.
+        while batch.criteria or batch.assignments or batch.rounds:
+            criteria_ids, batch.criteria = batch.criteria, set()
+            _each('criteria evaluation',
+                  CriteriaEvaluation.objects.filter(pk__in=criteria_ids).select_related('evaluation_criteria'),
+                  lambda ce: ce.update_cached_values())
+
+            assignment_ids, batch.assignments = batch.assignments, set()
+            assignments = list(
+                EvaluatorAssignment.objects.filter(pk__in=assignment_ids)
+                .select_related('evaluation_round__proposal__service')
+            )
+            # Even a failed assignment's round is recomputed from what is stored
+            batch.rounds.update(assignment.evaluation_round_id for assignment in assignments)
+            _each('assignment', assignments, lambda assignment: assignment.update_cached_values(refresh_criteria=False))
+
+            round_ids, batch.rounds = batch.rounds, set()
+            if not round_ids:
+                continue
+            if deferred_rounds_enabled():
+                for round_id in round_ids:
+                    _enqueue_round(round_id)
+            else:
+                _each('round',
+                      TechnicalEvaluationRound.objects.filter(pk__in=round_ids).select_related('proposal__service'),
+                      lambda evaluation_round: evaluation_round.update_cached_values(refresh_assignments=False))
+    except Exception:
+        logger.exception("Error flushing tech_eval cache updates")
+    finally:
+        batch.criteria.clear()
+        batch.assignments.clear()
+        batch.rounds.clear()
+        _state.flushing = None
@@ -139,7 +139,7 @@ class Command(BaseCommand):
                 
                 # Get first few rounds
                 queryset = viewset.get_queryset()[:3]
-                serialized = viewset._lightning_fast_serialize(queryset)
+                serialized = viewset._serialize_admin_rows(queryset)
                 
                 self.stdout.write(f'  API would return {len(serialized)} items')
                 if serialized:
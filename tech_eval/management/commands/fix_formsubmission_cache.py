@@ -1,8 +1,9 @@
 # tech_eval/management/commands/fix_formsubmission_cache.py
 
 from django.core.management.base import BaseCommand
+from django.utils import timezone
+from tech_eval.cache_rebuild import CacheRebuilder
 from tech_eval.models import TechnicalEvaluationRound
-from django.db import transaction
 import time
 
 class Command(BaseCommand):
@@ -66,36 +67,40 @@ class Command(BaseCommand):
             self.stdout.write("No rounds need updating!")
             return
         
-        fixed_count = 0
-        error_count = 0
-        
-        # Process in batches
-        for i in range(0, total_count, batch_size):
-            batch = rounds_to_update[i:i + batch_size]
-            
-            with transaction.atomic():
-                for eval_round in batch:
-                    try:
-                        self.fix_round_proposal_cache(eval_round, verbose)
-                        fixed_count += 1
-                        
-                        if verbose:
-                            proposal_id = self._safe_get_proposal_id(eval_round)
-                            self.stdout.write(f"  ✓ Fixed {proposal_id}")
-                        
-                    except Exception as e:
-                        error_count += 1
-                        proposal_id = self._safe_get_proposal_id(eval_round)
-                        self.stdout.write(f"  ✗ Error fixing {proposal_id}: {e}")
-            
-            # Show progress
-            progress = min(i + batch_size, total_count)
-            self.stdout.write(f"Progress: {progress}/{total_count} rounds processed")
-        
+        rebuilder = CacheRebuilder(batch_size=batch_size, checkpoint_path=None, progress=self._progress)
+
+        def compute(ids):
+            rounds = TechnicalEvaluationRound.objects.filter(pk__in=ids).select_related(
+                'proposal', 'proposal__applicant', 'proposal__service'
+            )
+            changed = []
+            now = timezone.now()
+            for eval_round in rounds:
+                try:
+                    proposal_data = self.build_round_proposal_cache(eval_round, verbose)
+                except Exception as e:
+                    self.error_count += 1
+                    self.stdout.write(f"  ✗ Error fixing {self._safe_get_proposal_id(eval_round)}: {e}")
+                    continue
+                if proposal_data is not None and proposal_data != eval_round.cached_proposal_data:
+                    eval_round.cached_proposal_data = proposal_data
+                    eval_round.cache_updated_at = now
+                    changed.append(eval_round)
+            return changed
+
+        self.error_count = 0
+        result = rebuilder.run_custom(
+            'formsubmission_cache', rounds_to_update, compute,
+            ['cached_proposal_data', 'cache_updated_at'],
+        )
+
         elapsed = time.time() - start_time
-        self.stdout.write(f"\n✓ Fixed {fixed_count}/{total_count} rounds in {elapsed:.2f} seconds")
-        if error_count > 0:
-            self.stdout.write(f"⚠ {error_count} errors occurred")
+        self.stdout.write(
+            f"\n✓ Fixed {result.changed}/{total_count} rounds in {elapsed:.2f} seconds "
+            f"({result.rows_per_second:.0f} rows/s)"
+        )
+        if self.error_count > 0:
+            self.stdout.write(f"⚠ {self.error_count} errors occurred")
         
         # Verify the fix
         self.verify_fix()
@@ -194,14 +199,17 @@ class Command(BaseCommand):
         except Exception:
             return default
     
-    def fix_round_proposal_cache(self, eval_round, verbose=False):
-        """Fix the proposal cache for a specific round using FormSubmission fields"""
+    def _progress(self, stage, done, total, elapsed):
+        self.stdout.write(f"Progress: {done}/{total} rounds processed")
+
+    def build_round_proposal_cache(self, eval_round, verbose=False):
+        """Build the proposal cache for a specific round using FormSubmission fields"""
         
         proposal = eval_round.proposal
         if not proposal:
             if verbose:
                 self.stdout.write(f"    No proposal found for round {eval_round.id}")
-            return
+            return None
         
         # Get applicant data safely
         applicant = proposal.applicant if proposal.applicant else None
@@ -260,18 +268,13 @@ class Command(BaseCommand):
             'created_at': proposal.created_at.isoformat() if hasattr(proposal, 'created_at') and proposal.created_at else None,
         }
         
-        # Update the evaluation round
-        eval_round.cached_proposal_data = proposal_data
-        eval_round.cache_updated_at = time.time()
-        
-        # Save with specific fields to avoid triggering signals
-        eval_round.save(update_fields=['cached_proposal_data', 'cache_updated_at'])
-        
         if verbose:
             subject = proposal_data.get('subject', 'N/A')[:50]
             org_name = proposal_data.get('org_name', 'N/A')[:30] 
             contact_person = proposal_data.get('contact_person', 'N/A')[:30]
-            self.stdout.write(f"    Updated: {subject} | {org_name} | {contact_person}")
+            self.stdout.write(f"    {proposal_data['proposal_id']}: {subject} | {org_name} | {contact_person}")
+        
+        return proposal_data
     
     def verify_fix(self):
         """Verify that the fix worked"""
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dynamic_form', '0026_formsubmission_pdf_status'),
+        ('tech_eval', '0002_delete_evaluationcriteria_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='technicalevaluationround',
+            index=models.Index(fields=['-created_at', '-id'], name='tech_eval_round_created_id'),
+        ),
+    ]
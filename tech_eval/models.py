@@ -10,6 +10,8 @@ from django.db import transaction
 import json
 import logging
 
+from .cache_sync import mark_criteria_dirty, mark_assignment_dirty, mark_round_dirty
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
@@ -84,6 +86,8 @@ class TechnicalEvaluationRound(models.Model):
             models.Index(fields=['proposal', 'assignment_status']),
             models.Index(fields=['cached_assigned_count', 'cached_completed_count']),
             models.Index(fields=['cached_average_percentage']),
+            # keyset pagination of admin-list
+            models.Index(fields=['-created_at', '-id'], name='tech_eval_round_created_id'),
         ]
     
     def __str__(self):
@@ -117,8 +121,12 @@ class TechnicalEvaluationRound(models.Model):
             return 0
         return round((self.cached_completed_count / self.cached_assigned_count) * 100, 1)
     
-    def update_cached_values(self):
-        """Update all cached values - IMPROVED VERSION"""
+    def update_cached_values(self, refresh_assignments=True):
+        """Update all cached values - IMPROVED VERSION
+
+        ``refresh_assignments=False`` trusts the assignment caches (used by
+        tech_eval.cache_sync, which has just recomputed the dirty ones).
+        """
         try:
             # Count assignments
             self.cached_assigned_count = self.evaluator_assignments.count()
@@ -135,31 +143,16 @@ class TechnicalEvaluationRound(models.Model):
                 
                 for assignment in completed_assignments:
                     # FORCE UPDATE assignment cache before using it
-                    assignment.update_cached_values()
+                    if refresh_assignments:
+                        assignment.update_cached_values()
                     
                     if assignment.cached_percentage_score is not None:
                         total_percentage += assignment.cached_percentage_score
                         valid_scores += 1
                         
-                        marks_data.append({
-                            'evaluator_name': assignment.evaluator.get_full_name() if hasattr(assignment.evaluator, 'get_full_name') else str(assignment.evaluator),
-                            'evaluator_email': assignment.evaluator.email,
-                            'percentage': assignment.cached_percentage_score,
-                            'raw_marks': assignment.cached_raw_marks,
-                            'max_marks': assignment.cached_max_marks,
-                            'expected_trl': assignment.expected_trl,
-                            'conflict_of_interest': assignment.conflict_of_interest,
-                        })
+                        marks_data.append(self.marks_entry(assignment))
                     
-                    evaluator_data.append({
-                        'id': assignment.evaluator.id,
-                        'name': assignment.evaluator.get_full_name() if hasattr(assignment.evaluator, 'get_full_name') else str(assignment.evaluator),
-                        'email': assignment.evaluator.email,
-                        'is_completed': assignment.is_completed,
-                        'expected_trl': assignment.expected_trl,
-                        'conflict_of_interest': assignment.conflict_of_interest,
-                        'percentage_score': assignment.cached_percentage_score,
-                    })
+                    evaluator_data.append(self.evaluator_entry(assignment))
                 
                 if valid_scores > 0:
                     self.cached_average_percentage = round(total_percentage / valid_scores, 2)
@@ -180,20 +173,7 @@ class TechnicalEvaluationRound(models.Model):
             
             # Cache proposal data
             if self.proposal:
-                proposal = self.proposal
-                proposal_data = {
-                    'proposal_id': getattr(proposal, 'proposal_id', 'N/A'),
-                    'call': getattr(proposal.service, 'name', 'N/A') if proposal.service else 'N/A',
-                    'org_type': getattr(proposal, 'org_type', 'N/A'),
-                    'subject': getattr(proposal, 'subject', 'N/A'),
-                    'description': getattr(proposal, 'description', 'N/A'),
-                    'org_name': getattr(proposal, 'org_address_line1', 'N/A'),
-                    'contact_person': getattr(proposal, 'contact_name', 'N/A'),
-                    'contact_email': getattr(proposal, 'contact_email', 'N/A'),
-                    'contact_phone': getattr(proposal, 'org_mobile', 'N/A'),
-                    'created_at': proposal.created_at.isoformat() if hasattr(proposal, 'created_at') else None,
-                }
-                self.cached_proposal_data = proposal_data
+                self.cached_proposal_data = self.build_proposal_data(self.proposal)
             
             # Save with specific fields to avoid recursion
             self.save(update_fields=[
@@ -211,6 +191,52 @@ class TechnicalEvaluationRound(models.Model):
         except Exception as e:
             logger.error(f"Error updating cached values for evaluation round {self.id}: {e}")
     
+    @staticmethod
+    def evaluator_name(evaluator):
+        return evaluator.get_full_name() if hasattr(evaluator, 'get_full_name') else str(evaluator)
+
+    @classmethod
+    def marks_entry(cls, assignment):
+        """One ``individual_marks`` item of cached_marks_summary"""
+        return {
+            'evaluator_name': cls.evaluator_name(assignment.evaluator),
+            'evaluator_email': assignment.evaluator.email,
+            'percentage': assignment.cached_percentage_score,
+            'raw_marks': assignment.cached_raw_marks,
+            'max_marks': assignment.cached_max_marks,
+            'expected_trl': assignment.expected_trl,
+            'conflict_of_interest': assignment.conflict_of_interest,
+        }
+
+    @classmethod
+    def evaluator_entry(cls, assignment):
+        """One item of cached_evaluator_data"""
+        return {
+            'id': assignment.evaluator.id,
+            'name': cls.evaluator_name(assignment.evaluator),
+            'email': assignment.evaluator.email,
+            'is_completed': assignment.is_completed,
+            'expected_trl': assignment.expected_trl,
+            'conflict_of_interest': assignment.conflict_of_interest,
+            'percentage_score': assignment.cached_percentage_score,
+        }
+
+    @staticmethod
+    def build_proposal_data(proposal):
+        """Snapshot of the proposal fields stored in cached_proposal_data"""
+        return {
+            'proposal_id': getattr(proposal, 'proposal_id', 'N/A'),
+            'call': getattr(proposal.service, 'name', 'N/A') if proposal.service else 'N/A',
+            'org_type': getattr(proposal, 'org_type', 'N/A'),
+            'subject': getattr(proposal, 'subject', 'N/A'),
+            'description': getattr(proposal, 'description', 'N/A'),
+            'org_name': getattr(proposal, 'org_address_line1', 'N/A'),
+            'contact_person': getattr(proposal, 'contact_name', 'N/A'),
+            'contact_email': getattr(proposal, 'contact_email', 'N/A'),
+            'contact_phone': getattr(proposal, 'org_mobile', 'N/A'),
+            'created_at': proposal.created_at.isoformat() if hasattr(proposal, 'created_at') else None,
+        }
+
     def get_fast_summary(self):
         """Get complete summary using only cached data"""
         return {
@@ -374,7 +400,7 @@ class EvaluatorAssignment(models.Model):
             logger.error(f"Error checking completion status for assignment {self.id}: {e}")
             return False
     
-    def update_cached_values(self):
+    def update_cached_values(self, refresh_criteria=True):
         """Update all cached values for this assignment - IMPROVED VERSION"""
         try:
             # Prevent recursive calls
@@ -391,8 +417,9 @@ class EvaluatorAssignment(models.Model):
                 
                 if criteria_evaluations.exists():
                     # FORCE UPDATE each criteria's cache first
-                    for ce in criteria_evaluations:
-                        ce.update_cached_values()
+                    if refresh_criteria:
+                        for ce in criteria_evaluations:
+                            ce.update_cached_values()
                     
                     # Now calculate totals
                     raw_total = sum(float(ce.marks_given) for ce in criteria_evaluations)
@@ -404,16 +431,7 @@ class EvaluatorAssignment(models.Model):
                     self.cached_criteria_count = criteria_evaluations.count()
                     
                     # Cache criteria data
-                    criteria_data = []
-                    for ce in criteria_evaluations:
-                        criteria_data.append({
-                            'criteria_name': ce.evaluation_criteria.name,
-                            'marks_given': float(ce.marks_given),
-                            'max_marks': float(ce.evaluation_criteria.total_marks),
-                            'percentage': ce.cached_percentage or 0,
-                            'remarks': ce.remarks,
-                        })
-                    self.cached_criteria_data = criteria_data
+                    self.cached_criteria_data = [ce.cache_entry() for ce in criteria_evaluations]
                 else:
                     self.cached_raw_marks = 0
                     self.cached_max_marks = 0
@@ -444,9 +462,9 @@ class EvaluatorAssignment(models.Model):
             # Remove the flag
             delattr(self, '_updating_cache')
             
-            # If completion status changed, update evaluation round cache
+            # If completion status changed, update evaluation round cache (coalesced)
             if completion_status_changed:
-                self.evaluation_round.update_cached_values()
+                mark_round_dirty(self.evaluation_round_id)
             
         except Exception as e:
             logger.error(f"Error updating cached values for assignment {self.id}: {e}")
@@ -528,6 +546,30 @@ class CriteriaEvaluation(models.Model):
         total_marks = getattr(self.evaluation_criteria, 'total_marks', 0)
         return f"{self.marks_given}/{total_marks} ({self.percentage_score}%)"
     
+    def compute_cached_values(self):
+        """Set cached percentage and weighted score in memory (no save)"""
+        if self.evaluation_criteria and self.evaluation_criteria.total_marks:
+            total_marks = float(self.evaluation_criteria.total_marks)
+            if total_marks > 0:
+                self.cached_percentage = round((float(self.marks_given) / total_marks) * 100, 2)
+                
+                # Calculate weighted score if weightage exists
+                weightage = getattr(self.evaluation_criteria, 'weightage', 0)
+                if weightage:
+                    self.cached_weighted_score = round((self.cached_percentage / 100) * float(weightage), 2)
+                else:
+                    self.cached_weighted_score = self.cached_percentage
+
+    def cache_entry(self):
+        """One item of the assignment's cached_criteria_data"""
+        return {
+            'criteria_name': self.evaluation_criteria.name,
+            'marks_given': float(self.marks_given),
+            'max_marks': float(self.evaluation_criteria.total_marks),
+            'percentage': self.cached_percentage or 0,
+            'remarks': self.remarks,
+        }
+
     def update_cached_values(self):
         """Update cached percentage and weighted score"""
         try:
@@ -537,17 +579,7 @@ class CriteriaEvaluation(models.Model):
                 
             self._updating_criteria_cache = True
             
-            if self.evaluation_criteria and self.evaluation_criteria.total_marks:
-                total_marks = float(self.evaluation_criteria.total_marks)
-                if total_marks > 0:
-                    self.cached_percentage = round((float(self.marks_given) / total_marks) * 100, 2)
-                    
-                    # Calculate weighted score if weightage exists
-                    weightage = getattr(self.evaluation_criteria, 'weightage', 0)
-                    if weightage:
-                        self.cached_weighted_score = round((self.cached_percentage / 100) * float(weightage), 2)
-                    else:
-                        self.cached_weighted_score = self.cached_percentage
+            self.compute_cached_values()
             
             self.save(update_fields=['cached_percentage', 'cached_weighted_score'])
             
@@ -576,68 +608,38 @@ class CriteriaEvaluation(models.Model):
         self.clean()
         super().save(*args, **kwargs)
 
-# IMPROVED SIGNALS - Less aggressive recursion prevention
+# COALESCED SIGNALS - handlers only mark ids dirty; tech_eval.cache_sync
+# recomputes each criteria/assignment/round once when the transaction commits.
+
+CRITERIA_CACHE_FIELDS = {'cached_percentage', 'cached_weighted_score'}
+
 
 @receiver(post_save, sender=CriteriaEvaluation)
-def trigger_cache_update_on_criteria_save(sender, instance, created, **kwargs):
-    """Trigger cache updates when criteria is saved"""
-    def update_caches():
-        try:
-            # Update criteria cache
-            instance.update_cached_values()
-            
-            # Update assignment cache (which will auto-check completion)
-            if instance.evaluator_assignment:
-                instance.evaluator_assignment.update_cached_values()
-                
-        except Exception as e:
-            logger.error(f"Error in criteria save signal: {e}")
-    
-    # Use transaction.on_commit to ensure save is complete
-    transaction.on_commit(update_caches)
+def trigger_cache_update_on_criteria_save(sender, instance, created, update_fields=None, **kwargs):
+    """Mark criteria + assignment dirty when criteria is saved"""
+    if update_fields and set(update_fields) <= CRITERIA_CACHE_FIELDS:
+        return  # our own cache write
+    mark_criteria_dirty(instance.pk, instance.evaluator_assignment_id)
 
 
 @receiver(post_delete, sender=CriteriaEvaluation)
 def trigger_cache_update_on_criteria_delete(sender, instance, **kwargs):
-    """Trigger cache updates when criteria is deleted"""
-    def update_caches():
-        try:
-            # Update assignment cache (which will auto-check completion)
-            if instance.evaluator_assignment:
-                instance.evaluator_assignment.update_cached_values()
-                
-        except Exception as e:
-            logger.error(f"Error in criteria delete signal: {e}")
-    
-    transaction.on_commit(update_caches)
+    """Mark assignment dirty when criteria is deleted"""
+    mark_assignment_dirty(instance.evaluator_assignment_id)
 
 
 @receiver(post_save, sender=EvaluatorAssignment)
 def trigger_round_cache_update_on_assignment_save(sender, instance, created, **kwargs):
-    """Update round cache when assignment changes"""
-    def update_round_cache():
-        try:
-            if instance.evaluation_round:
-                instance.evaluation_round.update_cached_values()
-        except Exception as e:
-            logger.error(f"Error in assignment save signal: {e}")
-    
+    """Mark round dirty when assignment changes"""
     # Only update if not in the middle of updating assignment cache
     if not hasattr(instance, '_updating_cache'):
-        transaction.on_commit(update_round_cache)
+        mark_round_dirty(instance.evaluation_round_id)
 
 
 @receiver(post_delete, sender=EvaluatorAssignment)
 def trigger_round_cache_update_on_assignment_delete(sender, instance, **kwargs):
-    """Update round cache when assignment is deleted"""
-    def update_round_cache():
-        try:
-            if instance.evaluation_round:
-                instance.evaluation_round.update_cached_values()
-        except Exception as e:
-            logger.error(f"Error in assignment delete signal: {e}")
-    
-    transaction.on_commit(update_round_cache)
+    """Mark round dirty when assignment is deleted"""
+    mark_round_dirty(instance.evaluation_round_id)
 
 
 # Additional models for audit and performance tracking
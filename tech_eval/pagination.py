@@ -0,0 +1,86 @@
+# tech_eval/pagination.py
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CreatedAtKeysetPagination(BasePagination):
+    """
+    Newest-first keyset pagination over ``(created_at, id)``.
+
+    The cursor is the position of the last row of the previous page, so each
+    page is one indexed range scan of ``page_size + 1`` rows no matter how deep
+    the client pages, and rows inserted meanwhile don't shift later pages.
+    """
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+
+    def __init__(self, page_size=None):
+        if page_size:
+            self.page_size = page_size
+
+    @staticmethod
+    def encode_cursor(created_at, pk):
+        raw = json.dumps([created_at.isoformat(), pk]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            created_at, pk = json.loads(raw)
+            created_at = parse_datetime(created_at)
+            if created_at is None or not isinstance(pk, int):
+                raise ValueError
+        except (ValueError, TypeError):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        return created_at, pk
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'Must be an integer.'})
+        if size < 1:
+            raise ValidationError({self.page_size_query_param: 'Must be at least 1.'})
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+
+        rows = list(queryset.order_by('-created_at', '-pk')[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        page = rows[:page_size]
+        self.next_cursor = self.encode_cursor(page[-1].created_at, page[-1].pk) if self.has_next else None
+        return page
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'success': True,
+            'data': data,
+            'count': len(data),
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+        })
@@ -0,0 +1,9 @@
+# tech_eval/tasks.py
+"""Background job handlers for tech_eval (run by ``manage.py run_jobs``)."""
+from jobs.registry import register
+from .cache_sync import refresh_rounds
+
+
+@register('tech_eval.refresh_round')
+def refresh_round(payload):
+    refresh_rounds([payload['round_id']])
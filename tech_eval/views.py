@@ -10,12 +10,15 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.db import models
 from django.db.models import Q, Prefetch
+from django.conf import settings
 import time
 import logging
 from rest_framework.views import APIView
 from notifications.utils import send_notification
 
 from .models import TechnicalEvaluationRound, EvaluatorAssignment, CriteriaEvaluation
+from .pagination import CreatedAtKeysetPagination
+from auth_service.streaming import JSONStream, stream_chunk_size, streaming_json_response, wants_stream
 from .serializers import (
     LightningFastTechnicalEvaluationRoundSerializer,LightningFastEvaluatorAssignmentSerializer,LightningFastCriteriaEvaluationSerializer,
     SuperFastAdminListSerializer,FastEvaluatorUserSerializer,FastAppEvalCriteriaSerializer
@@ -25,6 +28,86 @@ from .serializers import (
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# admin_list: response key -> columns it needs (for ?fields= projection)
+PROPOSAL_COLUMNS = (
+    'cached_proposal_data',
+    'proposal__id', 'proposal__proposal_id', 'proposal__subject', 'proposal__description',
+    'proposal__org_type', 'proposal__org_address_line1', 'proposal__contact_name',
+    'proposal__contact_email', 'proposal__org_mobile', 'proposal__current_trl',
+    'proposal__service__name',
+    'proposal__applicant__id', 'proposal__applicant__full_name',
+    'proposal__applicant__email', 'proposal__applicant__organization',
+)
+ADMIN_LIST_FIELDS = {
+    'id': (),
+    'proposal_id': PROPOSAL_COLUMNS,
+    'call': PROPOSAL_COLUMNS,
+    'orgType': PROPOSAL_COLUMNS,
+    'orgName': PROPOSAL_COLUMNS,
+    'subject': PROPOSAL_COLUMNS,
+    'description': PROPOSAL_COLUMNS,
+    'fundsRequested': ('proposal__funds_requested',),
+    'submissionDate': ('created_at',),
+    'contactPerson': PROPOSAL_COLUMNS,
+    'contactEmail': PROPOSAL_COLUMNS,
+    'contactPhone': PROPOSAL_COLUMNS,
+    'assignment_status': ('assignment_status',),
+    'overall_decision': ('overall_decision',),
+    'assigned_evaluators_count': ('cached_assigned_count',),
+    'completed_evaluations_count': ('cached_completed_count',),
+    'evaluation_marks_summary': ('cached_marks_summary',),
+    'assigned_evaluators': ('cached_evaluator_data',),
+    'completed_evaluations': ('cached_evaluator_data',),
+    'applicationDocument': ('proposal__applicationDocument',),
+    'administrativeScreeningDocument': (),
+    'technicalScreeningDocument': (),
+    'first_milestone_id': (),
+}
+
+
+def _short_description(data):
+    description = data.get('description', 'N/A')
+    return description[:200] + ('...' if len(description) > 200 else '')
+
+
+# Response key -> getter(view, round, proposal_data). proposal_data is
+# view._proposal_data(round) when a PROPOSAL_COLUMNS field is requested, else {}.
+ADMIN_LIST_VALUES = {
+    'id': lambda view, item, data: item.id,
+    'proposal_id': lambda view, item, data: data.get('proposal_id', 'N/A'),
+    'call': lambda view, item, data: data.get('call', 'N/A'),
+    'orgType': lambda view, item, data: data.get('org_type', 'N/A'),
+    'orgName': lambda view, item, data: data.get('org_name', 'N/A'),
+    'subject': lambda view, item, data: data.get('subject', 'N/A'),
+    'description': lambda view, item, data: _short_description(data),
+    'fundsRequested': lambda view, item, data: (
+        getattr(item.proposal, 'funds_requested', 0) if item.proposal else 0
+    ),
+    'submissionDate': lambda view, item, data: item.created_at.isoformat() if item.created_at else None,
+    'contactPerson': lambda view, item, data: data.get('contact_person', 'N/A'),
+    'contactEmail': lambda view, item, data: data.get('contact_email', 'N/A'),
+    'contactPhone': lambda view, item, data: data.get('contact_phone', 'N/A'),
+
+    # Status mapping
+    'assignment_status': lambda view, item, data: item.assignment_status,
+    'overall_decision': lambda view, item, data: item.overall_decision,
+
+    # Cached fields
+    'assigned_evaluators_count': lambda view, item, data: item.cached_assigned_count,
+    'completed_evaluations_count': lambda view, item, data: item.cached_completed_count,
+    'evaluation_marks_summary': lambda view, item, data: item.cached_marks_summary,
+    'assigned_evaluators': lambda view, item, data: item.cached_evaluator_data or [],
+    'completed_evaluations': lambda view, item, data: [
+        e for e in (item.cached_evaluator_data or []) if e.get('is_completed')
+    ],
+
+    # Document URLs - FIXED MEDIA PATH
+    'applicationDocument': lambda view, item, data: view._get_document_url(item.proposal),
+    'administrativeScreeningDocument': lambda view, item, data: None,
+    'technicalScreeningDocument': lambda view, item, data: None,
+    'first_milestone_id': lambda view, item, data: None,
+}
+
 class TechnicalEvaluationRoundViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = LightningFastTechnicalEvaluationRoundSerializer
@@ -114,34 +197,45 @@ class TechnicalEvaluationRoundViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='admin-list')
     def admin_list(self, request):
-        """Lightning-fast admin list WITHOUT pagination"""
+        """
+        Admin list, newest first, paginated by ``(created_at, id)`` keyset.
+
+        Query params:
+        * ``cursor`` / ``page_size``: see CreatedAtKeysetPagination; follow ``next``.
+        * ``fields``: comma separated response keys (see ADMIN_LIST_FIELDS);
+          only the columns those keys need are loaded.
+        * ``call`` (service id or name), ``status`` (assignment_status),
+          ``decision`` (overall_decision); status/decision take comma separated values.
+        * ``stream=true``: no pagination, every matching row is streamed
+          (exports; see auth_service/streaming.py).
+        """
         if not self._is_admin_user(request.user):
             return Response(
                 {'error': 'Permission denied'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
 
+        fields = self._admin_list_fields(request)
+        paginator = CreatedAtKeysetPagination(
+            page_size=getattr(settings, 'TECH_EVAL_ADMIN_LIST_PAGE_SIZE', None)
+        )
+
         try:
             start_time = time.time()
-            
-            # Get queryset using cached fields
-            queryset = self.get_queryset()
-            
-            # Serialize all data without pagination
-            serialized_data = self._lightning_fast_serialize(queryset)
-            
-            # Simple response format that matches your frontend
-            response_data = {
-                'success': True, 
-                'data': serialized_data,
-                'count': len(serialized_data)
-            }
-            
+
+            queryset = self._admin_list_queryset(request, fields)
+            if wants_stream(request):
+                return self._admin_list_stream(queryset, fields)
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serialized_data = self._serialize_admin_rows(page, fields)
+
             elapsed = time.time() - start_time
             logger.info(f"Admin list API responded in {elapsed:.3f} seconds for {len(serialized_data)} items")
-            
-            return Response(response_data)
 
+            return paginator.get_paginated_response(serialized_data)
+
+        except serializers.ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error in admin_list: {e}")
             return Response(
@@ -149,169 +243,175 @@ class TechnicalEvaluationRoundViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def _lightning_fast_serialize(self, queryset):
-        """Ultra-fast serialization using CORRECT FormSubmission fields"""
-        
-        # Get milestone data
-        proposal_ids = []
-        for item in queryset:
-            try:
-                if item.proposal and hasattr(item.proposal, 'id'):
-                    proposal_ids.append(item.proposal.id)
-            except Exception:
-                pass
-        
-        milestone_data = {}
-        if proposal_ids:
-            try:
-                from milestones.models import Milestone
-                milestones = Milestone.objects.filter(
-                    proposal_id__in=proposal_ids
-                ).values('proposal_id', 'funds_requested').order_by('proposal_id', 'created_at')
-                
-                for milestone in milestones:
-                    if milestone['proposal_id'] not in milestone_data:
-                        milestone_data[milestone['proposal_id']] = milestone['funds_requested'] or 0
-            except Exception as e:
-                logger.warning(f"Could not fetch milestone data: {e}")
-
-        # Serialization using actual FormSubmission fields
-        serialized_data = []
-        for item in queryset:
-            try:
-                # Use cached data if available
-                if item.cached_proposal_data:
-                    proposal_data = item.cached_proposal_data
-                else:
-                    # Extract from FormSubmission using ACTUAL model fields
-                    proposal = item.proposal
-                    if proposal:
-                        # Get applicant data
-                        applicant = proposal.applicant if proposal.applicant else None
-                        applicant_name = 'N/A'
-                        applicant_email = 'N/A'
-                        applicant_org = 'N/A'
-                        
-                        if applicant:
-                            applicant_name = getattr(applicant, 'full_name', '').strip() or 'N/A'
-                            applicant_email = getattr(applicant, 'email', '') or 'N/A'
-                            applicant_org = getattr(applicant, 'organization', '').strip() or 'N/A'
-                        
-                        # Get service name
-                        service_name = 'N/A'
-                        if proposal.service:
-                            service_name = getattr(proposal.service, 'name', 'N/A')
-                        
-                        proposal_data = {
-                            'proposal_id': getattr(proposal, 'proposal_id', 'N/A'),
-                            'call': service_name,
-                            'org_type': getattr(proposal, 'org_type', None) or 'N/A',
-                            'subject': getattr(proposal, 'subject', None) or 'N/A',
-                            'description': getattr(proposal, 'description', None) or 'N/A',
-                            
-                            # Organization: prefer User.organization, fallback to FormSubmission.org_address_line1
-                            'org_name': (
-                                applicant_org if applicant_org != 'N/A' else 
-                                getattr(proposal, 'org_address_line1', None) or 'N/A'
-                            ),
-                            
-                            # Contact person: prefer User.full_name, fallback to FormSubmission.contact_name
-                            'contact_person': (
-                                applicant_name if applicant_name != 'N/A' else 
-                                getattr(proposal, 'contact_name', None) or 'N/A'
-                            ),
-                            
-                            # Contact email: prefer User.email, fallback to FormSubmission.contact_email
-                            'contact_email': (
-                                applicant_email if applicant_email != 'N/A' else 
-                                getattr(proposal, 'contact_email', None) or 'N/A'
-                            ),
-                            
-                            'contact_phone': getattr(proposal, 'org_mobile', None) or 'N/A',
-                            'current_trl': getattr(proposal, 'current_trl', None),
-                        }
-                    else:
-                        # Fallback if no proposal
-                        proposal_data = {
-                            'proposal_id': 'N/A',
-                            'call': 'N/A',
-                            'org_type': 'N/A',
-                            'subject': 'N/A',
-                            'description': 'N/A',
-                            'org_name': 'N/A',
-                            'contact_person': 'N/A',
-                            'contact_email': 'N/A',
-                            'contact_phone': 'N/A',
-                            'current_trl': None,
-                        }
+    def _admin_list_stream(self, queryset, fields):
+        getters, needs_proposal = self._admin_list_getters(fields)
+        rows = (
+            self._admin_list_row(item, getters, needs_proposal)
+            for item in queryset.order_by('-created_at', '-pk').iterator(chunk_size=stream_chunk_size())
+        )
+        return streaming_json_response({
+            'success': True,
+            'count': queryset.count(),
+            'data': JSONStream(rows),
+        })
 
-                # Build response data
-                item_data = {
-                    'id': item.id,
-                    'proposal_id': proposal_data.get('proposal_id', 'N/A'),
-                    'call': proposal_data.get('call', 'N/A'),
-                    'orgType': proposal_data.get('org_type', 'N/A'),
-                    'orgName': proposal_data.get('org_name', 'N/A'),
-                    'subject': proposal_data.get('subject', 'N/A'),
-                    'description': proposal_data.get('description', 'N/A')[:200] + ('...' if len(proposal_data.get('description', '')) > 200 else ''),
-                    'fundsRequested': (
-                            getattr(item.proposal, 'funds_requested', 0) if item.proposal else 0
-                        ),
-                    'submissionDate': item.created_at.isoformat() if item.created_at else None,
-                    'contactPerson': proposal_data.get('contact_person', 'N/A'),
-                    'contactEmail': proposal_data.get('contact_email', 'N/A'),
-                    'contactPhone': proposal_data.get('contact_phone', 'N/A'),
-                    
-                    # Status mapping
-                    'assignment_status': item.assignment_status,
-                    'overall_decision': item.overall_decision,
-                    
-                    # Cached fields
-                    'assigned_evaluators_count': item.cached_assigned_count,
-                    'completed_evaluations_count': item.cached_completed_count,
-                    'evaluation_marks_summary': item.cached_marks_summary,
-                    'assigned_evaluators': item.cached_evaluator_data or [],
-                    'completed_evaluations': [e for e in (item.cached_evaluator_data or []) if e.get('is_completed')],
-                    
-                    # Document URLs - FIXED MEDIA PATH
-                    'applicationDocument': self._get_document_url(item.proposal),
-                    'administrativeScreeningDocument': None,
-                    'technicalScreeningDocument': None,
-                    'first_milestone_id': None,
-                }
-                
-                serialized_data.append(item_data)
-                
-            except Exception as e:
-                logger.error(f"Error serializing item {getattr(item, 'id', 'unknown')}: {e}")
-                # Add minimal error item
-                serialized_data.append({
-                    'id': getattr(item, 'id', 0),
-                    'proposal_id': f'Error-{getattr(item, "id", 0)}',
-                    'call': 'Error',
-                    'orgType': 'Error',
-                    'orgName': 'Error loading data',
-                    'subject': 'Error loading data',
-                    'description': 'Error loading data',
-                    'fundsRequested': 0,
-                    'submissionDate': None,
-                    'contactPerson': 'N/A',
-                    'contactEmail': 'N/A',
-                    'contactPhone': 'N/A',
-                    'assignment_status': 'pending',
-                    'overall_decision': 'pending',
-                    'assigned_evaluators_count': 0,
-                    'completed_evaluations_count': 0,
-                    'evaluation_marks_summary': None,
-                    'assigned_evaluators': [],
-                    'completed_evaluations': [],
-                    'applicationDocument': None,
-                    'administrativeScreeningDocument': None,
-                    'technicalScreeningDocument': None,
-                    'first_milestone_id': None,
-                })
+    def _admin_list_fields(self, request):
+        requested = request.query_params.get('fields')
+        if not requested:
+            return list(ADMIN_LIST_FIELDS)
+        fields = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = [name for name in fields if name not in ADMIN_LIST_FIELDS]
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(ADMIN_LIST_FIELDS)}"
+            })
+        return fields
+
+    def _admin_list_queryset(self, request, fields):
+        columns = {'id', 'created_at'}
+        for name in fields:
+            columns.update(ADMIN_LIST_FIELDS[name])
+
+        # select_related every relation on the way to a projected column
+        related = set()
+        for column in columns:
+            path = column.split('__')[:-1]
+            related.update('__'.join(path[:depth]) for depth in range(1, len(path) + 1))
+
+        queryset = TechnicalEvaluationRound.objects.all()
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        queryset = queryset.only(*columns)
+
+        params = request.query_params
+        call = params.get('call')
+        if call:
+            if call.isdigit():
+                queryset = queryset.filter(proposal__service_id=int(call))
+            else:
+                queryset = queryset.filter(proposal__service__name=call)
+        statuses = [value for value in params.get('status', '').split(',') if value]
+        if statuses:
+            queryset = queryset.filter(assignment_status__in=statuses)
+        decisions = [value for value in params.get('decision', '').split(',') if value]
+        if decisions:
+            queryset = queryset.filter(overall_decision__in=decisions)
+        return queryset
+
+    def _proposal_data(self, item):
+        """Proposal columns of a row: cached_proposal_data when present, else from FormSubmission"""
+        # Use cached data if available
+        if item.cached_proposal_data:
+            return item.cached_proposal_data
 
-        return serialized_data
+        # Extract from FormSubmission using ACTUAL model fields
+        proposal = item.proposal
+        if not proposal:
+            # Fallback if no proposal
+            return {
+                'proposal_id': 'N/A',
+                'call': 'N/A',
+                'org_type': 'N/A',
+                'subject': 'N/A',
+                'description': 'N/A',
+                'org_name': 'N/A',
+                'contact_person': 'N/A',
+                'contact_email': 'N/A',
+                'contact_phone': 'N/A',
+                'current_trl': None,
+            }
+
+        # Get applicant data
+        applicant = proposal.applicant if proposal.applicant else None
+        applicant_name = 'N/A'
+        applicant_email = 'N/A'
+        applicant_org = 'N/A'
+
+        if applicant:
+            applicant_name = getattr(applicant, 'full_name', '').strip() or 'N/A'
+            applicant_email = getattr(applicant, 'email', '') or 'N/A'
+            applicant_org = getattr(applicant, 'organization', '').strip() or 'N/A'
+
+        # Get service name
+        service_name = 'N/A'
+        if proposal.service:
+            service_name = getattr(proposal.service, 'name', 'N/A')
+
+        return {
+            'proposal_id': getattr(proposal, 'proposal_id', 'N/A'),
+            'call': service_name,
+            'org_type': getattr(proposal, 'org_type', None) or 'N/A',
+            'subject': getattr(proposal, 'subject', None) or 'N/A',
+            'description': getattr(proposal, 'description', None) or 'N/A',
+
+            # Organization: prefer User.organization, fallback to FormSubmission.org_address_line1
+            'org_name': (
+                applicant_org if applicant_org != 'N/A' else 
+                getattr(proposal, 'org_address_line1', None) or 'N/A'
+            ),
+
+            # Contact person: prefer User.full_name, fallback to FormSubmission.contact_name
+            'contact_person': (
+                applicant_name if applicant_name != 'N/A' else 
+                getattr(proposal, 'contact_name', None) or 'N/A'
+            ),
+
+            # Contact email: prefer User.email, fallback to FormSubmission.contact_email
+            'contact_email': (
+                applicant_email if applicant_email != 'N/A' else 
+                getattr(proposal, 'contact_email', None) or 'N/A'
+            ),
+
+            'contact_phone': getattr(proposal, 'org_mobile', None) or 'N/A',
+            'current_trl': getattr(proposal, 'current_trl', None),
+        }
+
+    def _serialize_admin_rows(self, rows, fields=None):
+        """Single pass over already fetched rows; only ``fields`` are built"""
+        getters, needs_proposal = self._admin_list_getters(fields or list(ADMIN_LIST_FIELDS))
+        return [self._admin_list_row(item, getters, needs_proposal) for item in rows]
+
+    @staticmethod
+    def _admin_list_getters(fields):
+        """``([(field, getter), ...], needs_proposal)``, looked up once per request"""
+        getters = [(name, ADMIN_LIST_VALUES[name]) for name in fields]
+        needs_proposal = any(ADMIN_LIST_FIELDS[name] is PROPOSAL_COLUMNS for name in fields)
+        return getters, needs_proposal
+
+    def _admin_list_row(self, item, getters, needs_proposal):
+        try:
+            proposal_data = self._proposal_data(item) if needs_proposal else {}
+            return {name: get(self, item, proposal_data) for name, get in getters}
+
+        except Exception as e:
+            logger.error(f"Error serializing item {getattr(item, 'id', 'unknown')}: {e}")
+            # Add minimal error item
+            error_item = {
+                'id': getattr(item, 'id', 0),
+                'proposal_id': f'Error-{getattr(item, "id", 0)}',
+                'call': 'Error',
+                'orgType': 'Error',
+                'orgName': 'Error loading data',
+                'subject': 'Error loading data',
+                'description': 'Error loading data',
+                'fundsRequested': 0,
+                'submissionDate': None,
+                'contactPerson': 'N/A',
+                'contactEmail': 'N/A',
+                'contactPhone': 'N/A',
+                'assignment_status': 'pending',
+                'overall_decision': 'pending',
+                'assigned_evaluators_count': 0,
+                'completed_evaluations_count': 0,
+                'evaluation_marks_summary': None,
+                'assigned_evaluators': [],
+                'completed_evaluations': [],
+                'applicationDocument': None,
+                'administrativeScreeningDocument': None,
+                'technicalScreeningDocument': None,
+                'first_milestone_id': None,
+            }
+            return {name: error_item[name] for name, _ in getters}
 
     @action(detail=False, methods=['get'], url_path='debug-formsubmission-fields')
     def debug_formsubmission_fields(self, request):
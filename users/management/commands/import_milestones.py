@@ -1,7 +1,10 @@
 import csv
+from collections import defaultdict
+
 from django.core.management.base import BaseCommand
 from dynamic_form.models import FormSubmission
 from milestones.models import Milestone, SubMilestone
+from milestones.sync import sync_milestones
 
 def parse_int(val):
     try:
@@ -20,63 +23,74 @@ class Command(BaseCommand):
         with open(csv_path, encoding='utf-8-sig') as f:
             reader = csv.DictReader(f)
             self.stdout.write(self.style.WARNING(f"Detected columns: {reader.fieldnames}"))
-            for idx, row in enumerate(reader):
-                proposal_id = row.get('ID', '').strip()
-                title = row.get('Milestone', '').strip()
-                description = (row.get('Work') or '').strip()
-                activities = (row.get('Activities') or '').strip()
-                revised_time_required = parse_int(row.get('Time (Months)', 0))
-                revised_contri_applicant = parse_int(row.get('Applicant Contribution', 0))
-                revised_grant_from_ttdf = parse_int(row.get('TTDF Grants', 0))
-                funds_requested= parse_int(row.get('Funds Requested', 0))
+            rows = list(enumerate(reader))
+
+        # Rows grouped by proposal; each proposal's milestones are then written in one sync
+        by_proposal = defaultdict(list)
+        for idx, row in rows:
+            proposal_id = row.get('ID', '').strip()
+            title = row.get('Milestone', '').strip()
+            if not (proposal_id and title):
+                self.stdout.write(self.style.ERROR(f"[Row {idx+2}] Missing proposal ID or milestone title. Skipping."))
+                continue
+            by_proposal[proposal_id].append((idx, row, title))
 
-                if not (proposal_id and title):
-                    self.stdout.write(self.style.ERROR(f"[Row {idx+2}] Missing proposal ID or milestone title. Skipping."))
-                    continue
+        proposals = FormSubmission.objects.in_bulk(list(by_proposal), field_name='proposal_id')
+        existing = {}
+        for proposal_pk, title, pk in (
+            Milestone.objects.filter(proposal__in=list(proposals.values()))
+            .order_by('-id').values_list('proposal_id', 'title', 'id')
+        ):
+            existing[(proposal_pk, title)] = pk  # oldest one wins for duplicate titles
 
-                try:
-                    proposal = FormSubmission.objects.get(proposal_id=proposal_id)
-                except FormSubmission.DoesNotExist:
+        for proposal_id, proposal_rows in by_proposal.items():
+            proposal = proposals.get(proposal_id)
+            if proposal is None:
+                for idx, row, title in proposal_rows:
                     self.stdout.write(self.style.ERROR(f"[Row {idx+2}] Proposal {proposal_id} not found. Skipping."))
-                    continue
+                continue
 
-                # Create or update Milestone
-                milestone, created = Milestone.objects.get_or_create(
-                    proposal=proposal,
-                    title=title,
-                    defaults={
-                        'description': description,
-                        'revised_time_required': revised_time_required,
-                        'revised_contri_applicant': revised_contri_applicant,
-                        'revised_grant_from_ttdf': revised_grant_from_ttdf,
+            # One sync row per title: a later CSV row updates what an earlier one created
+            milestone_rows = {}
+            create_defaults = {}
+            for idx, row, title in proposal_rows:
+                revised_time_required = parse_int(row.get('Time (Months)', 0))
+                revised_contri_applicant = parse_int(row.get('Applicant Contribution', 0))
+                revised_grant_from_ttdf = parse_int(row.get('TTDF Grants', 0))
+                if title not in milestone_rows:
+                    create_defaults[title] = {
                         'time_required': revised_time_required,
                         'funds_requested': 0,
                         'grant_from_ttdf': revised_grant_from_ttdf,
                         'initial_contri_applicant': revised_contri_applicant,
                         'initial_grant_from_ttdf': revised_grant_from_ttdf,
-                        'activities': activities,
                     }
-                )
-                # Update if already exists
-                if not created:
-                    updated = False
-                    for field, value in [
-                        ('description', description),
-                        ('revised_time_required', revised_time_required),
-                        ('revised_contri_applicant', revised_contri_applicant),
-                        ('revised_grant_from_ttdf', revised_grant_from_ttdf),
-                        ('activities', activities),
-                    ]:
-                        if getattr(milestone, field) != value:
-                            setattr(milestone, field, value)
-                            updated = True
-                    if updated:
-                        milestone.save()
-                        self.stdout.write(self.style.SUCCESS(f"[Row {idx+2}] Updated Milestone '{title}' for {proposal_id}"))
-                    else:
-                        self.stdout.write(f"[Row {idx+2}] Milestone '{title}' for {proposal_id} already up to date.")
-                else:
-                    self.stdout.write(self.style.SUCCESS(f"[Row {idx+2}] Created Milestone '{title}' for {proposal_id}"))
+                milestone_rows[title] = {
+                    'id': existing.get((proposal.pk, title)),
+                    'title': title,
+                    'description': (row.get('Work') or '').strip(),
+                    'revised_time_required': revised_time_required,
+                    'revised_contri_applicant': revised_contri_applicant,
+                    'revised_grant_from_ttdf': revised_grant_from_ttdf,
+                    'activities': (row.get('Activities') or '').strip(),
+                }
+            titles = list(milestone_rows)
+            result = sync_milestones(
+                proposal,
+                list(milestone_rows.values()),
+                create_defaults=lambda index: create_defaults[titles[index]],
+                delete_missing=False,
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{proposal_id}: {len(result.created)} milestones created, {len(result.updated)} updated, "
+                f"{len(titles) - len(result.created) - len(result.updated)} already up to date"
+            ))
+
+            milestones = {}
+            for milestone in result.milestones:
+                milestones.setdefault(milestone.title, milestone)
+            for idx, row, title in proposal_rows:
+                milestone = milestones[title]
 
                 # Submilestone logic (if your CSV has submilestone columns)
                 sub_title = row.get('Submilestone', '').strip()
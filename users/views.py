@@ -13,7 +13,10 @@ from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError as DRFValidationError, AuthenticationFailed
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.shortcuts import get_object_or_404
+from django.db.models import Prefetch
 from dynamic_form.models import FormSubmission
+from presentation.models import Presentation
+from auth_service.streaming import JSONStream, stream_chunk_size, streaming_json_response, wants_stream
 
 from .tokens import password_reset_token
 from .permissions import IsSuperuserOrAdminRole
@@ -908,6 +911,10 @@ class SubmissionDetailView(APIView):
   
         
 class AllSubmissionsView(APIView):
+    """
+    The user's proposals with a shortlisted presentation.
+    ``?stream=true`` streams the data array (see auth_service/streaming.py).
+    """
    
     permission_classes = [IsAuthenticated]
     
@@ -917,48 +924,31 @@ class AllSubmissionsView(APIView):
             submissions = FormSubmission.objects.filter(
                 applicant=request.user,
                 presentations__final_decision='shortlisted'  # Only shortlisted presentations
-            ).distinct().order_by('-created_at')
-            
+            ).distinct().order_by('-created_at').select_related('service', 'template').prefetch_related(
+                Prefetch(
+                    'presentations',
+                    queryset=Presentation.objects.filter(final_decision='shortlisted'),
+                    to_attr='shortlisted_presentations',
+                )
+            )
+
             # Build response data for each submission
-            submissions_list = []
-            
-            for submission in submissions:
-                # Get the shortlisted presentation for additional info
-                shortlisted_presentation = submission.presentations.filter(
-                    final_decision='shortlisted'
-                ).first()
-                
-                submission_data = {
-                    "proposalId": submission.proposal_id,
-                    "subject": submission.subject or "",
-                    "fundsRequested": float(submission.grants_from_ttdf) if submission.grants_from_ttdf else 0,
-                    "call": submission.service.name if submission.service else "",
-                    "submissionDate": submission.created_at.strftime("%Y-%m-%d") if submission.created_at else "",
-                    "applicationDocument": request.build_absolute_uri(submission.applicationDocument.url) if submission.applicationDocument else "",
-                    "initial_contri_applicant": float(submission.applicant_contribution) if submission.applicant_contribution else 0,
-                    "revised_contri_applicant": 0,  # Add this field to model if needed
-                    "initial_grant_from_ttdf": float(submission.grants_from_ttdf) if submission.grants_from_ttdf else 0,
-                    "revised_grant_from_ttdf": 0,  # Add this field to model if needed
-                    "expected_source_contribution": float(submission.expected_source_contribution) if submission.expected_source_contribution else None,
-                    "details_source_funding": float(submission.details_source_funding) if submission.details_source_funding else None,
-                    
-                    # Additional useful fields
-                    "status": submission.get_status_display(),
-                    "statusCode": submission.status,
-                    "formId": submission.form_id,
-                    "lastUpdated": submission.updated_at.strftime("%Y-%m-%d") if submission.updated_at else "",
-                    "canEdit": submission.can_edit(),
-                    
-                    # Presentation specific fields
-                    "presentationStatus": "shortlisted",
-                    "presentationId": shortlisted_presentation.id if shortlisted_presentation else None,
-                    "presentationDate": shortlisted_presentation.presentation_date.strftime("%Y-%m-%d %H:%M") if shortlisted_presentation and shortlisted_presentation.presentation_date else None,
-                    "evaluatorMarks": float(shortlisted_presentation.evaluator_marks) if shortlisted_presentation and shortlisted_presentation.evaluator_marks else None,
-                    "adminRemarks": shortlisted_presentation.admin_remarks if shortlisted_presentation else "",
-                    "shortlistedAt": shortlisted_presentation.admin_evaluated_at.strftime("%Y-%m-%d %H:%M") if shortlisted_presentation and shortlisted_presentation.admin_evaluated_at else None,
-                }
-                submissions_list.append(submission_data)
-            
+            rows = (
+                self._submission_row(request, submission)
+                for submission in submissions.iterator(chunk_size=stream_chunk_size())
+            )
+
+            if wants_stream(request):
+                count = submissions.count()
+                return streaming_json_response({
+                    "status": "success",
+                    "response_message": f"Retrieved {count} shortlisted submissions successfully",
+                    "count": count,
+                    "filter": "Only proposals shortlisted in presentation stage",
+                    "data": JSONStream(rows),
+                })
+
+            submissions_list = list(rows)
             return Response({
                 "status": "success",
                 "response_message": f"Retrieved {len(submissions_list)} shortlisted submissions successfully",
@@ -974,6 +964,41 @@ class AllSubmissionsView(APIView):
                 "response_message": f"Could not retrieve shortlisted submissions: {str(e)}"
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def _submission_row(self, request, submission):
+        # Get the shortlisted presentation for additional info (newest first, as Presentation.Meta orders)
+        shortlisted = submission.shortlisted_presentations
+        shortlisted_presentation = shortlisted[0] if shortlisted else None
+
+        return {
+            "proposalId": submission.proposal_id,
+            "subject": submission.subject or "",
+            "fundsRequested": float(submission.grants_from_ttdf) if submission.grants_from_ttdf else 0,
+            "call": submission.service.name if submission.service else "",
+            "submissionDate": submission.created_at.strftime("%Y-%m-%d") if submission.created_at else "",
+            "applicationDocument": request.build_absolute_uri(submission.applicationDocument.url) if submission.applicationDocument else "",
+            "initial_contri_applicant": float(submission.applicant_contribution) if submission.applicant_contribution else 0,
+            "revised_contri_applicant": 0,  # Add this field to model if needed
+            "initial_grant_from_ttdf": float(submission.grants_from_ttdf) if submission.grants_from_ttdf else 0,
+            "revised_grant_from_ttdf": 0,  # Add this field to model if needed
+            "expected_source_contribution": float(submission.expected_source_contribution) if submission.expected_source_contribution else None,
+            "details_source_funding": float(submission.details_source_funding) if submission.details_source_funding else None,
+            
+            # Additional useful fields
+            "status": submission.get_status_display(),
+            "statusCode": submission.status,
+            "formId": submission.form_id,
+            "lastUpdated": submission.updated_at.strftime("%Y-%m-%d") if submission.updated_at else "",
+            "canEdit": submission.can_edit(),
+            
+            # Presentation specific fields
+            "presentationStatus": "shortlisted",
+            "presentationId": shortlisted_presentation.id if shortlisted_presentation else None,
+            "presentationDate": shortlisted_presentation.presentation_date.strftime("%Y-%m-%d %H:%M") if shortlisted_presentation and shortlisted_presentation.presentation_date else None,
+            "evaluatorMarks": float(shortlisted_presentation.evaluator_marks) if shortlisted_presentation and shortlisted_presentation.evaluator_marks else None,
+            "adminRemarks": shortlisted_presentation.admin_remarks if shortlisted_presentation else "",
+            "shortlistedAt": shortlisted_presentation.admin_evaluated_at.strftime("%Y-%m-%d %H:%M") if shortlisted_presentation and shortlisted_presentation.admin_evaluated_at else None,
+        }
+
 
 from rest_framework.views import APIView
 from rest_framework.response import Response